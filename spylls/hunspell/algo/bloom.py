@@ -0,0 +1,78 @@
+"""
+`Bloom filter <https://en.wikipedia.org/wiki/Bloom_filter>`_: compact set of strings, which can
+only tell "definitely not in the set" or "probably in the set". Used by
+:class:`MappedDic <spylls.hunspell.data.mapped_dic.MappedDic>` to answer quickly that there is no such
+stem: on lookup (and even more on suggest) most of the stems produced by cutting off affixes don't exist.
+
+.. autoclass:: BloomFilter
+    :members:
+"""
+
+import math
+from typing import Iterable, Iterator
+
+
+class BloomFilter:
+    """
+    Set of strings with false positives (but no false negatives) rate about ``fp_rate``, taking
+    about ``-1.44 * log2(fp_rate)`` bits per item (~10 bits for 1%).
+
+    ::
+
+        >>> stems = BloomFilter(['cat', 'dog'], size=2)
+        >>> stems.may_contain('cat')
+        True
+        >>> stems.may_contain('cow')     # or, with probability fp_rate, True
+        False
+
+    Python's ``hash()`` of strings is used for hashing, which is different in different processes, so
+    the filter should be built in the process where it is used (and is not meant to be saved).
+
+    Args:
+        items: Strings to put into the filter
+        size: Number of items (to calculate the size of the filter)
+        fp_rate: Acceptable rate of false positives
+    """
+
+    def __init__(self, items: Iterable[str], *, size: int, fp_rate: float = 0.01):
+        if not 0 < fp_rate < 1:
+            raise ValueError(f'False positives rate should be between 0 and 1, got {fp_rate}')
+
+        # Optimal number of bits and hash functions for the given size and rate
+        self.bits = max(64, math.ceil(-size * math.log(fp_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / max(size, 1) * math.log(2)))
+        self.data = bytearray((self.bits + 7) // 8)
+
+        for item in items:
+            for bit in self.positions(item):
+                self.data[bit >> 3] |= 1 << (bit & 7)
+
+    def may_contain(self, item: str) -> bool:
+        """
+        ``False`` if the item is definitely not in the set, ``True`` if it probably is.
+        """
+        # Inlined version of positions() (this is the hot path): most of the absent items are rejected
+        # by the first or second bit checked.
+        data = self.data
+        bits = self.bits
+        value = hash(item)
+        bit = value & 0xFFFFFFFF
+        step = (value >> 32) | 1
+        for _ in range(self.hashes):
+            bit %= bits
+            if not data[bit >> 3] & (1 << (bit & 7)):
+                return False
+            bit += step
+        return True
+
+    def positions(self, item: str) -> Iterator[int]:
+        """
+        Numbers of bits set for the item ("double hashing": i-th hash function is ``h1 + i * h2``,
+        both taken from one 64-bit ``hash()``).
+        """
+        value = hash(item)
+        first = value & 0xFFFFFFFF
+        second = (value >> 32) | 1
+        bits = self.bits
+        for i in range(self.hashes):
+            yield (first + i * second) % bits
@@ -0,0 +1,108 @@
+"""
+Bounded cache of the results, used by :class:`Lookup <spylls.hunspell.algo.lookup.Lookup>` (when
+enabled with :meth:`Dictionary.enable_lookup_cache <spylls.hunspell.dictionary.Dictionary.enable_lookup_cache>`).
+
+Word frequencies in real texts follow `Zipf's law <https://en.wikipedia.org/wiki/Zipf%27s_law>`_:
+a few hundreds of words ("the", "and", and domain-specific terms) are the most of the text, so
+caching the results for the most recently checked words saves the most of the lookup work.
+
+.. autoclass:: LRUCache
+    :members:
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable
+
+MISSING = object()
+
+
+class LRUCache:
+    """
+    Thread-safe mapping of limited size: when it is full, the least recently used entry is dropped.
+    Counts cache hits and misses.
+
+    ::
+
+        >>> cache = LRUCache(maxsize=2)
+        >>> cache.put('a', 1)
+        >>> cache.get('a')
+        1
+        >>> cache.get('b', 'default')
+        'default'
+        >>> cache.hit_rate
+        0.5
+
+    Args:
+        maxsize: Maximum number of entries
+    """
+
+    def __init__(self, maxsize: int):
+        if maxsize <= 0:
+            raise ValueError(f'Cache size should be positive, got {maxsize}')
+
+        #: Maximum number of entries
+        self.maxsize = maxsize
+        #: Number of successful :meth:`get` calls
+        self.hits = 0
+        #: Number of unsuccessful :meth:`get` calls
+        self.misses = 0
+
+        self.data: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Returns the value by key (and marks it as most recently used), or ``default`` if it isn't
+        in the cache.
+        """
+        with self.lock:
+            value = self.data.get(key, MISSING)
+            if value is MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self.data.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Stores the value, dropping the least recently used one if the cache is full.
+        """
+        with self.lock:
+            self.data[key] = value
+            self.data.move_to_end(key)
+            if len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Drops all the entries (but not hit/miss counters).
+        """
+        with self.lock:
+            self.data.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Share of successful :meth:`get` calls (0 if there were no calls).
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __getstate__(self):
+        # Locks can't be pickled, the copy gets its own one
+        with self.lock:
+            state = {**self.__dict__, 'data': self.data.copy()}
+        del state['lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.data)
+
+    def __repr__(self):
+        return f'LRUCache({len(self.data)}/{self.maxsize}, hit rate {self.hit_rate:.1%})'
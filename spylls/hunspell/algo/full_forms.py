@@ -0,0 +1,319 @@
+"""
+Full-form ("unmunched") index of the dictionary: all the word forms that the stems of the dictionary
+produce with their affixes, expanded once, so that checking the word becomes a hash table probe for
+each of its capitalization variants, instead of cutting off all the affixes that might be there and
+looking up every resulting stem (which :meth:`Lookup.is_correct <spylls.hunspell.algo.lookup.Lookup.is_correct>`
+does). Enabled with :meth:`Dictionary.enable_full_forms <spylls.hunspell.dictionary.Dictionary.enable_full_forms>`.
+
+The forms are produced by applying affixes to stems in exactly the opposite way lookup removes them
+(one or two suffixes, one or two prefixes, or both, if they allow cross-product), and each produced
+form is checked by removing the affix back (so affix conditions mean exactly the same as on lookup).
+Only forms which :meth:`Lookup.is_good_form <spylls.hunspell.algo.lookup.Lookup.is_good_form>`
+accepts are stored; those which depend on the word's capitalization or on ``NOSUGGEST`` (stems with
+``KEEPCASE`` and ``NOSUGGEST`` flags) are stored with their stem and affixes, and checked again on
+lookup.
+
+If the dictionary has compounding (``COMPOUNDFLAG``, ``COMPOUNDBEGIN`` or ``COMPOUNDRULE``), words
+not found in the index are checked by :meth:`Lookup.compound_forms <spylls.hunspell.algo.lookup.Lookup.compound_forms>`
+(but the analysis of their affixes is not necessary). Some words are still checked by regular
+:class:`Lookup <spylls.hunspell.algo.lookup.Lookup>`:
+
+* ALL-CAPS words not found in the index (they might correspond to stems with complex capitalization,
+  which lookup searches in :attr:`Dic.lowercase_index <spylls.hunspell.data.dic.Dic.lowercase_index>`);
+* forms which lookup might also analyze as affixed ``FORBIDDENWORD`` stem (it stops the analysis);
+* all words, if the dictionary was changed after the index was built.
+
+Words broken by ``BREAK`` patterns are checked part by part, each part with the index.
+
+The tradeoff is memory and build time: the index stores every form of every stem, which for the
+languages with rich morphology is orders of magnitude more than stems. For example, en_US (~60k stems)
+has ~150k forms, the index takes ~1.5s to build and ~12MB of memory; checking a correct word becomes
+~6 times faster, and a misspelled one ~2 times (en_US has ``COMPOUNDRULE`` for numbers like "21st",
+so misspelled words are still checked for being compounds). :attr:`FullForms.size`,
+:attr:`FullForms.memory` and :attr:`FullForms.build_time` tell it for the particular dictionary, and
+hit/miss counters show how much of the lookups the index answered.
+
+.. autoclass:: FullForms
+    :members:
+"""
+
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from spylls.hunspell import data
+from spylls.hunspell.algo.capitalization import Type as CapType
+from spylls.hunspell.algo.trie import Trie
+
+# Form of the stem which is good only for some capitalizations (see Lookup._is_good_form):
+# (dictionary word, prefix, suffix, prefix2, suffix2)
+Form = Tuple[data.dic.Word, Optional[data.aff.Prefix], Optional[data.aff.Suffix],
+             Optional[data.aff.Prefix], Optional[data.aff.Suffix]]
+
+# Text of the form produced from the stem, and its affixes (same as the forms Lookup._produce_affix_forms produces)
+Production = Tuple[str, Optional[data.aff.Prefix], Optional[data.aff.Suffix],
+                   Optional[data.aff.Prefix], Optional[data.aff.Suffix]]
+
+
+class FullForms:
+    """
+    Index of all the correct word forms of the dictionary, used by :meth:`Lookup.is_correct
+    <spylls.hunspell.algo.lookup.Lookup.is_correct>` when enabled. Built on creation.
+
+    ::
+
+        >>> full_forms = dictionary.enable_full_forms()
+        >>> full_forms
+        FullForms(152538 forms, 12.1MB, built in 1.47s)
+        >>> dictionary.lookup('spells'), dictionary.lookup('spylls')
+        (True, False)
+        >>> full_forms.hits, full_forms.misses, full_forms.fallbacks
+        (1, 1, 0)
+
+    Args:
+        lookup: :class:`Lookup <spylls.hunspell.algo.lookup.Lookup>` which dictionary and affixes
+                are expanded
+    """
+
+    def __init__(self, lookup):
+        self.lookup = lookup
+        aff = lookup.aff
+
+        self.compounding = aff.COMPOUNDBEGIN or aff.COMPOUNDFLAG or aff.COMPOUNDRULE
+        #: Number of lookups where the word was found in the index
+        self.hits = 0
+        #: Number of lookups where the word wasn't found in the index (and was checked only for
+        #: being a compound, if the dictionary has compounding)
+        self.misses = 0
+        #: Number of lookups passed to regular lookup
+        self.fallbacks = 0
+
+        # Dictionary version the index corresponds to
+        self.version = lookup.dic.version
+
+        start = time.perf_counter()
+
+        # form => True if it is correct, tuple of Forms if it is correct only for some of the
+        # capitalizations, None if it should be checked by lookup
+        self.forms: Dict[str, Union[bool, None, Tuple[Form, ...]]] = self.build()
+
+        #: Time the index was built in, seconds
+        self.build_time = time.perf_counter() - start
+        #: Approximate memory the index takes, bytes
+        self.memory = sys.getsizeof(self.forms) + sum(map(sys.getsizeof, self.forms))
+
+    @property
+    def size(self) -> int:
+        """
+        Number of forms in the index.
+        """
+        return len(self.forms)
+
+    def is_correct(self, word: str, *,
+                   capitalization: bool = True,
+                   allow_nosuggest: bool = True) -> Optional[bool]:
+        """
+        Same as :meth:`Lookup.is_correct <spylls.hunspell.algo.lookup.Lookup.is_correct>`, but ``None``
+        if the index can't tell (and the word should be checked by lookup itself).
+        """
+
+        # pylint: disable=protected-access
+        lookup = self.lookup
+
+        if lookup.dic.version != self.version:
+            self.fallbacks += 1
+            return None
+
+        # See Lookup.is_correct
+        captype, variants, check_sharps = lookup._case_variants(word, capitalization=capitalization)
+
+        for variant in variants:
+            entry = self.forms.get(variant, ())
+            if entry is True:
+                self.hits += 1
+                return True
+            if entry is None:
+                self.fallbacks += 1
+                return None
+            for root, prefix, suffix, prefix2, suffix2 in entry:
+                if check_sharps and lookup._is_keepcase_sharps(root, prefix, suffix):
+                    continue
+                if lookup._is_good_form(root, prefix, suffix, prefix2, suffix2,
+                                        compoundpos=None, captype=captype, allow_nosuggest=allow_nosuggest):
+                    self.hits += 1
+                    return True
+
+        if captype == CapType.ALL:
+            self.fallbacks += 1
+            return None
+
+        self.misses += 1
+        return bool(self.compounding) and any(
+            any(lookup.compound_forms(variant, captype=captype, allow_nosuggest=allow_nosuggest))
+            for variant in variants
+        )
+
+    def build(self) -> Dict[str, Union[bool, None, Tuple[Form, ...]]]:
+        """
+        Expands all the words of the dictionary into the forms (see module docs).
+        """
+
+        lookup = self.lookup
+        aff = lookup.aff
+        dic = lookup.dic
+
+        # Only affixes lookup would find (see Lookup.affix_indexes)
+        suffix_index, prefix_index = lookup.affix_indexes()
+        suffixes: List[data.aff.Suffix] = _payloads(suffix_index)
+        prefixes: List[data.aff.Prefix] = _payloads(prefix_index)
+
+        # Flags which might allow cross-product affixes of the other kind: the suffix is allowed if
+        # its flag is on the stem, on the suffix itself, or on the prefix (and vice versa)
+        cross_prefix_flags = {flag for prefix in prefixes if prefix.crossproduct for flag in prefix.flags}
+        cross_suffix_flags = {flag for suffix in suffixes if suffix.crossproduct for flag in suffix.flags}
+
+        productions = _Productions(suffixes, prefixes, complex_prefixes=aff.COMPLEXPREFIXES)
+        is_good_form = lookup._is_good_form     # pylint: disable=protected-access
+        forms: Dict[str, Union[bool, None, Tuple[Form, ...]]] = {}
+
+        for word in dic.words:
+            # Good regardless of the checked word's capitalization (KEEPCASE), or of allow_nosuggest
+            unconditional = not (aff.KEEPCASE in word.flags or aff.NOSUGGEST in word.flags or
+                                 (aff.CHECKSHARPS and 'ß' in word.stem))
+
+            word_forms = productions.of(word.stem,
+                                        suffix_flags={*word.flags, *cross_prefix_flags},
+                                        prefix_flags={*word.flags, *cross_suffix_flags})
+            for text, prefix, suffix, prefix2, suffix2 in word_forms:
+                # Most permissive check: capitalization of the stem itself, NOSUGGEST allowed
+                if not is_good_form(word, prefix, suffix, prefix2, suffix2, compoundpos=None, captype=word.captype):
+                    continue
+
+                entry = forms.get(text, ())
+                if entry is True:
+                    continue
+                if unconditional:
+                    forms[text] = True
+                else:
+                    forms[text] = (*entry, (word, prefix, suffix, prefix2, suffix2))  # type: ignore
+
+        # If some affixed form of the text has the stem marked with FORBIDDENWORD, lookup stops
+        # the analysis there, so whether the text is correct depends on which forms were checked
+        # before that: only lookup can tell
+        if aff.FORBIDDENWORD:
+            for stem in set(dic.stems_with_flag(aff.FORBIDDENWORD)):
+                for text, prefix, suffix, _, _ in productions.of(stem):
+                    if (prefix or suffix) and text in forms:
+                        forms[text] = None
+
+        return forms
+
+    def __repr__(self):
+        return (f'FullForms({len(self.forms)} forms, {self.memory / 1024 / 1024:.1f}MB, '
+                f'built in {self.build_time:.2f}s)')
+
+
+class _Productions:
+    # All the texts lookup could split (with Lookup._produce_affix_forms) into the given stem and
+    # some affixes.
+
+    def __init__(self, suffixes: List[data.aff.Suffix], prefixes: List[data.aff.Prefix], *,
+                 complex_prefixes: bool):
+        self.suffixes = suffixes
+        self.prefixes = prefixes
+        self.complex_prefixes = complex_prefixes
+
+        self.suffixes_by_flag = _by_flag(suffixes)
+        self.prefixes_by_flag = _by_flag(prefixes)
+
+    def of(self, stem: str, *,
+           suffix_flags: Optional[Set[str]] = None,
+           prefix_flags: Optional[Set[str]] = None) -> Iterator[Production]:
+        # If suffix_flags/prefix_flags are passed, only suffixes/prefixes which might be allowed by
+        # these flags (or by their own flags) are attached to the stem, otherwise all of them.
+
+        yield (stem, None, None, None, None)
+
+        # (text, suffix, suffix2), with suffix being the one attached to the stem
+        suffixed: List[Tuple[str, data.aff.Suffix, Optional[data.aff.Suffix]]] = []
+        for suffix in self.candidates(self.suffixes, self.suffixes_by_flag, suffix_flags):
+            text = _suffixed(suffix, stem)
+            if text is None:
+                continue
+            suffixed.append((text, suffix, None))
+            # Lookup removes the second suffix only if it has the flag of the first removed one
+            for suffix2 in _with_flags(self.suffixes_by_flag, suffix.flags):
+                text2 = _suffixed(suffix2, text)
+                if text2 is not None:
+                    suffixed.append((text2, suffix, suffix2))
+
+        for text, suffix, suffix2 in suffixed:
+            yield (text, None, suffix, None, suffix2)
+
+        # Suffixed forms which lookup would analyze after removing the cross-product prefix
+        cross_suffixed: List[Tuple[str, Optional[data.aff.Suffix], Optional[data.aff.Suffix]]] = [(stem, None, None)]
+        cross_suffixed.extend((text, suffix, suffix2) for text, suffix, suffix2 in suffixed
+                              if suffix.crossproduct and (suffix2 is None or suffix2.crossproduct))
+
+        for prefix in self.candidates(self.prefixes, self.prefixes_by_flag, prefix_flags):
+            for base, suffix, suffix2 in cross_suffixed:
+                if suffix and not prefix.crossproduct:
+                    continue
+                text = _prefixed(prefix, base)
+                if text is None:
+                    continue
+                yield (text, prefix, suffix, None, suffix2)
+
+                # Second prefix is removed only with COMPLEXPREFIXES, and only if it has the flag of
+                # the first removed one. NB: lookup forgets prefix2 in prefix+prefix2+suffix forms
+                if self.complex_prefixes:
+                    for prefix2 in _with_flags(self.prefixes_by_flag, prefix.flags):
+                        text2 = _prefixed(prefix2, text)
+                        if text2 is not None:
+                            yield (text2, prefix, suffix, None if suffix else prefix2, suffix2)
+
+    @staticmethod
+    def candidates(affixes, by_flag, flags):
+        if flags is None:
+            return affixes
+        return [*_with_flags(by_flag, flags),
+                *(affix for affix in affixes if affix.flag in affix.flags and affix.flag not in flags)]
+
+
+def _suffixed(suffix: data.aff.Suffix, stem: str) -> Optional[str]:
+    # The stem with the suffix, if lookup would find the suffix there
+    if not stem.endswith(suffix.strip):
+        return None
+    text = stem[:len(stem) - len(suffix.strip)] + suffix.add
+    return text if suffix.stem_of(text) == stem else None
+
+
+def _prefixed(prefix: data.aff.Prefix, stem: str) -> Optional[str]:
+    # The stem with the prefix, if lookup would find the prefix there
+    if not stem.startswith(prefix.strip):
+        return None
+    text = prefix.add + stem[len(prefix.strip):]
+    return text if prefix.stem_of(text) == stem else None
+
+
+def _by_flag(affixes):
+    result = defaultdict(list)
+    for affix in affixes:
+        result[affix.flag].append(affix)
+    return result
+
+
+def _with_flags(by_flag, flags):
+    for flag in flags:
+        yield from by_flag.get(flag, ())
+
+
+def _payloads(trie: Trie) -> list:
+    result = []
+    leaves = [trie.root]
+    while leaves:
+        leaf = leaves.pop()
+        result.extend(leaf.payloads)
+        leaves.extend(leaf.children.values())
+    return result
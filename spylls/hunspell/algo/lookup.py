@@ -10,7 +10,7 @@ On a bird-eye view level:
   it has valid suffixes/prefixes from .aff file and valid stem from .dic file, and they all compatible
   with each other.
 
-To follow algorithm details, start reading from :meth:`Lookup.__call__`
+To follow algorithm details, start reading from :meth:`Lookup.check`
 
 .. autoclass:: Lookup
 
@@ -25,19 +25,26 @@ To follow algorithm details, start reading from :meth:`Lookup.__call__`
 """
 
 import re
+import itertools
 
 from enum import Enum
-from typing import List, Iterator, Union, Optional
+from typing import List, Iterator, Iterable, Union, Optional, Dict, Set, Tuple, FrozenSet
 
 import dataclasses
 from dataclasses import dataclass
 
 from spylls.hunspell import data
 from spylls.hunspell.algo.capitalization import Type as CapType
+from spylls.hunspell.algo.cache import LRUCache
+from spylls.hunspell.algo.full_forms import FullForms
+from spylls.hunspell.algo.trie import Trie
 import spylls.hunspell.algo.permutations as pmt
 
 NUMBER_REGEXP = re.compile(r'^\d+(\.\d+)?$')
 
+# How many verdicts of Lookup.is_bad_boundary are cached
+BOUNDARY_CACHE_SIZE = 10_000
+
 
 @dataclass
 class AffixForm:
@@ -146,12 +153,21 @@ class Lookup:
         AffixForm(spells = spells)
         AffixForm(spells = spell + Suffix(s: S×, on [[^sxzhy]]$))
 
-    See :meth:`__call__` as the main entry point for algorithm explanation.
+    See :meth:`check` as the main entry point for algorithm explanation.
 
     **Main methods**
 
     .. automethod:: __call__
+    .. automethod:: check
     .. automethod:: good_forms
+    .. automethod:: is_correct
+
+    **Steps of the check** (can be used separately for batch processing, see :meth:`check_many`)
+
+    .. automethod:: is_forbidden
+    .. automethod:: normalize
+    .. automethod:: check_normalized
+    .. automethod:: check_many
 
     **Affixes**
 
@@ -160,6 +176,7 @@ class Lookup:
     .. automethod:: is_good_form
     .. automethod:: desuffix
     .. automethod:: deprefix
+    .. automethod:: affix_indexes
 
     **Compounds**
 
@@ -167,25 +184,91 @@ class Lookup:
     .. automethod:: compounds_by_flags
     .. automethod:: compounds_by_rules
     .. automethod:: is_bad_compound
+    .. automethod:: is_bad_boundary
+    .. automethod:: compound_stems
 
     **Utility**
 
     .. automethod:: break_word
+    .. autoattribute:: cache
+    .. autoattribute:: full_forms
     """
 
+    #: Cache of :meth:`__call__` results, ``None`` (default) if caching is disabled. Can be set to
+    #: :class:`LRUCache <spylls.hunspell.algo.cache.LRUCache>` instance, see also
+    #: :meth:`Dictionary.enable_lookup_cache <spylls.hunspell.dictionary.Dictionary.enable_lookup_cache>`.
+    cache: Optional[LRUCache]
+
+    #: Index of all the word forms of the dictionary, ``None`` (default) if not enabled. If set, it
+    #: answers :meth:`is_correct` where it can, see :mod:`algo.full_forms <spylls.hunspell.algo.full_forms>`
+    #: and :meth:`Dictionary.enable_full_forms <spylls.hunspell.dictionary.Dictionary.enable_full_forms>`.
+    full_forms: Optional[FullForms]
+
     def __init__(self, aff: data.aff.Aff, dic: data.dic.Dic):
         self.aff = aff
         self.dic = dic
+        self.cache = None
+        self.full_forms = None
+        # Version of the dictionary cached results correspond to
+        self.cache_version = dic.version
+
+        # See affix_indexes
+        self._affix_indexes: Optional[Tuple[Trie, Trie]] = None
+        self._affix_indexes_version = dic.version
+        self._stem_flags: Set[str] = set()
+        self._forbidden_stems: List[str] = []
+        self._words_scanned = 0
+
+        # See compound_stems
+        self._compound_stems = Trie()
+        self._compound_stems_version: Optional[int] = None
+        self._compound_stems_scanned = 0
+
+        # See is_bad_boundary
+        self._boundary_cache = LRUCache(maxsize=BOUNDARY_CACHE_SIZE)
+        self._boundary_cache_version: Optional[int] = None
+        # Whether the text with space might be found in the dictionary: some stem, or some affix, contains it
+        self._multiword = any(' ' in affix.add for affixes in [*aff.PFX.values(), *aff.SFX.values()]
+                              for affix in affixes)
+        self._multiword_scanned = 0
 
     def __call__(self, word: str, *,
                  capitalization: bool = True,
                  allow_nosuggest: bool = True,
                  allow_break: bool = True) -> bool:
         """
+        Checks the word with :meth:`check` (see it for arguments), or takes the result from the
+        :attr:`cache`, if it is enabled. The cache is dropped if the dictionary was changed since the
+        results were cached.
+        """
+
+        if self.cache is None:
+            return self.check(word, capitalization=capitalization, allow_nosuggest=allow_nosuggest,
+                              allow_break=allow_break)
+
+        if self.dic.version != self.cache_version:
+            self.cache.clear()
+            self.cache_version = self.dic.version
+
+        key = (word, capitalization, allow_nosuggest, allow_break)
+        result = self.cache.get(key)
+        if result is None:
+            result = self.check(word, capitalization=capitalization, allow_nosuggest=allow_nosuggest,
+                                allow_break=allow_break)
+            self.cache.put(key, result)
+
+        return result
+
+    def check(self, word: str, *,
+              capitalization: bool = True,
+              allow_nosuggest: bool = True,
+              allow_break: bool = True) -> bool:
+        """
         The outermost word correctness check.
 
         Basically, prepares word for check (converting/removing chars), and then checks whether
-        the any good word form can be produced with :meth:`good_forms`.
+        the any good word form can be produced with :meth:`good_forms`. (Those steps are also available
+        separately: :meth:`is_forbidden`, :meth:`normalize`, :meth:`check_normalized`.)
         If there is none, also tries to break word by break-points (like dashes) with :meth:`break_word`,
         and check each part separately.
 
@@ -199,17 +282,69 @@ class Lookup:
             allow_break: if ``False``, don't try to break word by dashes and check separately
         """
 
-        # The word is considered correct, if it can be deconstructed into a "good form" (the form
-        # that is possible to produce from current dictionary: either it is stem with some affixes,
-        # or compound word: list of stem+affixes groups.
-        def is_correct(w):
-            return any(self.good_forms(w, capitalization=capitalization, allow_nosuggest=allow_nosuggest))
-
         # If there are entries in the dictionary matching the entire word, and all of those entries
         # are marked with "forbidden" flag, this word can't be considered correct.
-        if self.aff.FORBIDDENWORD and self.dic.has_flag(word, self.aff.FORBIDDENWORD, for_all=True):
+        if self.is_forbidden(word):
             return False
 
+        return self.check_normalized(self.normalize(word), capitalization=capitalization,
+                                     allow_nosuggest=allow_nosuggest, allow_break=allow_break)
+
+    def check_many(self, words: Iterable[str], *, chunk_size: int = 10_000) -> Iterator[bool]:
+        """
+        Checks a lot of words (like all tokens of a document) at once, producing results in the order
+        of ``words``. ``words`` are processed in chunks of ``chunk_size``, and each distinct word of the
+        chunk is checked once (and each distinct word after normalization with :meth:`normalize`),
+        so for the typical text, most of the work is done for only a small part of it. The memory used
+        doesn't depend on the number of words, only on ``chunk_size``, so ``words`` can be a generator
+        of an arbitrary size.
+
+        The results are the same as of :meth:`check` with default arguments (:attr:`cache` is not used).
+
+        Args:
+            words: Words to check
+            chunk_size: How many words to process at once
+        """
+
+        # Checked here and not in the generator itself, so the error is raised right on the call
+        if chunk_size <= 0:
+            raise ValueError(f'chunk_size must be positive, got {chunk_size}')
+
+        return self._check_many(iter(words), chunk_size)
+
+    def _check_many(self, words: Iterator[str], chunk_size: int) -> Iterator[bool]:
+        while True:
+            chunk = [*itertools.islice(words, chunk_size)]
+            if not chunk:
+                return
+
+            results: Dict[str, bool] = {}
+            normalized_results: Dict[str, bool] = {}
+            for word in dict.fromkeys(chunk):
+                if self.is_forbidden(word):
+                    results[word] = False
+                    continue
+                normalized = self.normalize(word)
+                if normalized not in normalized_results:
+                    normalized_results[normalized] = self.check_normalized(normalized)
+                results[word] = normalized_results[normalized]
+
+            yield from (results[word] for word in chunk)
+
+    def is_forbidden(self, word: str) -> bool:
+        """
+        The first step of :meth:`check`: whether the word (as is, before :meth:`normalize`) is
+        explicitly forbidden: there are entries in the dictionary matching the entire word, and all of
+        them are marked with ``FORBIDDENWORD`` flag.
+        """
+        return bool(self.aff.FORBIDDENWORD) and self.dic.has_flag(word, self.aff.FORBIDDENWORD, for_all=True)
+
+    def normalize(self, word: str) -> str:
+        """
+        The second step of :meth:`check`: prepares the word for the analysis, converting and removing
+        characters as the dictionary requires.
+        """
+
         # Convert word before lookup with ICONV table: usually, it is normalization of apostrophes,
         # UTF chars with diacritics (which might have several different forms), and such.
         # See data.aff.ConvTable_ for the full algorithm (it is more complex than just replace one
@@ -222,6 +357,23 @@ class Lookup:
         if self.aff.IGNORE:
             word = word.translate(self.aff.IGNORE.tr)
 
+        return word
+
+    def check_normalized(self, word: str, *,
+                         capitalization: bool = True,
+                         allow_nosuggest: bool = True,
+                         allow_break: bool = True) -> bool:
+        """
+        The last step of :meth:`check`: the analysis of the word already passed through
+        :meth:`normalize`. Arguments are the same as for :meth:`check`.
+        """
+
+        # The word is considered correct, if it can be deconstructed into a "good form" (the form
+        # that is possible to produce from current dictionary: either it is stem with some affixes,
+        # or compound word: list of stem+affixes groups.
+        def is_correct(w):
+            return self.is_correct(w, capitalization=capitalization, allow_nosuggest=allow_nosuggest)
+
         # Numbers are allowed and considered "good word" always
         # TODO: check in hunspell's code, if there are some exceptions?..
         if NUMBER_REGEXP.fullmatch(word):
@@ -336,6 +488,75 @@ class Lookup:
             # ...and then all possible compound forms
             yield from self.compound_forms(variant, captype=captype, allow_nosuggest=allow_nosuggest)
 
+    def is_correct(self, word: str, *,
+                   capitalization: bool = True,
+                   allow_nosuggest: bool = True) -> bool:
+        """
+        Whether there is at least one good form of the word: the same as ``any(good_forms(...))``
+        (and accepts the same arguments as :meth:`good_forms`), but faster. :meth:`good_forms` creates
+        an :class:`AffixForm` for every split of the word into stem and affixes considered, while in
+        most of the checks only the fact of the form's existence is interesting; here, forms are
+        represented by plain tuples, and the check stops at the first good one. If :attr:`full_forms`
+        index is enabled, the word is looked up there first.
+
+        Args:
+            word: Word to check
+
+            capitalization: if ``False``, checks ONLY exactly this capitalization
+            allow_nosuggest: if ``False``, don't consider correct words with ``NOSUGGEST`` flag
+        """
+
+        if self.full_forms is not None:
+            result = self.full_forms.is_correct(word, capitalization=capitalization, allow_nosuggest=allow_nosuggest)
+            if result is not None:
+                return result
+
+        aff = self.aff
+
+        # See good_forms for explanations of all the steps
+        captype, variants, check_sharps = self._case_variants(word, capitalization=capitalization)
+        compounding = aff.COMPOUNDBEGIN or aff.COMPOUNDFLAG or aff.COMPOUNDRULE
+
+        for variant in variants:
+            for _, prefix, suffix, _, _, homonym in self._affix_forms(variant, captype=captype,
+                                                                      allow_nosuggest=allow_nosuggest):
+                if check_sharps and self._is_keepcase_sharps(homonym, prefix, suffix):
+                    continue
+                return True
+
+            # Without compounding flags, compound_forms never produces anything
+            if compounding and any(self.compound_forms(variant, captype=captype, allow_nosuggest=allow_nosuggest)):
+                return True
+
+        return False
+
+    def _case_variants(self, word: str, *, capitalization: bool = True) -> Tuple[CapType, List[str], bool]:
+        # Common start of is_correct and FullForms.is_correct (see good_forms for explanations):
+        # capitalization type of the word, variants of it to look for in the dictionary, and whether
+        # forms with "ß" and KEEPCASE should be rejected (see _is_keepcase_sharps).
+        aff = self.aff
+
+        if capitalization:
+            captype, variants = aff.casing.variants(word)
+        else:
+            captype = aff.casing.guess(word)
+            variants = [word]
+
+        check_sharps = bool(aff.CHECKSHARPS and aff.KEEPCASE) and captype == CapType.ALL and 'ß' in word
+
+        return (captype, variants, check_sharps)
+
+    def _is_keepcase_sharps(self, homonym: data.dic.Word,
+                            prefix: Optional[data.aff.Prefix], suffix: Optional[data.aff.Suffix]) -> bool:
+        # Whether the form of the ALL-CAPS word with "ß" is not allowed, because its stem has "ß", and
+        # it or its affixes are marked with KEEPCASE (see good_forms)
+        keepcase = self.aff.KEEPCASE
+        return 'ß' in homonym.stem and (
+            keepcase in homonym.flags or
+            (prefix is not None and keepcase in prefix.flags) or
+            (suffix is not None and keepcase in suffix.flags)
+        )
+
     def affix_forms(self,
                     word: str,
                     captype: CapType,
@@ -355,7 +576,8 @@ class Lookup:
 
         Internally, produces all possible (not necessary correct) forms with :meth:`produce_affix_forms`
         and then filters them with :meth:`is_good_form` (this is very simplified explanation, there
-        are a lot of edge cases, see code).
+        are a lot of edge cases, see code). All of that is done without constructing ``AffixForm`` objects
+        (see :meth:`is_correct`), they are created only for the good forms.
 
         Args:
             word: the word to produce forms for
@@ -374,30 +596,51 @@ class Lookup:
 
         """
 
+        for stem, prefix, suffix, prefix2, suffix2, homonym in self._affix_forms(
+                word, captype=captype, allow_nosuggest=allow_nosuggest,
+                prefix_flags=prefix_flags, suffix_flags=suffix_flags, forbidden_flags=forbidden_flags,
+                compoundpos=compoundpos, with_forbidden=with_forbidden):
+            yield AffixForm(word, stem, prefix=prefix, suffix=suffix, prefix2=prefix2, suffix2=suffix2,
+                            in_dictionary=homonym)
+
+    def _affix_forms(self,
+                     word: str,
+                     captype: CapType,
+                     allow_nosuggest=True,
+                     prefix_flags: List[str] = [],
+                     suffix_flags: List[str] = [],
+                     forbidden_flags: List[str] = [],
+                     compoundpos: Optional[CompoundPos] = None,
+                     with_forbidden=False
+                     ) -> Iterator[Tuple[str, Optional[data.aff.Prefix], Optional[data.aff.Suffix],
+                                         Optional[data.aff.Prefix], Optional[data.aff.Suffix], data.dic.Word]]:
+        # The implementation of affix_forms, producing tuples
+        # (stem, prefix, suffix, prefix2, suffix2, in_dictionary) instead of AffixForm.
+
         # Just a shortcut to call (quite complicated) form validity method with all relevant params.
-        def is_good_form(form, **kwarg):
-            return self.is_good_form(form, compoundpos=compoundpos,
-                                     captype=captype,
-                                     allow_nosuggest=allow_nosuggest,
-                                     **kwarg)
+        def is_good_form(homonym, prefix, suffix, prefix2, suffix2):
+            return self._is_good_form(homonym, prefix, suffix, prefix2, suffix2,
+                                      compoundpos=compoundpos,
+                                      captype=captype,
+                                      allow_nosuggest=allow_nosuggest)
 
         # ``produce_affix_forms`` produces ALL possible forms (split of the word into prefixes +
         # stem + suffixes) with the help of known prefixes and affixes. Now we need to choose only
         # correct ones.
-        for form in self.produce_affix_forms(word, compoundpos=compoundpos,
-                                             prefix_flags=prefix_flags, suffix_flags=suffix_flags,
-                                             forbidden_flags=forbidden_flags):
+        for stem, prefix, suffix, prefix2, suffix2 in self._produce_affix_forms(
+                word, compoundpos=compoundpos,
+                prefix_flags=prefix_flags, suffix_flags=suffix_flags, forbidden_flags=forbidden_flags):
             found = False
 
             # There might be several entries for the stem in the dictionary, all with different
             # flags (for example, "spell" as a noun, and "spell" as a verb)
-            homonyms = self.dic.homonyms(form.stem)
+            homonyms = self.dic.homonyms(stem)
 
             # If one of the many homonyms has FORBIDDENWORD flag (and others do not),
             # then the word with this stem *can't* be part of the compound word, and can't have
             # affixes, but still is allowed to exist without them.
             if (not with_forbidden and self.aff.FORBIDDENWORD and
-                    (compoundpos or form.has_affixes()) and
+                    (compoundpos or suffix or prefix) and
                     any(self.aff.FORBIDDENWORD in homonym.flags for homonym in homonyms)):
                 return
 
@@ -405,19 +648,17 @@ class Lookup:
                 # Now, for each possible homonym of word's stem, we check it at is a "good form"
                 # (basically, stem's flags & suffixes flags allow to be combined to each other, and
                 # also allow to be in compound word, if that's the case).
-                candidate = form.replace(in_dictionary=homonym)
-                if is_good_form(candidate):
+                if is_good_form(homonym, prefix, suffix, prefix2, suffix2):
                     found = True
-                    yield candidate
+                    yield (stem, prefix, suffix, prefix2, suffix2, homonym)
 
             # If it then might be required by compound end to be capitalized, we should find it EVEN
             # if the check is "without checking different capitalizations"
             if compoundpos == CompoundPos.BEGIN and self.aff.FORCEUCASE and captype == CapType.INIT:
-                for homonym in self.dic.homonyms(form.stem.lower()):
-                    candidate = form.replace(in_dictionary=homonym)
-                    if is_good_form(candidate):
+                for homonym in self.dic.homonyms(stem.lower()):
+                    if is_good_form(homonym, prefix, suffix, prefix2, suffix2):
                         found = True
-                        yield candidate
+                        yield (stem, prefix, suffix, prefix2, suffix2, homonym)
 
             if found or compoundpos or captype != CapType.ALL:
                 continue
@@ -432,10 +673,9 @@ class Lookup:
             # FIXME: If Casing.variants would return pairs ("word", captype) for all variants,
             # we wouldn't need to re-guess here:
             if self.aff.casing.guess(word) == CapType.NO:
-                for homonym in self.dic.homonyms(form.stem, ignorecase=True):
-                    candidate = form.replace(in_dictionary=homonym)
-                    if is_good_form(candidate):
-                        yield candidate
+                for homonym in self.dic.homonyms(stem, ignorecase=True):
+                    if is_good_form(homonym, prefix, suffix, prefix2, suffix2):
+                        yield (stem, prefix, suffix, prefix2, suffix2, homonym)
 
     def compound_forms(self, word: str, captype: CapType, allow_nosuggest: bool = True) -> Iterator[CompoundForm]:
         """
@@ -453,9 +693,11 @@ class Lookup:
 
         # if we try to decompound "forbiddenword's", AND "forbiddenword" with suffix "'s" is forbidden,
         # we shouldn't even try.
-        if self.aff.FORBIDDENWORD and any(self.aff.FORBIDDENWORD in candidate.flags()
-                                          for candidate in
-                                          self.affix_forms(word, captype=captype, with_forbidden=True)):
+        if self.aff.FORBIDDENWORD and any(self.aff.FORBIDDENWORD in homonym.flags or
+                                          (prefix and self.aff.FORBIDDENWORD in prefix.flags) or
+                                          (suffix and self.aff.FORBIDDENWORD in suffix.flags)
+                                          for _, prefix, suffix, _, _, homonym in
+                                          self._affix_forms(word, captype=captype, with_forbidden=True)):
             return
 
         # The first algorithm is: split the word into several, in all possible ways, and check if
@@ -509,9 +751,24 @@ class Lookup:
                              flags of suffixes/prefixes that are NOT allowed
         """
 
+        for stem, prefix, suffix, prefix2, suffix2 in self._produce_affix_forms(
+                word, prefix_flags=prefix_flags, suffix_flags=suffix_flags, forbidden_flags=forbidden_flags,
+                compoundpos=compoundpos):
+            yield AffixForm(word, stem, prefix=prefix, suffix=suffix, prefix2=prefix2, suffix2=suffix2)
+
+    def _produce_affix_forms(self,
+                             word: str,
+                             prefix_flags: List[str],
+                             suffix_flags: List[str],
+                             forbidden_flags: List[str],
+                             compoundpos: Optional[CompoundPos] = None
+                             ) -> Iterator[Tuple[str, Optional[data.aff.Prefix], Optional[data.aff.Suffix],
+                                                 Optional[data.aff.Prefix], Optional[data.aff.Suffix]]]:
+        # The implementation of produce_affix_forms, producing tuples (stem, prefix, suffix, prefix2, suffix2)
+
         # "Whole word" is always existing option. Note that it might later be rejected in is_good_form
         # if this stem has flag NEEDS_AFFIXES.
-        yield AffixForm(text=word, stem=word)
+        yield (word, None, None, None, None)
 
         # It makes sense to check the suffixes only if the word is not in compound, or in compoundend,
         # or there are special "flags that might allow suffix"
@@ -521,23 +778,24 @@ class Lookup:
 
         if suffix_allowed:
             # Now yield all forms with suffix split out...
-            yield from self.desuffix(word, required_flags=suffix_flags, forbidden_flags=forbidden_flags)
+            for stem, suffix, suffix2 in self._desuffix(word, required_flags=suffix_flags,
+                                                        forbidden_flags=forbidden_flags):
+                yield (stem, None, suffix, None, suffix2)
 
         if prefix_allowed:
             # ...and all forms with prefix split out...
-            for form in self.deprefix(word, required_flags=prefix_flags, forbidden_flags=forbidden_flags):
-                yield form
+            for stem, prefix, prefix2 in self._deprefix(word, required_flags=prefix_flags,
+                                                        forbidden_flags=forbidden_flags):
+                yield (stem, prefix, None, prefix2, None)
 
                 # ...and, IF this prefix allowed to be combined with suffixes, also with prefix
                 # AND suffix split out
-                if suffix_allowed and form.prefix and form.prefix.crossproduct:
-                    yield from (
-                        form2.replace(text=form.text, prefix=form.prefix)
-                        for form2 in self.desuffix(form.stem,
-                                                   required_flags=suffix_flags,
-                                                   forbidden_flags=forbidden_flags,
-                                                   crossproduct=True)
-                    )
+                if suffix_allowed and prefix.crossproduct:
+                    for stem2, suffix, suffix2 in self._desuffix(stem,
+                                                                 required_flags=suffix_flags,
+                                                                 forbidden_flags=forbidden_flags,
+                                                                 crossproduct=True):
+                        yield (stem2, prefix, suffix, None, suffix2)
 
     def desuffix(self, word: str,
                  required_flags: List[str],
@@ -558,38 +816,45 @@ class Lookup:
             forbidden_flags: on compounding, flags that suffix **should not** have
         """
 
-        def good_suffix(suffix):
-            return (
-                (not crossproduct or suffix.crossproduct) and
-                all(f in suffix.flags for f in required_flags) and
-                all(f not in suffix.flags for f in forbidden_flags)
-            )
-
-        # We are selecting suffixes that have flags and settings, and their regexp pattern match
-        # the provided word.
-        possible_suffixes = (
-            suffix
-            for suffix in self.aff.suffixes_index.lookup(word[::-1])
-            if good_suffix(suffix) and suffix.lookup_regexp.search(word)
-        )
+        for stem, suffix, suffix2 in self._desuffix(word, required_flags=required_flags,
+                                                    forbidden_flags=forbidden_flags,
+                                                    nested=nested, crossproduct=crossproduct):
+            yield AffixForm(word, stem, suffix=suffix, suffix2=suffix2)
+
+    def _desuffix(self, word: str,
+                  required_flags: List[str],
+                  forbidden_flags: List[str],
+                  nested: bool = False,
+                  crossproduct: bool = False) -> Iterator[Tuple[str, data.aff.Suffix, Optional[data.aff.Suffix]]]:
+        # The implementation of desuffix, producing tuples (stem, suffix, suffix2)
+
+        # We are selecting suffixes that have flags and settings, and their condition match the
+        # provided word.
+        for suffix in self.affix_indexes()[0].lookup(word[::-1]):
+            if crossproduct and not suffix.crossproduct:
+                continue
+            if required_flags and not all(f in suffix.flags for f in required_flags):
+                continue
+            if forbidden_flags and any(f in suffix.flags for f in forbidden_flags):
+                continue
 
-        # With all of those suffixes, we are producing AffixForms of the word passed
-        for suffix in possible_suffixes:
-            # stem is produced by removing the suffix, and, optionally, adding the part of the
+            # Stem is produced by removing the suffix, and, optionally, adding the part of the
             # stem (named ``strip``). For example, suffix might be declared as ``(strip=y, add=ier)``,
             # then to restore the original stem from word "prettier" we must remove "ier" and add back "y"
-            stem = suffix.replace_regexp.sub(suffix.strip, word)
+            stem = suffix.stem_of(word)
+            if stem is None:
+                continue
 
-            yield AffixForm(word, stem, suffix=suffix)
+            yield (stem, suffix, None)
 
             # Try to remove one more suffix, only one level depth
             if not nested:
-                for form2 in self.desuffix(stem,
-                                           required_flags=[suffix.flag, *required_flags],
-                                           forbidden_flags=forbidden_flags,
-                                           nested=True,
-                                           crossproduct=crossproduct):
-                    yield form2.replace(suffix2=suffix, text=word)
+                for stem2, suffix2, _ in self._desuffix(stem,
+                                                        required_flags=[suffix.flag, *required_flags],
+                                                        forbidden_flags=forbidden_flags,
+                                                        nested=True,
+                                                        crossproduct=crossproduct):
+                    yield (stem2, suffix2, suffix)
 
     def deprefix(self, word: str,
                  required_flags: List[str],
@@ -601,20 +866,27 @@ class Lookup:
         analyse prefixes, and then if they allow cross-production, call desuffix with ``crossproduct=True``
         """
 
-        def good_prefix(prefix):
-            return all(f in prefix.flags for f in required_flags) and \
-                   all(f not in prefix.flags for f in forbidden_flags)
+        for stem, prefix, prefix2 in self._deprefix(word, required_flags=required_flags,
+                                                    forbidden_flags=forbidden_flags, nested=nested):
+            yield AffixForm(word, stem, prefix=prefix, prefix2=prefix2)
 
-        possible_prefixes = (
-            prefix
-            for prefix in self.aff.prefixes_index.lookup(word)
-            if good_prefix(prefix) and prefix.lookup_regexp.search(word)
-        )
+    def _deprefix(self, word: str,
+                  required_flags: List[str],
+                  forbidden_flags: List[str],
+                  nested: bool = False) -> Iterator[Tuple[str, data.aff.Prefix, Optional[data.aff.Prefix]]]:
+        # The implementation of deprefix, producing tuples (stem, prefix, prefix2)
 
-        for prefix in possible_prefixes:
-            stem = prefix.replace_regexp.sub(prefix.strip, word)
+        for prefix in self.affix_indexes()[1].lookup(word):
+            if required_flags and not all(f in prefix.flags for f in required_flags):
+                continue
+            if forbidden_flags and any(f in prefix.flags for f in forbidden_flags):
+                continue
+
+            stem = prefix.stem_of(word)
+            if stem is None:
+                continue
 
-            yield AffixForm(word, stem, prefix=prefix)
+            yield (stem, prefix, None)
 
             # Second prefix is tried *only* when there is the setting ``COMPLEXPREFIXES`` in
             # aff-file, which is quite rare.
@@ -622,11 +894,41 @@ class Lookup:
             # Hunspell doesn't have a test for this (and no wrong lookups should be produced by
             # additional attempt to deprefix), but search for second prefix might be a slowdown
             if not nested and self.aff.COMPLEXPREFIXES:
-                for form2 in self.deprefix(stem,
-                                           required_flags=[prefix.flag, *required_flags],
-                                           forbidden_flags=forbidden_flags,
-                                           nested=True):
-                    yield form2.replace(prefix2=prefix, text=word)
+                for stem2, prefix2, _ in self._deprefix(stem,
+                                                        required_flags=[prefix.flag, *required_flags],
+                                                        forbidden_flags=forbidden_flags,
+                                                        nested=True):
+                    yield (stem2, prefix2, prefix)
+
+    def affix_indexes(self) -> Tuple[Trie, Trie]:
+        """
+        Indexes of suffixes and prefixes used by :meth:`desuffix` and :meth:`deprefix`. They include only
+        affixes that might be a part of some correct form with the words of this dictionary (see
+        :meth:`Aff.affix_indexes <spylls.hunspell.data.aff.Aff.affix_indexes>`). Dictionaries
+        frequently have affixes with flags no stem has (for example, the same .aff is shared by
+        several dictionaries, or the affix is left from the older dictionary version), and otherwise
+        each of them would be checked against every word.
+
+        Indexes are built on the first call, and updated if the dictionary has changed.
+        """
+
+        if self._affix_indexes is not None and self.dic.version == self._affix_indexes_version:
+            return self._affix_indexes
+
+        # Only words added since the previous call are scanned
+        start = self._words_scanned
+        flags = self.dic.used_flags(start)
+        forbidden_stems = self.dic.stems_with_flag(self.aff.FORBIDDENWORD, start) if self.aff.FORBIDDENWORD else []
+
+        if self._affix_indexes is None or not flags <= self._stem_flags or forbidden_stems:
+            self._stem_flags.update(flags)
+            self._forbidden_stems.extend(forbidden_stems)
+            self._affix_indexes = self.aff.affix_indexes(self._stem_flags, self._forbidden_stems)
+
+        self._words_scanned = len(self.dic.words)
+        self._affix_indexes_version = self.dic.version
+
+        return self._affix_indexes
 
     def is_good_form(self,
                      form: AffixForm,
@@ -645,17 +947,38 @@ class Lookup:
             allow_nosuggest: when called from suggest, is set to ``False``
         """
 
-        # Just to make the code a bit simpler, it asks aff. for tons of different stuff
-        aff = self.aff
-
         # Shouldn't happen, just to make mypy happy (to not complain "if root is None, you can't take its flags" below)
         if not form.in_dictionary:
             return False
 
-        root_flags = form.in_dictionary.flags
-        all_flags = form.flags()
+        return self._is_good_form(form.in_dictionary, form.prefix, form.suffix, form.prefix2, form.suffix2,
+                                  compoundpos=compoundpos, captype=captype, allow_nosuggest=allow_nosuggest)
+
+    def _is_good_form(self,
+                      root: data.dic.Word,
+                      prefix: Optional[data.aff.Prefix],
+                      suffix: Optional[data.aff.Suffix],
+                      prefix2: Optional[data.aff.Prefix],
+                      suffix2: Optional[data.aff.Suffix],
+                      compoundpos: Optional[CompoundPos],
+                      captype: CapType,
+                      allow_nosuggest: bool = True) -> bool:
+        # The implementation of is_good_form, receiving form's parts instead of AffixForm
+
+        # Just to make the code a bit simpler, it asks aff. for tons of different stuff
+        aff = self.aff
+
+        root_flags = root.flags
+        # all flags are made from suffix+prefix+stem flags
+        all_flags = root_flags
+        if prefix:
+            all_flags = all_flags.union(prefix.flags)
+        if suffix:
+            all_flags = all_flags.union(suffix.flags)
+        has_affixes = suffix or prefix
+
         # # TODO: Should be guessed on dictionary loading
-        # root_capitalization = aff.casing.guess(form.in_dictionary.stem)
+        # root_capitalization = aff.casing.guess(root.stem)
 
         # If the stem has NOSUGGEST flag, it shouldn't be considered an existing word when called
         # from ``Suggest`` (in other cases allow_nosuggest is True). This allows, for example, to
@@ -666,11 +989,11 @@ class Lookup:
 
         # If word is marked with KEEPCASE, it is considered correct ONLY when spelled exactly that
         # way.
-        if captype != form.in_dictionary.captype and aff.KEEPCASE in root_flags:
+        if captype != root.captype and aff.KEEPCASE in root_flags:
             # but if this is German (with CHECKSHARPS flag), and word has "sharp s", the meaning
             # of KEEPCASE flag is different: "disallow leaving ß in uppercased word, always require
             # SS, but all casing forms are possible"
-            if not (aff.CHECKSHARPS and 'ß' in form.in_dictionary.stem):
+            if not (aff.CHECKSHARPS and 'ß' in root.stem):
                 return False
 
         # **Check affix flags**
@@ -678,27 +1001,27 @@ class Lookup:
         # The NEEDAFFIX flag must mark two cases:
         if aff.NEEDAFFIX:
             # "This stem is incorrect without affixes" (and no affixes provided)
-            if aff.NEEDAFFIX in root_flags and not form.has_affixes():
+            if aff.NEEDAFFIX in root_flags and not has_affixes:
                 return False
             # "All affixes require additional affixes" (usually, it is one suffix, which is "infix" --
             # should have another suffix after it).
-            if form.has_affixes() and all(aff.NEEDAFFIX in a.flags for a in form.all_affixes()):
+            if has_affixes and all(aff.NEEDAFFIX in a.flags for a in filter(None, [prefix2, prefix, suffix, suffix2])):
                 return False
 
         # Prefix might be allowed by: a) stem having this flag or b) suffix having this flag
         # (all flags are made from suffix+prefix+stem flags)
-        if form.prefix and form.prefix.flag not in all_flags:
+        if prefix and prefix.flag not in all_flags:
             return False
         # Suffix might be allowed by: a) stem having this flag or b) prefix having this flag
         # (all flags are made from suffix+prefix+stem flags)
-        if form.suffix and form.suffix.flag not in all_flags:
+        if suffix and suffix.flag not in all_flags:
             return False
 
         # CIRCUMFIX flag, if present, used to mark suffix and prefix that should go together: if
         # one of them present and has it, another one should too.
         if aff.CIRCUMFIX:
-            suffix_has = form.suffix and aff.CIRCUMFIX in form.suffix.flags
-            prefix_has = form.prefix and aff.CIRCUMFIX in form.prefix.flags
+            suffix_has = suffix and aff.CIRCUMFIX in suffix.flags
+            prefix_has = prefix and aff.CIRCUMFIX in prefix.flags
             if bool(prefix_has) != bool(suffix_has):
                 return False
 
@@ -740,7 +1063,8 @@ class Lookup:
         in compound", or "allowed as compound middle" and so on).
 
         Works recursively by first trying to find the allowed beginning of compound (producing it
-        by :meth:`affix_forms`), and if it is found, calling itself with the rest of the word, and so on.
+        by :meth:`affix_forms`), and if it is found, trying to split the rest of the word the same way,
+        and so on.
 
         Args:
             word_rest: the part of the word to split into compounds (entire word initially)
@@ -759,90 +1083,132 @@ class Lookup:
         # * for the first form, prefix_flags not passed (any prefix will do)
         permitflags = [aff.COMPOUNDPERMITFLAG] if aff.COMPOUNDPERMITFLAG else []
 
-        # If it is middle of compounding process "the rest of the word is the whole last part" is always
-        # possible, so we should check it as a compound end
-        if depth:
-            # For all valid ways that the rest of the word might be from dictionary (stem+affixes)...
-            for form in self.affix_forms(word_rest,
-                                         captype=captype,
-                                         compoundpos=CompoundPos.END,
-                                         prefix_flags=permitflags,
-                                         forbidden_flags=forbidden_flags,
-                                         allow_nosuggest=allow_nosuggest):
-                # return it to the recursively calling method
-                yield CompoundForm([form])
-
-        # Check compounding limitation (if the rest of the word is less than 2 allowed parts, or if
-        # the further compounding would produce more parts than allowed)
-        if len(word_rest) < aff.COMPOUNDMIN * 2 or (aff.COMPOUNDWORDMAX and depth >= aff.COMPOUNDWORDMAX):
-            return
+        # The same part of the word is reached by many ways of splitting the text before it: for example,
+        # the rest of "foobarbazquux" after "foo"+"bar" and after "foob"+"ar" is the same "bazquux". So
+        # inside one call, the affix forms of each part (at each compound position: they are different
+        # for the compound beginning, middle and end) are calculated only once, and the rests that
+        # are known to have no way of splitting into compound parts aren't analyzed again.
+        forms_cache: Dict[Tuple[str, CompoundPos], List[AffixForm]] = {}
+        dead_ends: Set[Tuple[str, int]] = set()
+
+        def forms(part: str, compoundpos: CompoundPos) -> List[AffixForm]:
+            key = (part, compoundpos)
+            if key not in forms_cache:
+                forms_cache[key] = list(self.affix_forms(
+                    part,
+                    captype=captype,
+                    compoundpos=compoundpos,
+                    # For the compound beginning, any prefix will do, for the compound end, any suffix
+                    prefix_flags=[] if compoundpos == CompoundPos.BEGIN else permitflags,
+                    suffix_flags=[] if compoundpos == CompoundPos.END else permitflags,
+                    forbidden_flags=forbidden_flags,
+                    allow_nosuggest=allow_nosuggest
+                ))
+            return forms_cache[key]
+
+        def split(word_rest: str, depth: int) -> Iterator[CompoundForm]:
+            if (word_rest, depth) in dead_ends:
+                return
 
-        compoundpos = CompoundPos.MIDDLE if depth else CompoundPos.BEGIN
-        prefix_flags = [] if compoundpos == CompoundPos.BEGIN else permitflags
+            found = False
+            for compound in split_uncached(word_rest, depth):
+                found = True
+                yield compound
+
+            # Only if the search was completed (and not stopped by the caller on some found form)
+            if not found:
+                dead_ends.add((word_rest, depth))
+
+        def split_uncached(word_rest: str, depth: int) -> Iterator[CompoundForm]:
+            # If it is middle of compounding process "the rest of the word is the whole last part" is always
+            # possible, so we should check it as a compound end
+            if depth:
+                # For all valid ways that the rest of the word might be from dictionary (stem+affixes)...
+                for form in forms(word_rest, CompoundPos.END):
+                    # return it to the recursively calling method
+                    yield CompoundForm([form])
+
+            # Check compounding limitation (if the rest of the word is less than 2 allowed parts, or if
+            # the further compounding would produce more parts than allowed)
+            if len(word_rest) < aff.COMPOUNDMIN * 2 or (aff.COMPOUNDWORDMAX and depth >= aff.COMPOUNDWORDMAX):
+                return
 
-        # Now, check all possible split positions, considering allowed size of compound part.
-        # E.g. for COMPOUNDMIN=3, and word is "foobarbaz", the checked possible start of the current
-        # chunk are [foo, foob, fooba, foobar]
-        for pos in range(aff.COMPOUNDMIN, len(word_rest) - aff.COMPOUNDMIN + 1):
-            # Split the word by this position
-            beg = word_rest[0:pos]
-            rest = word_rest[pos:]
-
-            # And for all possible ways it migh be a valid word...
-            for form in self.affix_forms(beg, captype=captype, compoundpos=compoundpos,
-                                         prefix_flags=prefix_flags,
-                                         suffix_flags=permitflags,
-                                         forbidden_flags=forbidden_flags,
-                                         allow_nosuggest=allow_nosuggest):
-                # Recursively try to split the rest of the word ("the whole rest is compound end" also
-                # might be the result)
-                for partial in self.compounds_by_flags(rest, captype=captype, depth=depth+1,
-                                                       allow_nosuggest=allow_nosuggest):
-                    yield CompoundForm([form, *partial.parts])
-
-            # Complication! If the affix has SIMPLIFIEDTRIPLE boolean setting, we must check the
-            # possibility that "foobbar" is actually consisting of "foobb" and "bar" (some language
-            # rules in this case require the third repeating letter to be dropped).
-            if aff.SIMPLIFIEDTRIPLE and beg[-1] == rest[0]:
-                # FIXME: for now, we only try duplicating the first word's letter
-                for form in self.affix_forms(beg + beg[-1], captype=captype, compoundpos=compoundpos,
-                                             prefix_flags=prefix_flags,
-                                             suffix_flags=permitflags,
-                                             forbidden_flags=forbidden_flags,
-                                             allow_nosuggest=allow_nosuggest):
-                    for partial in self.compounds_by_flags(rest, captype=captype, depth=depth+1,
-                                                           allow_nosuggest=allow_nosuggest):
-                        yield CompoundForm([form.replace(text=beg), *partial.parts])
+            compoundpos = CompoundPos.MIDDLE if depth else CompoundPos.BEGIN
+
+            # Without affixes, the part can only end where some stem allowed in compounds ends (see
+            # compound_stems). If the part might have a prefix (the stem then doesn't start at the
+            # beginning of the rest), or be found by its lowercase version (FORCEUCASE), all positions
+            # are checked; if it might have a suffix, positions where some suffix might end are checked, too.
+            ends: Optional[Set[int]] = set(self.compound_stems().lookup(word_rest))
+            if compoundpos == CompoundPos.BEGIN and aff.FORCEUCASE and captype == CapType.INIT:
+                ends = None
+            elif (compoundpos == CompoundPos.BEGIN or permitflags) and \
+                    any(True for _ in self.affix_indexes()[1].lookup(word_rest)):
+                ends = None
+
+            def may_end(pos):
+                if ends is None or pos in ends:
+                    return True
+                return bool(permitflags) and any(True for _ in self.affix_indexes()[0].lookup(word_rest[pos - 1::-1]))
+
+            # Now, check all possible split positions, considering allowed size of compound part.
+            # E.g. for COMPOUNDMIN=3, and word is "foobarbaz", the checked possible start of the current
+            # chunk are [foo, foob, fooba, foobar]
+            for pos in range(aff.COMPOUNDMIN, len(word_rest) - aff.COMPOUNDMIN + 1):
+                # Split the word by this position
+                beg = word_rest[0:pos]
+                rest = word_rest[pos:]
+
+                # And for all possible ways it migh be a valid word...
+                if may_end(pos):
+                    for form in forms(beg, compoundpos):
+                        # Recursively try to split the rest of the word ("the whole rest is compound end"
+                        # also might be the result)
+                        for partial in split(rest, depth + 1):
+                            yield CompoundForm([form, *partial.parts])
+
+                # Complication! If the affix has SIMPLIFIEDTRIPLE boolean setting, we must check the
+                # possibility that "foobbar" is actually consisting of "foobb" and "bar" (some language
+                # rules in this case require the third repeating letter to be dropped).
+                # (Then beg + beg[-1] is the same as word_rest[:pos+1], so the stem should end after it.)
+                if aff.SIMPLIFIEDTRIPLE and beg[-1] == rest[0] and may_end(pos + 1):
+                    # FIXME: for now, we only try duplicating the first word's letter
+                    for form in forms(beg + beg[-1], compoundpos):
+                        for partial in split(rest, depth + 1):
+                            yield CompoundForm([form.replace(text=beg), *partial.parts])
+
+        yield from split(word_rest, depth)
 
     def compounds_by_rules(self,
                            word_rest: str,
                            prev_parts: List[data.dic.Word] = [],
-                           rules: Optional[List[data.aff.CompoundRule]] = None,
+                           state: Optional[FrozenSet[Tuple[int, int]]] = None,
                            allow_nosuggest: bool = True) -> Iterator[CompoundForm]:  # pylint: disable=unused-argument
         """
         Different way of producing compound words: by rules, looking like ``A*BC?CD``, where A, B, C, D
         are flags the word might have, and ``*?`` have the same meaning as in regular expressions.
 
-        In this way, we start by finding rules that partially match the word parts at the beginning,
-        and then recursively split the rest of the word, limiting rules to those still partially matching
-        current set of words.
+        In this way, we start by finding words at the beginning that match the rules partially, and then
+        recursively split the rest of the word, moving further through the rules with each word found.
 
-        Most of the magic happens in :class:`CompoundRule <spylls.hunspell.data.aff.CompoundRule>`
+        Most of the magic happens in :class:`CompoundRuleAutomaton <spylls.hunspell.data.aff.CompoundRuleAutomaton>`
+        (all the rules compiled into one automaton), each word part just moves it into the next state.
 
         Args:
             word_rest: the part of the word to split into compounds (entire word initially)
             prev_parts: already produced word parts
-            rules: list of rules that are still valid on current stage of recursion (all rules from
-                   .aff file initially)
+            state: state of :attr:`Aff.compound_rules <spylls.hunspell.data.aff.Aff.compound_rules>` after
+                   the ``prev_parts`` (initial state of the automaton, if not passed)
             allow_nosuggest: see :meth:`good_forms`
         """
 
         aff = self.aff
+        rules = aff.compound_rules
 
         # initial run
-        if rules is None:
+        if state is None:
             # We start with all known rules
-            rules = self.aff.COMPOUNDRULE
+            state = rules.start
 
         # FIXME: ignores flags like FORBIDDENWORD and nosuggest
 
@@ -850,25 +1216,112 @@ class Lookup:
         # possible
         if prev_parts:
             for homonym in self.dic.homonyms(word_rest):
-                parts = [*prev_parts, homonym]
-                flag_sets = [w.flags for w in parts]
-                if any(r.fullmatch(flag_sets) for r in rules):
+                if rules.is_final(rules.step(state, homonym.flags)):
                     yield CompoundForm([AffixForm(word_rest, word_rest)])
 
         if len(word_rest) < aff.COMPOUNDMIN * 2 or \
                 (aff.COMPOUNDWORDMAX and len(prev_parts) >= aff.COMPOUNDWORDMAX):
             return
 
+        # Only places where some stem having the flags of compound rules ends (see compound_stems) are
+        # checked
+        ends = set(self.compound_stems().lookup(word_rest))
+
         for pos in range(aff.COMPOUNDMIN, len(word_rest) - aff.COMPOUNDMIN + 1):
+            if pos not in ends:
+                continue
             beg = word_rest[0:pos]
             for homonym in self.dic.homonyms(beg):
-                parts = [*prev_parts, homonym]
-                flag_sets = [w.flags for w in parts]
-                compoundrules = [r for r in rules if r.partial_match(flag_sets)]
-                if compoundrules:
-                    for rest in self.compounds_by_rules(word_rest[pos:], rules=compoundrules, prev_parts=parts):
+                # If the empty state is reached, the parts can't be a beginning of any rule
+                next_state = rules.step(state, homonym.flags)
+                if next_state:
+                    parts = [*prev_parts, homonym]
+                    for rest in self.compounds_by_rules(word_rest[pos:], prev_parts=parts, state=next_state):
                         yield CompoundForm([AffixForm(beg, beg), *rest.parts])
 
+    def is_bad_boundary(self, left: str, right: str, captype: CapType) -> bool:
+        """
+        The part of :meth:`is_bad_compound` checks for two adjacent compound parts that requires the
+        dictionary lookups (and therefore is the most expensive):
+
+        * if "foo bar" is present as a singular dictionary entry, compound word containing "(foo)(bar)"
+          parts is not correct;
+        * with ``CHECKCOMPOUNDREP``, the compound is not correct if some replacement from ``REP`` table
+          in "foobar" produces a correct word.
+
+        The same pairs of parts are checked again and again: in all the compound hypotheses for the
+        word, and in many different words, so the verdicts are kept in a bounded cache
+        (:class:`LRUCache <spylls.hunspell.algo.cache.LRUCache>` of ``BOUNDARY_CACHE_SIZE`` pairs,
+        dropped when the dictionary is changed). The first check is skipped completely if no
+        dictionary entry (and no affix) contains a space.
+
+        Args:
+            left: Text of the left part
+            right: Text of the right part
+            captype: Checked word capitalization type
+        """
+
+        if self.dic.version != self._boundary_cache_version:
+            self._boundary_cache.clear()
+            # Only words added since the previous call are scanned
+            if not self._multiword and self.dic.has_multiword_stems(self._multiword_scanned):
+                self._multiword = True
+            self._multiword_scanned = len(self.dic.words)
+            self._boundary_cache_version = self.dic.version
+
+        key = (left, right, captype)
+        verdict = self._boundary_cache.get(key)
+        if verdict is not None:
+            return verdict
+
+        verdict = False
+
+        # If "foo bar" is present as a _singular_ dictionary entry, compound word containing
+        # "(foo)(bar)" parts is not correct.
+        if self._multiword and any(self._affix_forms(left + ' ' + right, captype=captype)):
+            verdict = True
+
+        elif self.aff.CHECKCOMPOUNDREP:
+            # CHECKCOMPOUNDREP setting tells:
+            # If REP-table (suggesting frequent misspelling replacements) is present, and any of the
+            # replacements produces valid affix form, the compound can't contain that.
+            #
+            # FIXME: Or is it valid only for the whole "foobar" compound?..
+            verdict = any(
+                isinstance(candidate, str) and any(self._affix_forms(candidate, captype=captype))
+                for candidate in pmt.replchars(left + right, self.aff.REP)
+            )
+
+        self._boundary_cache.put(key, verdict)
+        return verdict
+
+    def compound_stems(self) -> Trie:
+        """
+        Trie of the stems that can be parts of compound words: the ones having flags ``COMPOUNDFLAG``,
+        ``COMPOUNDBEGIN``, ``COMPOUNDMIDDLE``, ``COMPOUNDEND``, or flags used in ``COMPOUNDRULE``, with
+        lengths of the stems as payloads. One pass through it with the word gives all the positions
+        where some of those stems end, so :meth:`compounds_by_flags` and :meth:`compounds_by_rules`
+        don't try to split the word in any other place (unless affixes make it possible, see the code).
+
+        The trie is built on the first call, and updated if the dictionary has changed.
+        """
+
+        if self.dic.version != self._compound_stems_version:
+            aff = self.aff
+            flags = {aff.COMPOUNDFLAG, aff.COMPOUNDBEGIN, aff.COMPOUNDMIDDLE, aff.COMPOUNDEND}
+            flags.update(*(rule.flags for rule in aff.COMPOUNDRULE))
+            flags.discard(None)
+
+            # Only words added since the previous call are scanned
+            if flags:
+                for stem in self.dic.stems_with_any_flag(flags, self._compound_stems_scanned):
+                    self._compound_stems.put(stem, len(stem))
+
+            self._compound_stems_scanned = len(self.dic.words)
+            self._compound_stems_version = self.dic.version
+
+        return self._compound_stems
+
     def is_bad_compound(self, compound: CompoundForm, captype: CapType) -> bool:
         """
         After the hypothesis "this word is compound word, consisting of those parts" is produced, even
@@ -899,21 +1352,10 @@ class Lookup:
                 if self.dic.has_flag(left, aff.COMPOUNDFORBIDFLAG):
                     return True
 
-            # If "foo bar" is present as a _singular_ dictionary entry, compound word containing
-            # "(foo)(bar)" parts is not correct.
-            if any(self.affix_forms(left + ' ' + right, captype=captype)):
+            # Checks requiring dictionary lookups
+            if self.is_bad_boundary(left, right, captype):
                 return True
 
-            if aff.CHECKCOMPOUNDREP:
-                # CHECKCOMPOUNDREP setting tells:
-                # If REP-table (suggesting frequent misspelling replacements) is present, and any of the
-                # replacements produces valid affix form, the compound can't contain that.
-                #
-                # FIXME: Or is it valid only for the whole "foobar" compound?..
-                for candidate in pmt.replchars(left + right, aff.REP):
-                    if isinstance(candidate, str) and any(self.affix_forms(candidate, captype=captype)):
-                        return True
-
             if aff.CHECKCOMPOUNDTRIPLE:
                 # CHECKCOMPOUNDTRIPLE setting tells, that if there is triplificatioin of some letter
                 # on the bound of two parts (like "foobb" + "bar"), it is not correct compound word
@@ -14,7 +14,7 @@ Scoring
 
 """
 
-from typing import Iterator, Tuple, List, Set, Dict
+from typing import Iterator, Iterable, Tuple, List, Set, Dict
 from operator import itemgetter
 import heapq
 
@@ -27,7 +27,7 @@ MAX_GUESSES = 200
 
 
 def ngram_suggest(misspelling: str, *,
-                  dictionary_words: List[data.dic.Word],
+                  dictionary_words: Iterable[data.dic.Word],
                   prefixes: Dict[str, List[data.aff.Prefix]],
                   suffixes: Dict[str, List[data.aff.Suffix]],
                   known: Set[str], maxdiff: int, onlymaxdiff: bool = False) -> Iterator[str]:
@@ -278,13 +278,13 @@ def forms_for(word: data.dic.Word, all_prefixes, all_suffixes, *, similar_to: st
         suffix
         for flag in word.flags
         for suffix in all_suffixes.get(flag, [])
-        if suffix.cond_regexp.search(word.stem) and similar_to.endswith(suffix.add)
+        if similar_to.endswith(suffix.add) and suffix.condition_matches(word.stem)
     ]
     prefixes = [
         prefix
         for flag in word.flags
         for prefix in all_prefixes.get(flag, [])
-        if prefix.cond_regexp.search(word.stem) and similar_to.startswith(prefix.add)
+        if similar_to.startswith(prefix.add) and prefix.condition_matches(word.stem)
     ]
 
     cross = [
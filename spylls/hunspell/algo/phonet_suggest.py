@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Iterator, List, Tuple
+from typing import Iterator, Iterable, List, Tuple
 from operator import itemgetter
 import heapq
 
@@ -12,7 +12,7 @@ import spylls.hunspell.algo.ngram_suggest as ng
 MAX_ROOTS = 100
 
 
-def phonet_suggest(misspelling: str, *, dictionary_words: List[dic.Word], table: aff.PhonetTable) -> Iterator[str]:
+def phonet_suggest(misspelling: str, *, dictionary_words: Iterable[dic.Word], table: aff.PhonetTable) -> Iterator[str]:
     """
     Phonetical suggestion algorithm provides suggestions based on phonetical (prononication) similarity.
     It requires .aff file to define :attr:`PHONE <spylls.hunspell.data.aff.Aff.PHONE>` table --
@@ -45,7 +45,7 @@ Suggestion classes
 
 """
 
-from typing import Iterator, List, Set, Union
+from typing import Iterator, List, Set, Union, Optional, Sequence
 
 import dataclasses
 from dataclasses import dataclass
@@ -139,6 +139,7 @@ class Suggest:
 
     .. automethod:: ngram_suggestions
     .. automethod:: phonet_suggestions
+    .. autoattribute:: words_for_ngram
     """
     def __init__(self, aff: data.Aff, dic: data.Dic, lookup):
         self.aff = aff
@@ -152,10 +153,25 @@ class Suggest:
         # even if it is the perfectly normal way to spell.
         self.use_dash = '-' in self.aff.TRY or 'a' in self.aff.TRY
 
-        # TODO: also NONGRAMSUGGEST and ONLYUPCASE
-        bad_flags = {*filter(None, [self.aff.FORBIDDENWORD, self.aff.NOSUGGEST, self.aff.ONLYINCOMPOUND])}
+        self._words_for_ngram: Optional[Sequence[data.dic.Word]] = None
 
-        self.words_for_ngram = [word for word in self.dic.words if not bad_flags.intersection(word.flags)]
+    @property
+    def words_for_ngram(self) -> Sequence[data.dic.Word]:
+        """
+        Dictionary words that can be used by ngram- and phonetical suggestions. Calculated on
+        first access (it requires scanning the whole dictionary, and many clients never need
+        ngram suggestions). For :class:`MappedDic <spylls.hunspell.data.mapped_dic.MappedDic>`, it is
+        a lazy sequence, constructing words only while iterated (see
+        :meth:`MappedDic.words_without_flags <spylls.hunspell.data.mapped_dic.MappedDic.words_without_flags>`).
+        """
+
+        if self._words_for_ngram is None:
+            # TODO: also NONGRAMSUGGEST and ONLYUPCASE
+            bad_flags = {*filter(None, [self.aff.FORBIDDENWORD, self.aff.NOSUGGEST, self.aff.ONLYINCOMPOUND])}
+
+            self._words_for_ngram = self.dic.words_without_flags(bad_flags)
+
+        return self._words_for_ngram
 
     def __call__(self, word: str) -> Iterator[str]:
         """
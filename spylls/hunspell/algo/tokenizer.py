@@ -0,0 +1,139 @@
+"""
+Splitting the text into words to check, used by
+:meth:`Dictionary.check_text <spylls.hunspell.dictionary.Dictionary.check_text>`.
+
+Hunspell itself checks only separate words, so what is "the word" is decided by the client; but
+the dictionary tells some of it:
+
+* letters and digits are always word characters, and so are combining marks (Unicode category M:
+  vowel signs of Indic scripts, Hebrew and Arabic points, accents of decomposed text, like "e" +
+  U+0301 in NFD "café");
+* ``WORDCHARS`` (see :attr:`Aff.WORDCHARS <spylls.hunspell.data.aff.Aff.WORDCHARS>`) lists
+  additional ones (in en_US, for example, it is digits and apostrophe, so "doesn't" is one word);
+* single-character ``BREAK`` patterns (see :attr:`Aff.BREAK <spylls.hunspell.data.aff.Aff.BREAK>`,
+  by default it is ``-``) are allowed *between* word characters, so "left-right" is passed to lookup
+  as one word (and lookup decides if it should be broken into parts); apostrophes (``'`` and ``’``)
+  are treated the same way.
+
+The text is processed as a stream of chunks (lines of the file, or blocks of fixed size), and only
+the last, possibly unfinished, word of the chunk is carried over to the next one, so the memory used
+doesn't depend on the size of the text.
+
+.. autoclass:: Tokenizer
+    :members:
+
+.. autofunction:: combining_marks
+"""
+
+import re
+import sys
+import functools
+import itertools
+import unicodedata
+from typing import Iterable, Iterator, Tuple
+
+from spylls.hunspell import data
+
+APOSTROPHES = "'’"
+
+
+@functools.lru_cache(maxsize=None)
+def combining_marks() -> str:
+    """
+    Contents of the regexp character class (ranges of characters) matching all combining marks
+    (Unicode category M), which Python's :mod:`re` has no shortcut for. Calculated from
+    :mod:`unicodedata` on the first call.
+    """
+
+    # Marks are only in the first two planes and in the "variation selectors supplement" of plane 14;
+    # planes 2-3 are CJK ideographs, 4-13 unassigned, 15-16 private use, so there is no need to scan them.
+    codes = itertools.chain(range(0x20000), range(0xE0000, min(0xE1000, sys.maxunicode + 1)))
+
+    ranges = []
+    for code in codes:
+        if unicodedata.category(chr(code)).startswith('M'):
+            if ranges and ranges[-1][1] == code - 1:
+                ranges[-1][1] = code
+            else:
+                ranges.append([code, code])
+
+    return ''.join(
+        re.escape(chr(first)) + ('-' + re.escape(chr(last)) if last > first else '')
+        for first, last in ranges
+    )
+
+
+class Tokenizer:
+    """
+    Splits text into words by the rules of the dictionary.
+
+    ::
+
+        >>> tokenizer = Tokenizer(dictionary.aff)
+        >>> [*tokenizer.tokenize(["It's a well-", "known fact."])]
+        [(0, 4, "It's"), (5, 6, 'a'), (7, 17, 'well-known'), (18, 22, 'fact')]
+
+    Args:
+        aff: Dictionary settings
+    """
+
+    def __init__(self, aff: data.aff.Aff):
+        wordchars = aff.WORDCHARS or ''
+        breaks = (pattern.pattern.strip('^$') for pattern in aff.BREAK)
+        joiners = {*APOSTROPHES, *(pattern for pattern in breaks if len(pattern) == 1)} - set(wordchars)
+
+        # [^\W_] is "letter or digit" (\w without underscore)
+        # Runs of letters/digits first, as they are the vast majority of word characters
+        char = r'(?:[^\W_]+|[' + combining_marks() + re.escape(wordchars) + ']+)'
+        joiner = '[' + re.escape(''.join(sorted(joiners))) + ']'
+
+        self.regexp = re.compile(f'{char}+(?:{joiner}{char}+)*')
+        self.extra_chars = set(wordchars) | joiners
+
+    def tokenize(self, chunks: Iterable[str]) -> Iterator[Tuple[int, int, str]]:
+        """
+        Produces ``(start, end, word)`` for each word of the text, where ``start`` and ``end`` are
+        offsets in the whole text (as if all the chunks were concatenated).
+
+        Args:
+            chunks: Parts of the text, like lines of the file
+        """
+
+        buffer = ''
+        offset = 0      # offset of the buffer's start in the whole text
+
+        for chunk in chunks:
+            buffer += chunk
+
+            # Everything before the last non-word character is complete; the rest might continue in
+            # the next chunk
+            cut = len(buffer)
+            while cut and self.is_word_char(buffer[cut - 1]):
+                cut -= 1
+
+            yield from self.words(buffer[:cut], offset)
+            buffer = buffer[cut:]
+            offset += cut
+
+        yield from self.words(buffer, offset)
+
+    def words(self, text: str, offset: int = 0) -> Iterator[Tuple[int, int, str]]:
+        """
+        Produces ``(start, end, word)`` for each word of complete text (or its part which doesn't end
+        in the middle of the word), adding ``offset`` to positions.
+        """
+        for match in self.regexp.finditer(text):
+            start, end = match.span()
+            yield (start + offset, end + offset, match.group())
+
+    def is_word_char(self, char: str) -> bool:
+        """
+        Whether the character can be a part of the word (including ones allowed only between word
+        characters).
+        """
+        return (
+            (char.isalnum() and char != '_') or
+            char in self.extra_chars or
+            # There are no combining marks before U+0300
+            (char >= '\u0300' and unicodedata.category(char).startswith('M'))
+        )
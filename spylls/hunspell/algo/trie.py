@@ -49,13 +49,20 @@ class Trie:
         cur.payloads = payloads
 
     def lookup(self, path):
-        for _, leaf in self.traverse(self.root, path):
-            for payload in leaf.payloads:
-                yield payload
+        # Plain loop instead of recursive traverse: no intermediate generators, lists or path slices
+        # are created on each level, and children.get doesn't create empty nodes in defaultdict.
+        cur = self.root
+        yield from cur.payloads
+        for p in path:
+            cur = cur.children.get(p)
+            if cur is None:
+                return
+            yield from cur.payloads
 
     def traverse(self, cur, path, traversed=[]):
         yield (traversed, cur)
-        if not path or path[0] not in cur.children:
-            return
-        for p, leaf in self.traverse(cur.children[path[0]], path[1:], [*traversed, path[0]]):
-            yield (p, leaf)
+        for depth, p in enumerate(path):
+            cur = cur.children.get(p)
+            if cur is None:
+                return
+            yield ([*traversed, *path[:depth + 1]], cur)
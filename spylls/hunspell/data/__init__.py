@@ -1,4 +1,5 @@
 from spylls.hunspell.data.aff import Aff
 from spylls.hunspell.data.dic import Dic
+from spylls.hunspell.data.mapped_dic import MappedDic
 
-__all__ = ['Aff', 'Dic']
+__all__ = ['Aff', 'Dic', 'MappedDic']
@@ -65,6 +65,7 @@ This classes are wrapping several types of somewhat pattern-alike objects that c
 .. autoclass:: ConvTable
 .. autoclass:: CompoundPattern
 .. autoclass:: CompoundRule
+.. autoclass:: CompoundRuleAutomaton
 .. autoclass:: PhonetTable
 """
 
@@ -76,7 +77,7 @@ from operator import itemgetter
 from collections import defaultdict
 
 from dataclasses import dataclass, field
-from typing import List, Set, Dict, Tuple, Optional
+from typing import Callable, List, Set, FrozenSet, Dict, Tuple, Optional, Collection, Iterable
 
 from spylls.hunspell.algo.capitalization import Casing, GermanCasing, TurkicCasing
 from spylls.hunspell.algo.trie import Trie
@@ -157,6 +158,67 @@ class RepPattern:
         self.regexp = re.compile(self.pattern)
 
 
+class _lazy:  # pylint: disable=invalid-name,too-few-public-methods
+    # Like functools.cached_property (which is available only since Python 3.8): calculates the
+    # value on first access and stores it in instance's __dict__, so next time it is just an attribute.
+    def __init__(self, func):
+        self.func = func
+        self.__doc__ = func.__doc__
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = instance.__dict__[self.func.__name__] = self.func(instance)
+        return value
+
+
+# Lots of affixes have the same conditions (or the same "add" part), so each distinct regexp is
+# compiled once and shared. (The cache is bounded only for it not to grow forever when many
+# dictionaries are loaded in one process; affixes keep their regexps once compiled anyway.)
+_compile = functools.lru_cache(maxsize=16384)(re.compile)
+
+# Chars having special meaning in regexps. Affixes which "add" or "strip" parts, or conditions,
+# contain them (which is extremely rare, and probably a dictionary author's mistake), are checked with
+# regexps, to behave exactly like before.
+_REGEXP_SPECIAL = frozenset('.^$*+?{}[]\\|()')
+
+# Condition position matching any char: "not one of nothing"
+_ANY = (frozenset(), True)
+
+CharSets = Tuple[Tuple[FrozenSet[str], bool], ...]
+
+
+def _char_sets(condition: str) -> Optional[CharSets]:
+    # Parses (escaped with Affix._condition) condition into a tuple of (chars, negated) for each
+    # position, or returns None if it has something besides plain chars, "." and [...]/[^...] groups.
+    result = []
+    pos = 0
+    while pos < len(condition):
+        char = condition[pos]
+        if char == '[':
+            end = condition.find(']', pos + 1)
+            if end == -1:
+                return None
+            chars = condition[pos+1:end].replace('\\-', '-')
+            negated = chars.startswith('^')
+            if negated:
+                chars = chars[1:]
+            if not chars or '[' in chars or '\\' in chars:
+                return None
+            result.append((frozenset(chars), negated))
+            pos = end + 1
+        elif char == '.':
+            result.append(_ANY)
+            pos += 1
+        elif char in _REGEXP_SPECIAL:
+            return None
+        else:
+            result.append((frozenset(char), False))
+            pos += 1
+
+    return tuple(result)
+
+
 @dataclass
 class Affix:
     """
@@ -222,7 +284,40 @@ class Affix:
     #: Condition against which stem should be checked to understand whether this affix is relevant
     condition: str
     #: Flags this affix has
-    flags: Set[str] = field(default_factory=set)
+    flags: FrozenSet[str] = field(default_factory=frozenset)
+
+    # Regexps (cond_regexp, lookup_regexp, replace_regexp) are defined in Prefix/Suffix and compiled
+    # only on first access: big dictionaries have tens of thousands of affixes, and most of them are
+    # never checked during the session. Compiled regexps are not pickled, too (recompiling them on
+    # unpickling is the major part of the time it takes).
+
+    # Conditions are also parsed (on first access, too) into ``cond_chars`` and ``lookup_chars``:
+    # tuples of (set of chars, whether the set is negated) for each position of the condition, so the
+    # checks done on every lookup are simple string operations instead of regexp matching (see
+    # Prefix.stem_of/Suffix.stem_of). Regexps are still used for the rare affixes with something
+    # regexp-special besides char groups. Nothing that is built lazily is pickled.
+
+    def __getstate__(self):
+        return {name: value for name, value in self.__dict__.items()
+                if not isinstance(getattr(type(self), name, None), _lazy)}
+
+    def _condition(self) -> str:
+        # "-" does NOT have a special regex-meaning, while might happen as a regular word char (for ex., hu_HU)
+        return self.condition.replace('-', '\\-')
+
+    def _cond_parts(self) -> List[str]:
+        return re.findall(r'(\[.+\]|[^\[])', self._condition())
+
+    @_lazy
+    def cond_chars(self) -> Optional[CharSets]:
+        """
+        The condition as char sets for each position (see ``condition_matches`` of :class:`Prefix`
+        and :class:`Suffix`), ``None`` if it can't be represented this way.
+        """
+        return _char_sets(self._condition())
+
+    def _plain(self) -> bool:
+        return not _REGEXP_SPECIAL.intersection(self.add) and '\\' not in self.strip
 
 
 @dataclass
@@ -231,21 +326,109 @@ class Prefix(Affix):
     :class:`Affix` at the beginning of the word, stored in :attr:`Aff.PFX` directive.
     """
 
-    def __post_init__(self):
-        # "-" does NOT have a special regex-meaning, while might happen as a regular word char (for ex., hu_HU)
-        condition = self.condition.replace('-', '\\-')
-        self.cond_regexp = re.compile('^' + condition)
-
-        cond_parts = re.findall(r'(\[.+\]|[^\[])', condition)
-        cond_parts = cond_parts[len(self.strip):]
-
-        if cond_parts and cond_parts != ['.']:
-            cond = '(?=' + ''.join(cond_parts) + ')'
+    @_lazy
+    def cond_regexp(self) -> re.Pattern:
+        """
+        Regexp to check whether the affix is applicable to the stem.
+        """
+        return _compile('^' + self._condition())
+
+    @_lazy
+    def lookup_regexp(self) -> re.Pattern:
+        """
+        Regexp to check whether the word might have this affix (what is added, and the part of the
+        condition that is not stripped).
+        """
+        cond_parts = self._lookup_cond_parts()
+        cond = '(?=' + ''.join(cond_parts) + ')' if cond_parts else ''
+
+        return _compile('^' + self.add + cond)
+
+    @_lazy
+    def replace_regexp(self) -> re.Pattern:
+        """
+        Regexp to remove the affix from the word.
+        """
+        return _compile('^' + self.add)
+
+    @_lazy
+    def lookup_chars(self) -> Optional[CharSets]:
+        """
+        Same as :attr:`lookup_regexp`'s condition, as char sets for each position (or ``None`` if
+        the regexp should be used).
+        """
+        if not self._plain():
+            return None
+        return _char_sets(''.join(self._lookup_cond_parts()))
+
+    def _lookup_cond_parts(self) -> List[str]:
+        cond_parts = self._cond_parts()[len(self.strip):]
+        return cond_parts if cond_parts != ['.'] else []
+
+    @_lazy
+    def condition_matches(self) -> Callable[[str], bool]:
+        """
+        Function: whether the affix is applicable to the stem (same as ``cond_regexp.search(stem)``).
+        Built on first access, like :attr:`stem_of`.
+        """
+        cond_chars = self.cond_chars
+
+        if cond_chars is None:
+            cond_regexp = self.cond_regexp
+
+            def condition_matches(stem):
+                return cond_regexp.search(stem) is not None
+        elif not cond_chars:
+            def condition_matches(stem):
+                return True
         else:
-            cond = ''
-
-        self.lookup_regexp = re.compile('^' + self.add + cond)
-        self.replace_regexp = re.compile('^' + self.add)
+            (first_chars, first_negated), *other_chars = cond_chars
+
+            def condition_matches(stem):
+                if not stem or (stem[0] in first_chars) == first_negated or len(stem) < len(cond_chars):
+                    return False
+                for pos, (chars, negated) in enumerate(other_chars, 1):
+                    if (stem[pos] in chars) == negated:
+                        return False
+                return True
+
+        return condition_matches
+
+    @_lazy
+    def stem_of(self) -> Callable[[str], Optional[str]]:
+        """
+        Function: if the word might have this affix (see :attr:`lookup_regexp`), returns the stem (the
+        word with affix removed and ``strip`` part restored), otherwise ``None``. It is called for
+        every candidate affix on lookup, so it is built on first access, specialized for the
+        condition (most of conditions check no chars or one char).
+        """
+        add, strip, size = self.add, self.strip, len(self.add)
+        lookup_chars = self.lookup_chars
+
+        if lookup_chars is None:
+            lookup_regexp, replace_regexp = self.lookup_regexp, self.replace_regexp
+
+            def stem_of(word):
+                return replace_regexp.sub(strip, word) if lookup_regexp.search(word) else None
+        elif not lookup_chars:
+            def stem_of(word):
+                return strip + word[size:] if word.startswith(add) else None
+        else:
+            # The first position (just after the prefix) is checked before others: usually, the
+            # condition is just one char, and even when it is longer, most of the words fail there.
+            (first_chars, first_negated), *other_chars = lookup_chars
+            length = size + len(lookup_chars)
+
+            def stem_of(word):
+                if (len(word) < length or (word[size] in first_chars) == first_negated or
+                        not word.startswith(add)):
+                    return None
+                for pos, (chars, negated) in enumerate(other_chars, size + 1):
+                    if (word[pos] in chars) == negated:
+                        return None
+                return strip + word[size:]
+
+        return stem_of
 
     def __repr__(self):
         return (
@@ -261,22 +444,114 @@ class Suffix(Affix):
     :class:`Affix` at the end of the word, stored in :attr:`Aff.SFX` directive.
     """
 
-    def __post_init__(self):
-        # "-" does NOT have a special regex-meaning, while might happen as a regular word char (for ex., hu_HU)
-        condition = self.condition.replace('-', '\\-')
-        self.cond_regexp = re.compile(condition + '$')
-
-        cond_parts = re.findall(r'(\[.+\]|[^\[])', condition)
+    @_lazy
+    def cond_regexp(self) -> re.Pattern:
+        """
+        Regexp to check whether the affix is applicable to the stem.
+        """
+        return _compile(self._condition() + '$')
+
+    @_lazy
+    def lookup_regexp(self) -> re.Pattern:
+        """
+        Regexp to check whether the word might have this affix (what is added, and the part of the
+        condition that is not stripped).
+        """
+        cond_parts = self._lookup_cond_parts()
+        cond = '(' + ''.join(cond_parts) + ')' if cond_parts else ''
+
+        return _compile(cond + self.add + '$')
+
+    @_lazy
+    def replace_regexp(self) -> re.Pattern:
+        """
+        Regexp to remove the affix from the word.
+        """
+        return _compile(self.add + '$')
+
+    @_lazy
+    def lookup_chars(self) -> Optional[CharSets]:
+        """
+        Same as :attr:`lookup_regexp`'s condition, as char sets for each position (or ``None`` if
+        the regexp should be used).
+        """
+        if not self._plain():
+            return None
+        return _char_sets(''.join(self._lookup_cond_parts()))
+
+    def _lookup_cond_parts(self) -> List[str]:
+        cond_parts = self._cond_parts()
         if self.strip:
             cond_parts = cond_parts[:-len(self.strip)]
-
-        if cond_parts and cond_parts != ['.']:
-            cond = '(' + ''.join(cond_parts) + ')'
+        return cond_parts if cond_parts != ['.'] else []
+
+    @_lazy
+    def condition_matches(self) -> Callable[[str], bool]:
+        """
+        Function: whether the affix is applicable to the stem (same as ``cond_regexp.search(stem)``).
+        Built on first access, like :attr:`stem_of`.
+        """
+        cond_chars = self.cond_chars
+
+        if cond_chars is None:
+            cond_regexp = self.cond_regexp
+
+            def condition_matches(stem):
+                return cond_regexp.search(stem) is not None
+        elif not cond_chars:
+            def condition_matches(stem):
+                return True
         else:
-            cond = ''
-
-        self.lookup_regexp = re.compile(cond + self.add + '$')
-        self.replace_regexp = re.compile(self.add + '$')
+            *other_chars, (last_chars, last_negated) = cond_chars
+            other_chars.reverse()
+
+            def condition_matches(stem):
+                if not stem or (stem[-1] in last_chars) == last_negated or len(stem) < len(cond_chars):
+                    return False
+                for pos, (chars, negated) in enumerate(other_chars, 2):
+                    if (stem[-pos] in chars) == negated:
+                        return False
+                return True
+
+        return condition_matches
+
+    @_lazy
+    def stem_of(self) -> Callable[[str], Optional[str]]:
+        """
+        Function: if the word might have this affix (see :attr:`lookup_regexp`), returns the stem (the
+        word with affix removed and ``strip`` part restored), otherwise ``None``. Built on first
+        access, specialized for the condition, same as :attr:`Prefix.stem_of`.
+        """
+        add, strip, size = self.add, self.strip, len(self.add)
+        lookup_chars = self.lookup_chars
+
+        if lookup_chars is None:
+            lookup_regexp, replace_regexp = self.lookup_regexp, self.replace_regexp
+
+            def stem_of(word):
+                return replace_regexp.sub(strip, word) if lookup_regexp.search(word) else None
+        elif not lookup_chars:
+            def stem_of(word):
+                return word[:len(word) - size] + strip if word.endswith(add) else None
+        else:
+            # Checked from the end: the last position (just before the suffix) is checked before
+            # others, as in Prefix.stem_of
+            *other_chars, (last_chars, last_negated) = lookup_chars
+            other_chars.reverse()
+
+            def stem_of(word):
+                end = len(word) - size
+                if (end < len(lookup_chars) or (word[end - 1] in last_chars) == last_negated or
+                        not word.endswith(add)):
+                    return None
+                pos = end - 1
+                for chars, negated in other_chars:
+                    pos -= 1
+                    if (word[pos] in chars) == negated:
+                        return None
+                return word[:end] + strip
+
+        return stem_of
 
     def __repr__(self):
         return (
@@ -324,6 +599,8 @@ class CompoundRule:
 
     Which makes "111th" valid (one hundred eleventh): "1" with "n", "1" with "1" and "1th" with "t"
     is valid by rule ``n*1t``, but "121th" is not valid (should be "121st")
+
+    Lookup checks all the rules at once, with :attr:`Aff.compound_rules`.
     """
 
     text: str
@@ -333,32 +610,114 @@ class CompoundRule:
         # This works but is super ad-hoc!
         if '(' in self.text:
             self.flags = set(re.findall(r'\((.+?)\)', self.text))
-            parts = re.findall(r'\([^*?]+?\)[*?]?', self.text)
+            parts = re.findall(r'\(([^*?]+?)\)([*?]?)', self.text)
         else:
+            # There are ) and . flags used in real-life sv_* dictionaries, so no char except * and ?
+            # has a special meaning
             self.flags = set(re.sub(r'[\*\?]', '', self.text))
-            # There are ) flags used in real-life sv_* dictionaries
-            # Obviously it is quite ad-hoc (other chars that have special meaning in regexp might be
-            # used eventually)
-            parts = [part.replace(')', '\\)') for part in re.findall(r'[^*?][*?]?', self.text)]
-
-        self.re = re.compile(''.join(parts))
-        self.partial_re = re.compile(
-            functools.reduce(lambda res, part: f"{part}({res})?", parts[::-1])
-        )
+            parts = re.findall(r'([^*?])([*?]?)', self.text)
 
-    def fullmatch(self, flag_sets):
-        relevant_flags = [self.flags.intersection(f) for f in flag_sets]
-        return any(
-            self.re.fullmatch(''.join(fc))
-            for fc in itertools.product(*relevant_flags)
-        )
+        #: List of ``(flag, quantifier)`` pairs, quantifier is ``'*'``, ``'?'`` or empty string
+        self.parts: List[Tuple[str, str]] = parts
 
-    def partial_match(self, flag_sets):
-        relevant_flags = [self.flags.intersection(f) for f in flag_sets]
-        return any(
-            self.partial_re.fullmatch(''.join(fc))
-            for fc in itertools.product(*relevant_flags)
-        )
+        self.automaton = CompoundRuleAutomaton([self])
+
+    def fullmatch(self, flag_sets: List[FrozenSet[str]]) -> bool:
+        """
+        Whether the sequence of words with these flags matches the rule.
+        """
+        return self.automaton.is_final(self.automaton.run(flag_sets))
+
+    def partial_match(self, flag_sets: List[FrozenSet[str]]) -> bool:
+        """
+        Whether the sequence of words with these flags matches the beginning of the rule.
+        """
+        return bool(self.automaton.run(flag_sets))
+
+
+class CompoundRuleAutomaton:
+    """
+    Set of :class:`CompoundRule` compiled into one deterministic automaton, reading flag sets of the
+    compound parts one by one. It allows to check the compound in time linear to the number of parts,
+    and to continue the check when the next part is added, without re-checking the previous ones
+    (which is exactly what :meth:`Lookup.compounds_by_rules <spylls.hunspell.algo.lookup.Lookup.compounds_by_rules>`
+    does).
+
+    ::
+
+        >>> automaton = CompoundRuleAutomaton([CompoundRule('n*1t'), CompoundRule('n*mp')])
+        >>> state = automaton.step(automaton.start, frozenset({'n', '1'}))   # "1"
+        >>> state = automaton.step(state, frozenset({'n', '1'}))             # "11"
+        >>> bool(state), automaton.is_final(state)      # might be a beginning of compound, but not complete
+        (True, False)
+        >>> automaton.is_final(automaton.step(state, frozenset({'t', 'c'})))  # "111th"
+        True
+        >>> automaton.step(state, frozenset({'p'}))                          # "111st": can't be compounded
+        frozenset()
+
+    The state of the automaton is a frozenset of ``(rule number, number of the next part to match)``
+    pairs; the empty set means there is no way for the compound to match. States and transitions are
+    calculated when they are first needed, and cached (so there is no cost for the combinations of
+    flags not present in the dictionary).
+
+    Args:
+        rules: Rules to compile
+    """
+
+    def __init__(self, rules: List[CompoundRule]):
+        self.rules = rules
+        #: Initial state
+        self.start = self.closure((idx, 0) for idx in range(len(rules)))
+        self.transitions: Dict[Tuple[FrozenSet[Tuple[int, int]], FrozenSet[str]], FrozenSet[Tuple[int, int]]] = {}
+
+    def step(self, state: FrozenSet[Tuple[int, int]], flags: FrozenSet[str]) -> FrozenSet[Tuple[int, int]]:
+        """
+        Next state after the part with ``flags`` is added to the compound.
+        """
+
+        key = (state, flags)
+        result = self.transitions.get(key)
+        if result is None:
+            positions = []
+            for idx, num in state:
+                parts = self.rules[idx].parts
+                if num < len(parts) and parts[num][0] in flags:
+                    # Part with * might match the next word, too
+                    positions.append((idx, num) if parts[num][1] == '*' else (idx, num + 1))
+            result = self.transitions[key] = self.closure(positions)
+        return result
+
+    def run(self, flag_sets: List[FrozenSet[str]]) -> FrozenSet[Tuple[int, int]]:
+        """
+        State after all the parts with ``flag_sets`` are added, starting from :attr:`start`.
+        """
+
+        state = self.start
+        for flags in flag_sets:
+            state = self.step(state, frozenset(flags))
+        return state
+
+    def is_final(self, state: FrozenSet[Tuple[int, int]]) -> bool:
+        """
+        Whether the compound in this state is complete (matches some of the rules entirely).
+        """
+        return any(num == len(self.rules[idx].parts) for idx, num in state)
+
+    def closure(self, positions: Iterable[Tuple[int, int]]) -> FrozenSet[Tuple[int, int]]:
+        # Parts with * and ? might be skipped, so the position before them means also all the positions
+        # after them
+        result: Set[Tuple[int, int]] = set()
+        stack = [*positions]
+        while stack:
+            position = stack.pop()
+            if position in result:
+                continue
+            result.add(position)
+            idx, num = position
+            parts = self.rules[idx].parts
+            if num < len(parts) and parts[num][1]:
+                stack.append((idx, num + 1))
+        return frozenset(result)
 
 
 @dataclass
@@ -441,6 +800,9 @@ class ConvTable:
     * ...chose the one with longest pattern
     * ...apply it, and shift to position after its applied (so there can't be recursive application
       of several rules on top of each other).
+
+    To do this fast, patterns are put into a trie, so the longest one is found in one pass from the
+    position, and positions where no pattern starts are skipped right away.
     """
 
     pairs: List[Tuple[str, str]]
@@ -459,7 +821,67 @@ class ConvTable:
         # TODO: don't need key=?.. (default behavior)
         self.table = sorted([compile_row(*row) for row in self.pairs], key=itemgetter(0))
 
+        # Patterns are compiled into a trie, so all the patterns matching at some position are found in
+        # one pass through the word from it. Each node is a pair (children by char, rows ending here),
+        # rows are (anchored at start, anchored at end, replacement) in the table order.
+        #
+        # Patterns are used as regexps, so if some of them contain chars special for regexps (or are
+        # empty), the table is applied with regexps, as is, to behave exactly the same.
+        self.trie: Optional[Tuple[dict, list]] = None
+        self.first_chars = frozenset(search[:1] for search, _, _ in self.table)
+
+        if all(search and not _REGEXP_SPECIAL.intersection(search) for search, _, _ in self.table):
+            self.trie = ({}, [])
+            # (Same order as in the table)
+            for pat1, pat2 in sorted(self.pairs, key=lambda row: row[0].replace('_', '')):
+                node = self.trie
+                for char in pat1.replace('_', ''):
+                    node = node[0].setdefault(char, ({}, []))
+                node[1].append((pat1.startswith('_'), pat1.endswith('_'), pat2.replace('_', ' ')))
+
     def __call__(self, word):
+        if self.trie is None:
+            return self._apply_regexps(word)
+
+        # Most of the words don't have anything to convert
+        first_chars = self.first_chars
+        if first_chars.isdisjoint(word):
+            return word
+
+        size = len(word)
+        pos = 0
+        res = []
+        while pos < size:
+            # Longest pattern found starting from pos: (its end, replacement)
+            found = None
+            if word[pos] in first_chars:
+                node = self.trie
+                end = pos
+                while end < size:
+                    node = node[0].get(word[end])
+                    if node is None:
+                        break
+                    end += 1
+                    for at_start, at_end, replacement in node[1]:
+                        # Same as regexp's ^ and $ (the latter also matches before the trailing newline)
+                        if at_start and pos != 0:
+                            continue
+                        if at_end and end != size and (end != size - 1 or word[-1] != '\n'):
+                            continue
+                        found = (end, replacement)
+                        break
+
+            if found:
+                pos, replacement = found
+                res.append(replacement)
+            else:
+                res.append(word[pos])
+                pos += 1
+
+        return ''.join(res)
+
+    def _apply_regexps(self, word):
+        # Straightforward application of the table, used if the patterns can't be put into the trie
         pos = 0
         res = ''
         while pos < len(word):
@@ -669,17 +1091,21 @@ class Aff:
           one of Turkic languages (Turkish, Azerbaijani, Crimean Tatar),
         * regular ``Casing`` otherwise.
 
-    .. py:attribute:: suffixes_index
-        :type: spylls.hunspell.algo.trie.Trie
+    .. py:attribute:: compound_rules
+        :type: CompoundRuleAutomaton
 
-        `Trie <https://en.wikipedia.org/wiki/Trie>`_ structure for fast selecting of all possible suffixes
-        for some word, created from :attr:`SFX`
+        All :attr:`COMPOUNDRULE` compiled into one automaton
 
-    .. py:attribute:: prefixes_index
-        :type: spylls.hunspell.algo.trie.Trie
+    `Trie <https://en.wikipedia.org/wiki/Trie>`_ structures for fast selecting of all possible suffixes
+    and prefixes for some word are built from :attr:`SFX` and :attr:`PFX` by
+    :meth:`Lookup.affix_indexes <spylls.hunspell.algo.lookup.Lookup.affix_indexes>`, without affixes
+    that are not used by the dictionary:
 
-        `Trie <https://en.wikipedia.org/wiki/Trie>`_ structure for fast selecting all possible prefixes
-        for some word, created from :attr:`PFX`
+    .. automethod:: affix_indexes
+
+    Flags for which :class:`Dic <spylls.hunspell.data.dic.Dic>` builds sets of stems having them:
+
+    .. automethod:: indexed_flags
     """
 
     #: .aff and .dic encoding.
@@ -721,7 +1147,7 @@ class Aff:
     #: Sets characters to ignore dictionary words, affixes and input words. Useful for optional characters,
     #: as Arabic (harakat) or Hebrew (niqqud) diacritical marks.
     #:
-    #: *Usage*: in :meth:`Lookup.__call__ <spylls.hunspell.algo.lookup.Lookup.__call__>` for preparing
+    #: *Usage*: in :meth:`Lookup.check <spylls.hunspell.algo.lookup.Lookup.check>` for preparing
     #: input word, and in :meth:`reader_aff <spylls.hunspell.readers.aff.read_aff>`, and
     #: in :meth:`reader_dic <spylls.hunspell.readers.dic.read_dic>`.
     IGNORE: Optional[Ignore] = None
@@ -896,7 +1322,7 @@ class Aff:
     #: * in :meth:`Suggest.ngram_suggestions <spylls.hunspell.algo.suggest.Suggest.ngram_suggestions>`
     #:   to pass to :mod:`ngram_suggest <spylls.hunspell.algo.ngram_suggest>`
     #:   (and there to construct all possible forms).
-    #: * also parsed into :attr:`prefixes_index` Trie, which then used in
+    #: * also parsed into Trie by :meth:`affix_indexes`, which then used in
     #:   :meth:`Lookup.deprefix <spylls.hunspell.algo.lookup.Lookup.deprefix>`
     PFX: Dict[str, List[Prefix]] = field(default_factory=dict)
 
@@ -908,7 +1334,7 @@ class Aff:
     #: * in :meth:`Suggest.ngram_suggestions <spylls.hunspell.algo.suggest.Suggest.ngram_suggestions>`
     #:   to pass to :mod:`ngram_suggest <spylls.hunspell.algo.ngram_suggest>`
     #:   (and there to construct all possible forms).
-    #: * also parsed into :attr:`suffixes_index` Trie, which then used in
+    #: * also parsed into Trie by :meth:`affix_indexes`, which then used in
     #:   :meth:`Lookup.desuffix <spylls.hunspell.algo.lookup.Lookup.desuffix>`
     SFX: Dict[str, List[Suffix]] = field(default_factory=dict)
 
@@ -1101,7 +1527,7 @@ class Aff:
     #: Input conversion table (what to do with word before checking if it is valid). See :class:`ConvTable`
     #: for format description.
     #:
-    #: *Usage:* :meth:`Lookup.__call__ <spylls.hunspell.algo.lookup.Lookup.__call__>`
+    #: *Usage:* :meth:`Lookup.check <spylls.hunspell.algo.lookup.Lookup.check>`
     ICONV: Optional[ConvTable] = None
 
     #: Output conversion table (what to do with suggestion before returning it to the user). See :class:`ConvTable`
@@ -1154,17 +1580,7 @@ class Aff:
     SUBSTANDARD: Optional[str] = None
 
     def __post_init__(self):
-        suffixes = defaultdict(list)
-        for suf in itertools.chain.from_iterable(self.SFX.values()):
-            suffixes[suf.add[::-1]].append(suf)
-
-        self.suffixes_index = Trie(suffixes)
-
-        prefixes = defaultdict(list)
-        for pref in itertools.chain.from_iterable(self.PFX.values()):
-            prefixes[pref.add].append(pref)
-
-        self.prefixes_index = Trie(prefixes)
+        self.compound_rules = CompoundRuleAutomaton(self.COMPOUNDRULE)
 
         if self.CHECKSHARPS:
             self.casing = GermanCasing()
@@ -1172,3 +1588,146 @@ class Aff:
             self.casing = TurkicCasing()
         else:
             self.casing = Casing()
+
+    def affix_indexes(self, stem_flags: Optional[Set[str]] = None,
+                      forbidden_stems: Collection[str] = ()) -> Tuple[Trie, Trie]:
+        """
+        Builds tries of suffixes (by reversed ``add``) and prefixes (by ``add``), which are used on
+        lookup to find affixes that might be present in the word.
+
+        If ``stem_flags`` (all flags present on the stems of the dictionary) are passed, affixes that
+        can't be part of any correct word form are left out of the indexes (see
+        :meth:`Lookup.affix_indexes <spylls.hunspell.algo.lookup.Lookup.affix_indexes>`). Affix is
+        needed if its flag is:
+
+        * on some stem,
+        * or in the flags of some needed affix (so this affix can be combined with that one: for
+          example, the suffix having flags of other suffixes, which can be attached after it),
+        * or in the flags of some affix which can be allowed by other affixes in circle (prefix
+          having flag of the suffix, and the suffix having the flag of the prefix: such form is
+          correct even if the stem has none of them).
+
+        Lookup also stops analyzing the word if some of its forms (even incorrect ones) has the stem
+        marked with :attr:`FORBIDDENWORD`, so if ``forbidden_stems`` are passed, affixes that might
+        produce them are left in the indexes, too.
+
+        Args:
+            stem_flags: Flags present on the stems (``None`` to include all affixes)
+            forbidden_stems: Stems marked with ``FORBIDDENWORD``
+        """
+
+        suffixes: List[Suffix] = [*itertools.chain.from_iterable(self.SFX.values())]
+        prefixes: List[Prefix] = [*itertools.chain.from_iterable(self.PFX.values())]
+
+        if stem_flags is not None:
+            # flag => all flags affixes with this flag have
+            allows: Dict[str, Set[str]] = defaultdict(set)
+            for affix in [*suffixes, *prefixes]:
+                allows[affix.flag].update(affix.flags)
+
+            needed_affixes = _forbidden_affixes(suffixes, prefixes, forbidden_stems) if forbidden_stems else set()
+
+            needed = {*stem_flags, *_cyclic(allows)}
+            for affix in [*suffixes, *prefixes]:
+                if id(affix) in needed_affixes:
+                    needed.update(affix.flags)
+
+            queue = [*needed]
+            while queue:
+                for flag in allows.get(queue.pop(), ()):
+                    if flag not in needed:
+                        needed.add(flag)
+                        queue.append(flag)
+
+            suffixes = [suffix for suffix in suffixes if suffix.flag in needed or id(suffix) in needed_affixes]
+            prefixes = [prefix for prefix in prefixes if prefix.flag in needed or id(prefix) in needed_affixes]
+
+        suffixes_by_add = defaultdict(list)
+        for suf in suffixes:
+            suffixes_by_add[suf.add[::-1]].append(suf)
+
+        prefixes_by_add = defaultdict(list)
+        for pref in prefixes:
+            prefixes_by_add[pref.add].append(pref)
+
+        return (Trie(suffixes_by_add), Trie(prefixes_by_add))
+
+    def indexed_flags(self) -> Set[str]:
+        """
+        Flags that lookup and suggest check on lots of stems (see
+        :meth:`Dic.has_flag <spylls.hunspell.data.dic.Dic.has_flag>`): "is the stem forbidden", "should
+        it keep its case" etc. Sets of stems having them are built when the dictionary is read (see
+        :meth:`Dic.index_flags <spylls.hunspell.data.dic.Dic.index_flags>`).
+        """
+
+        flags = [self.FORBIDDENWORD, self.KEEPCASE, self.FORCEUCASE, self.COMPOUNDFORBIDFLAG]
+        return {flag for flag in flags if flag}
+
+
+def _forbidden_affixes(suffixes: List[Suffix], prefixes: List[Prefix], stems: Collection[str]) -> Set[int]:
+    # Ids of affixes that might produce some of the stems on lookup: the affix produces the stem from
+    # the word if its ``strip`` is at the stem's end (or start), and its condition accepts the word
+    # with ``add`` instead (checked with stem_of, the same way lookup does). Only affixes with the
+    # stem's endings/beginnings as ``strip`` are tried, so it is cheap even for lots of affixes.
+    suffixes_by_strip: Dict[str, List[Suffix]] = defaultdict(list)
+    for suffix in suffixes:
+        suffixes_by_strip[suffix.strip].append(suffix)
+    prefixes_by_strip: Dict[str, List[Prefix]] = defaultdict(list)
+    for prefix in prefixes:
+        prefixes_by_strip[prefix.strip].append(prefix)
+
+    def desuffixed(stem):
+        # (suffix, word) pairs, where lookup would produce the stem by removing the suffix from the word
+        for pos in range(len(stem) + 1):
+            for suffix in suffixes_by_strip.get(stem[pos:], ()):
+                word = stem[:pos] + suffix.add
+                if suffix.stem_of(word) == stem:
+                    yield suffix, word
+
+    def prefixes_of(stem, crossproduct=False):
+        for pos in range(len(stem) + 1):
+            for prefix in prefixes_by_strip.get(stem[:pos], ()):
+                if (not crossproduct or prefix.crossproduct) and prefix.stem_of(prefix.add + stem[pos:]) == stem:
+                    yield prefix
+
+    result = set()
+    # Words which lookup deprefixes and then desuffixes (with cross-product suffixes, up to two of
+    # them) to get the stem: a cross-product prefix might be removed from any of them
+    crossproduct_words = set()
+    for stem in stems:
+        result.update(id(prefix) for prefix in prefixes_of(stem))
+        for suffix, word in desuffixed(stem):
+            result.add(id(suffix))
+            if suffix.crossproduct:
+                crossproduct_words.add(word)
+                # The outer suffix is removed first; the inner one should have its flag
+                crossproduct_words.update(
+                    word2 for suffix2, word2 in desuffixed(word)
+                    if suffix2.crossproduct and suffix2.flag in suffix.flags
+                )
+
+    for word in crossproduct_words:
+        result.update(id(prefix) for prefix in prefixes_of(word, crossproduct=True))
+
+    return result
+
+
+def _cyclic(graph: Dict[str, Set[str]]) -> Set[str]:
+    # Nodes of the graph which are on cycles, or reachable from them: everything that is left after
+    # repeatedly removing nodes without incoming edges
+    incoming: Dict[str, int] = defaultdict(int)
+    for targets in graph.values():
+        for target in targets:
+            incoming[target] += 1
+
+    left = {*graph, *incoming}
+    queue = [node for node in left if not incoming[node]]
+    while queue:
+        node = queue.pop()
+        left.discard(node)
+        for target in graph.get(node, ()):
+            incoming[target] -= 1
+            if not incoming[target]:
+                queue.append(target)
+
+    return left
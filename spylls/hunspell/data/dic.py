@@ -31,11 +31,16 @@ list, and also provides some indexes and utilities for convenience.
 --------------------------
 
 .. autoclass:: Word
+
+.. autodata:: NO_DATA
+.. autodata:: NO_ALT_SPELLINGS
 """
 
+import itertools
+from types import MappingProxyType
 from collections import defaultdict
 from dataclasses import dataclass
-from typing import List, Set, Dict
+from typing import List, Set, Dict, Tuple, Optional, FrozenSet, Mapping, Sequence, Iterable
 
 from spylls.hunspell.algo.capitalization import Type as CapType
 
@@ -99,20 +104,26 @@ class Word:
     .. autoattribute:: captype
     """
 
+    # There are hundreds of thousands of words in big dictionaries, so they don't have per-instance
+    # __dict__, and words without data tags/alt. spellings (the vast majority) share the same
+    # empty values: NO_DATA and NO_ALT_SPELLINGS.
+    __slots__ = ('stem', 'flags', 'data', 'alt_spellings', 'captype')
+
     #: Word stem
     stem: str
     #: Flags of the word, parsed depending on aff-file settings. ``ABCD`` might be parsed
     #: into ``{"A", "B", "C", "D"}`` (default flag format, "short"), or ``{"AB", "CD"}``
-    #: ("long" flag format)
-    flags: Set[str]
+    #: ("long" flag format). Frozen, because the same set is shared between all words having
+    #: the same flags.
+    flags: FrozenSet[str]
     #: Raw values of data tags. Each tag can be repeated several times, like ``witch ph:wich ph:which``,
-    #: that's why dictionary values are lists
-    data: Dict[str, List[str]]
+    #: that's why dictionary values are lists. Read-only :data:`NO_DATA` for words without tags.
+    data: Mapping[str, List[str]]
 
     #: List of alternative word spellings, defined with ``ph:`` data tag, and
     #: used by :mod:`ngram_suggest <spylls.hunspell.algo.ngram_suggest>`. Not everything specified
     #: with ``ph:`` is stored here, see explanations in class docs.
-    alt_spellings: List[str]
+    alt_spellings: Sequence[str]
     #: One of :class:`capitalization.Type <spylls.hunspell.algo.capitalization.Type>` (no capitalization,
     #: initial letter capitalized, all letters, or mixed) analyzed on dictionary reading, will be useful on lookup.
     captype: CapType
@@ -120,6 +131,17 @@ class Word:
     def __repr__(self):
         return f"Word({self.stem} /{','.join(self.flags)})"
 
+    def __reduce__(self):
+        # Default pickling would fail on NO_DATA (mappingproxy can't be pickled)
+        data = self.data if self.data else {}
+        return (self.__class__, (self.stem, self.flags, data, self.alt_spellings, self.captype))
+
+
+#: Shared value of :attr:`Word.data` for words without data tags
+NO_DATA: Mapping[str, List[str]] = MappingProxyType({})
+#: Shared value of :attr:`Word.alt_spellings` for words without alternative spellings
+NO_ALT_SPELLINGS: Sequence[str] = ()
+
 
 @dataclass
 class Dic:
@@ -155,19 +177,28 @@ class Dic:
 
         All .dic file entries for some stem.
 
-    .. py:attribute:: lowercase_index
-        :type: Dict[str, List[Word]]
+    .. autoattribute:: lowercase_index
 
-        All .dic file entries for lowercase version of some stem.
+    .. py:attribute:: version
+        :type: int
+
+        Incremented on each :meth:`append`, so that caches depending on the dictionary contents (see
+        :attr:`Lookup.cache <spylls.hunspell.algo.lookup.Lookup.cache>`) can notice the change.
 
     **Querying** (used by lookup and suggest):
 
     .. automethod:: homonyms
     .. automethod:: has_flag
+    .. automethod:: used_flags
+    .. automethod:: stems_with_flag
+    .. automethod:: stems_with_any_flag
+    .. automethod:: words_without_flags
+    .. automethod:: has_multiword_stems
 
     **Dictionary creation**
 
     .. automethod:: append
+    .. automethod:: index_flags
     """
 
     #: List of all words from ``*.dic`` file
@@ -175,7 +206,27 @@ class Dic:
 
     def __post_init__(self):
         self.index = defaultdict(list)
-        self.lowercase_index = defaultdict(list)
+        self.version = 0
+        # Words with their lowercase forms, to build lowercase_index from on first access
+        self._lowercase_pending: List[Tuple[Word, Sequence[str]]] = []
+        self._lowercase_index: Optional[Dict[str, List[Word]]] = None
+        # flag => (stems where any homonym has it, stems where all homonyms have it), see has_flag
+        self._flag_stems: Dict[str, Tuple[Set[str], Set[str]]] = {}
+
+    @property
+    def lowercase_index(self) -> Dict[str, List[Word]]:
+        """
+        All .dic file entries for lowercase version of some stem. Only entries that aren't lowercase
+        already are here (lowercase ones are found by :attr:`index`). It is needed only to check
+        ALL-CAPS words in the rare cases, so it is built on first access.
+        """
+        if self._lowercase_index is None:
+            self._lowercase_index = defaultdict(list)
+            for word, lower in self._lowercase_pending:
+                for lword in lower:
+                    self._lowercase_index[lword].append(word)
+            self._lowercase_pending = []
+        return self._lowercase_index
 
     def homonyms(self, stem: str, *, ignorecase: bool = False) -> List[Word]:
         """
@@ -198,12 +249,21 @@ class Dic:
         check something like "...but if there is ANY dictionary entry with this stem and 'forbidden'
         flag...", or "...but if ALL dictionary entries with this stem marked as 'forbidden'..."
 
+        It is asked for a few flags only (:meth:`Aff.indexed_flags <spylls.hunspell.data.aff.Aff.indexed_flags>`,
+        like ``FORBIDDENWORD`` or ``KEEPCASE``), but for lots of stems (for example, for each suggestion
+        candidate), so when the dictionary is read, sets of stems having those flags are built (see
+        :meth:`index_flags`), and each check is just a set lookup. For other flags, homonyms are checked.
+
         Args:
             stem: Stem present in dictionary
             flag: Flag to test
             for_all: If ``True``, checks if **all** homonyms have this flag, if ``False``, checks if
                      at least one.
         """
+        stems = self._flag_stems.get(flag)
+        if stems is not None:
+            return stem in stems[1 if for_all else 0]
+
         homonyms = self.homonyms(stem)
         if not homonyms:
             return False
@@ -211,7 +271,73 @@ class Dic:
             return all(flag in homonym.flags for homonym in homonyms)
         return any(flag in homonym.flags for homonym in homonyms)
 
-    def append(self, word: Word, *, lower: List[str]):
+    def index_flags(self, flags: Iterable[str]) -> None:
+        """
+        Builds sets of stems having each of the flags (for :meth:`has_flag`), which are then kept up to
+        date by :meth:`append`. Called by the dictionary readers (before any words are appended, so the
+        sets are filled as the words are read) with :meth:`Aff.indexed_flags
+        <spylls.hunspell.data.aff.Aff.indexed_flags>`.
+
+        Args:
+            flags: Flags to build sets for (already built ones are skipped)
+        """
+        for flag in flags:
+            if flag in self._flag_stems:
+                continue
+            any_stems = {word.stem for word in self.words if flag in word.flags}
+            all_stems = {stem for stem in any_stems if all(flag in homonym.flags for homonym in self.index[stem])}
+            self._flag_stems[flag] = (any_stems, all_stems)
+
+    def used_flags(self, start: int = 0) -> Set[str]:
+        """
+        All flags present on the words (used by lookup to skip affixes no word can have, see
+        :meth:`Lookup.affix_indexes <spylls.hunspell.algo.lookup.Lookup.affix_indexes>`).
+
+        Args:
+            start: Number of the first word to check (to only check words appended after the previous call)
+        """
+        return set().union(*{word.flags for word in itertools.islice(self.words, start, None)})
+
+    def stems_with_flag(self, flag: str, start: int = 0) -> List[str]:
+        """
+        Stems of all the words having the flag.
+
+        Args:
+            flag: Flag to test
+            start: Number of the first word to check
+        """
+        return self.stems_with_any_flag({flag}, start)
+
+    def stems_with_any_flag(self, flags: Set[str], start: int = 0) -> List[str]:
+        """
+        Stems of all the words having at least one of the flags.
+
+        Args:
+            flags: Flags to test
+            start: Number of the first word to check
+        """
+        return [word.stem for word in itertools.islice(self.words, start, None) if not flags.isdisjoint(word.flags)]
+
+    def words_without_flags(self, flags: Set[str]) -> Sequence[Word]:
+        """
+        All the words having none of the flags (used by suggest to choose words for ngram and
+        phonetical suggestions).
+
+        Args:
+            flags: Flags to test
+        """
+        return [word for word in self.words if flags.isdisjoint(word.flags)]
+
+    def has_multiword_stems(self, start: int = 0) -> bool:
+        """
+        Whether some of the stems consist of several words (contain space), like "a cappella".
+
+        Args:
+            start: Number of the first word to check
+        """
+        return any(' ' in word.stem for word in itertools.islice(self.words, start, None))
+
+    def append(self, word: Word, *, lower: Sequence[str] = ()):
         """
         Used only by :meth:`read_dic <spylls.hunspell.readers.dic.read_dic>` to put the word into the
         dictionary.
@@ -222,11 +348,25 @@ class Dic:
                    reading, because proper lowercasing requires casing context; and may produce several
                    lowercased variants (for German). See
                    :meth:`Casing.lower <spylls.hunspell.algo.capitalization.Casing.lower>` for details.
+                   Not needed (and ignored) if the stem is lowercase already.
         """
         self.words.append(word)
-        self.index[word.stem].append(word)
-        for lword in lower:
-            self.lowercase_index[lword].append(word)
+        homonyms = self.index[word.stem]
+        homonyms.append(word)
+        self.version += 1
+        for flag, (any_stems, all_stems) in self._flag_stems.items():
+            if flag in word.flags:
+                any_stems.add(word.stem)
+                if len(homonyms) == 1:
+                    all_stems.add(word.stem)
+            else:
+                all_stems.discard(word.stem)
+        if lower and word.captype != CapType.NO:
+            if self._lowercase_index is None:
+                self._lowercase_pending.append((word, lower))
+            else:
+                for lword in lower:
+                    self._lowercase_index[lword].append(word)
 
     def __repr__(self):
         return f'Dictionary(... {len(self.words)} words ...)'
@@ -0,0 +1,451 @@
+"""
+Alternative storage for the contents of ``*.dic`` file: instead of keeping Python objects for
+every :class:`Word <spylls.hunspell.data.dic.Word>` and dictionaries of them as indexes,
+:class:`MappedDic` keeps stems, flags and indexes in one read-only binary file, `memory-mapped
+<https://docs.python.org/3/library/mmap.html>`_ into the process.
+
+The main use case is multi-process services (gunicorn, multiprocessing pools): with regular
+:class:`Dic <spylls.hunspell.data.dic.Dic>`, each worker has its own copy of all words (and even
+when workers are forked from the process that have already loaded the dictionary, Python's reference
+counting writes to each object's memory on every access, so copy-on-write pages are copied anyway).
+Mapped file pages are shared between all processes by OS, so N workers use one physical copy.
+
+``MappedDic`` implements the same querying interface as ``Dic`` (:meth:`MappedDic.homonyms`,
+:meth:`MappedDic.has_flag`, :attr:`MappedDic.words` etc.), so lookup and suggest work with it transparently,
+but reads everything straight from the mapped buffer, producing ``Word`` objects only when they are
+requested. It is read-only: there is no ``append``.
+
+Looking up a stem in the mapped index is several times slower than in Python's ``dict`` (the stem
+should be encoded, hashed, and compared with bytes in the buffer), and most of the stems lookup asks
+for (produced by cutting off possible affixes) don't exist. So before the index, the stem is checked
+against the :class:`BloomFilter <spylls.hunspell.algo.bloom.BloomFilter>` of all the stems, built in
+memory on first use: it takes ~10 bits per stem for 1% false positives (see ``bloom_fp_rate``),
+a small fraction of the index size.
+
+``MappedDic`` is written as a part of compiled dictionary (see
+:meth:`Dictionary.compile <spylls.hunspell.dictionary.Dictionary.compile>` with ``mapped=True``).
+
+File layout
+-----------
+
+All numbers are unsigned 32-bit integers in native byte order (the file is a local cache, not an
+exchange format), sections are aligned by 8 bytes:
+
+* header (see ``HEADER``): counts and offsets of all the sections;
+* ``strings``: all distinct stems (and their lowercase forms), UTF-8, one after another;
+* ``words``: for each word, 4 numbers: offset and length of stem in ``strings``, number of its
+  flag set, and number of its "extras" (data tags and alt. spellings; 0 if there are none);
+* ``captypes``: one byte per word, value of its
+  :class:`capitalization.Type <spylls.hunspell.algo.capitalization.Type>`;
+* index and lowercase index, each consisting of:
+
+  * ``keys``: for each distinct stem, offset and length of it in ``strings``, and the start and length
+    of its list of words in ``postings``;
+  * ``table``: open-addressing hash table (CRC32 of the stem's UTF-8) of key numbers (+1, 0 is empty slot)
+  * ``postings``: numbers of words;
+* ``flags``: pickled list of distinct flag sets (there are only a few thousands of them even in
+  the biggest dictionaries, so they are unpickled on opening)
+* ``extras``: pickled list of ``(data, alt_spellings)`` pairs, unpickled on first access.
+
+.. autoclass:: MappedDic
+    :members:
+
+.. autofunction:: write_mapped
+"""
+
+import sys
+import mmap
+import zlib
+import pickle
+import struct
+from array import array
+from collections import defaultdict
+from typing import List, Set, Dict, BinaryIO, Iterable, Iterator, Sequence, Tuple, FrozenSet, Optional
+
+from spylls.hunspell.data.dic import Dic, Word, NO_DATA, NO_ALT_SPELLINGS
+from spylls.hunspell.algo.capitalization import Type as CapType
+from spylls.hunspell.algo.bloom import BloomFilter
+
+MAGIC = b'SPYLLDIC'
+
+# magic, byte order, number of words, then offset/size pairs of all the sections
+HEADER = struct.Struct('<8s8sI' + 'QQ' * 11)
+
+SECTIONS = ['strings', 'words', 'captypes',
+            'keys', 'table', 'postings',
+            'lower_keys', 'lower_table', 'lower_postings',
+            'flags', 'extras']
+
+ALIGN = 8
+
+
+class MappedDic:
+    """
+    Read-only memory-mapped ``*.dic`` contents. Has the same querying interface as
+    :class:`Dic <spylls.hunspell.data.dic.Dic>`.
+
+    Args:
+        path: Path to the file
+        offset: Position in the file where the mapped dictionary data starts (for it to be part
+                of the bigger file, like the compiled dictionary)
+        bloom_fp_rate: False positives rate of the stems filter checked before the index (see
+                       :meth:`may_contain`); ``None`` to check the index directly
+    """
+
+    def __init__(self, path: str, offset: int = 0, *, bloom_fp_rate: Optional[float] = 0.01):
+        with open(path, 'rb') as file:
+            self.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        buffer = memoryview(self.mmap)[offset:]
+
+        magic, byteorder, self.size, *positions = HEADER.unpack_from(buffer)
+        if magic != MAGIC:
+            raise ValueError(f'{path}: no mapped dictionary at {offset}')
+        if byteorder.rstrip(b'\x00').decode() != sys.byteorder:
+            raise ValueError(f'{path}: mapped dictionary is written with {byteorder} byte order')
+
+        sections = {
+            name: buffer[start:start+size]
+            for name, start, size in zip(SECTIONS, positions[::2], positions[1::2])
+        }
+
+        self.strings = sections['strings']
+        # Where strings are in the mmap itself, to search them without copying (see has_multiword_stems)
+        strings_start = offset + positions[2 * SECTIONS.index('strings')]
+        self.strings_span = (strings_start, strings_start + len(self.strings))
+        self.word_table = sections['words'].cast('I')
+        self.captype_table = sections['captypes']
+        self.index = _Index(self.strings, sections['keys'], sections['table'], sections['postings'])
+        self.lowercase_index = _Index(self.strings, sections['lower_keys'], sections['lower_table'],
+                                      sections['lower_postings'])
+
+        self.flag_sets: List[FrozenSet[str]] = pickle.loads(sections['flags'])
+        self.extras_data = sections['extras']
+        self.extras_table = None
+
+        self.captypes = {captype.value: captype for captype in CapType}
+
+        # Same as Dic.version, but the mapped dictionary never changes
+        self.version = 0
+
+        # flag => (stems where any homonym has it, stems where all homonyms have it), see has_flag
+        self._flag_stems: Dict[str, Tuple[Set[str], Set[str]]] = {}
+
+        self.bloom_fp_rate = bloom_fp_rate
+        self.bloom: Optional[BloomFilter] = None
+
+    @property
+    def words(self) -> Sequence[Word]:
+        """
+        All the words of the dictionary, as lazy sequence (supporting ``len()``, ``[]`` and iteration).
+        Each ``Word`` is constructed when it is requested.
+        """
+        return _Words(self)
+
+    def homonyms(self, stem: str, *, ignorecase: bool = False) -> List[Word]:
+        """
+        Same as :meth:`Dic.homonyms <spylls.hunspell.data.dic.Dic.homonyms>`
+        """
+        if ignorecase:
+            return [self.word(idx) for idx in self.lowercase_index.get(stem)]
+        if not self.may_contain(stem):
+            return []
+        return [self.word(idx) for idx in self.index.get(stem)]
+
+    def may_contain(self, stem: str) -> bool:
+        """
+        Quick check if there are any entries with this stem, by the Bloom filter: ``False`` is always
+        right, ``True`` might be not (with probability ``bloom_fp_rate``). Used by :meth:`homonyms` before
+        the index. The filter is built on the first call, if :meth:`build_filter` wasn't called before.
+
+        (There is no such method in :class:`Dic <spylls.hunspell.data.dic.Dic>`: its index is Python's
+        ``dict``, which answers the absent stem as fast as the filter would.)
+        """
+        if self.bloom_fp_rate is None:
+            return True
+        if self.bloom is None:
+            self.build_filter()
+        return self.bloom.may_contain(stem)  # type: ignore
+
+    def build_filter(self) -> None:
+        """
+        Builds the Bloom filter used by :meth:`may_contain` (if it isn't built yet, and isn't disabled
+        by ``bloom_fp_rate=None``). Called by :meth:`Dictionary.warmup <spylls.hunspell.dictionary.Dictionary.warmup>`.
+        """
+        if self.bloom_fp_rate is None or self.bloom is not None:
+            return
+        self.bloom = BloomFilter(self.index.stems(), size=len(self.index), fp_rate=self.bloom_fp_rate)
+
+    def has_flag(self, stem: str, flag: str, *, for_all: bool = False) -> bool:
+        """
+        Same as :meth:`Dic.has_flag <spylls.hunspell.data.dic.Dic.has_flag>`
+        """
+        stems = self._flag_stems.get(flag)
+        if stems is not None:
+            return stem in stems[1 if for_all else 0]
+
+        homonyms = self.homonyms(stem)
+        if not homonyms:
+            return False
+        if for_all:
+            return all(flag in homonym.flags for homonym in homonyms)
+        return any(flag in homonym.flags for homonym in homonyms)
+
+    def index_flags(self, flags: Iterable[str]) -> None:
+        """
+        Same as :meth:`Dic.index_flags <spylls.hunspell.data.dic.Dic.index_flags>` (the sets of stems
+        with the flag are built without constructing ``Word`` objects). Called by
+        :meth:`read_compiled <spylls.hunspell.readers.compiled.read_compiled>`.
+        """
+        # flag => numbers of flag sets containing it
+        flag_ids = {
+            flag: {idx for idx, word_flags in enumerate(self.flag_sets) if flag in word_flags}
+            for flag in flags
+            if flag not in self._flag_stems
+        }
+        stems: Dict[str, Set[str]] = {flag: set() for flag in flag_ids}
+
+        # One pass through the words for all the flags (and none if no words have them)
+        table = self.word_table
+        wanted = set().union(*flag_ids.values())
+        if wanted:
+            for idx, word_flags in enumerate(table[2::4]):
+                if word_flags in wanted:
+                    stem = str(self.strings[table[idx * 4]:table[idx * 4] + table[idx * 4 + 1]],
+                               'utf-8', 'surrogatepass')
+                    for flag, ids in flag_ids.items():
+                        if word_flags in ids:
+                            stems[flag].add(stem)
+
+        for flag, any_stems in stems.items():
+            ids = flag_ids[flag]
+            all_stems = {
+                stem for stem in any_stems
+                if all(table[idx * 4 + 2] in ids for idx in self.index.get(stem))
+            }
+            self._flag_stems[flag] = (any_stems, all_stems)
+
+    def used_flags(self, start: int = 0) -> Set[str]:
+        """
+        Same as :meth:`Dic.used_flags <spylls.hunspell.data.dic.Dic.used_flags>`
+        """
+        flag_ids = set(self.word_table[start * 4 + 2::4])
+        return set().union(*(self.flag_sets[flags] for flags in flag_ids))
+
+    def stems_with_flag(self, flag: str, start: int = 0) -> List[str]:
+        """
+        Same as :meth:`Dic.stems_with_flag <spylls.hunspell.data.dic.Dic.stems_with_flag>`
+        """
+        return self.stems_with_any_flag({flag}, start)
+
+    def stems_with_any_flag(self, flags: Set[str], start: int = 0) -> List[str]:
+        """
+        Same as :meth:`Dic.stems_with_any_flag <spylls.hunspell.data.dic.Dic.stems_with_any_flag>`
+        """
+        flag_ids = {idx for idx, word_flags in enumerate(self.flag_sets) if not flags.isdisjoint(word_flags)}
+        if not flag_ids:
+            return []
+        table = self.word_table
+        return [
+            str(self.strings[table[idx]:table[idx] + table[idx + 1]], 'utf-8', 'surrogatepass')
+            for idx in range(start * 4, len(table), 4)
+            if table[idx + 2] in flag_ids
+        ]
+
+    def words_without_flags(self, flags: Set[str]) -> Sequence[Word]:
+        """
+        Same as :meth:`Dic.words_without_flags <spylls.hunspell.data.dic.Dic.words_without_flags>`, but
+        returns a lazy sequence, like :attr:`words`: only the numbers of the words are kept (chosen by
+        their flag sets, without constructing ``Word`` objects), and each ``Word`` is constructed when
+        the sequence is iterated. Otherwise, keeping all of them would take the memory of each process
+        using the mapped dictionary, which it is meant to share.
+        """
+        flag_ids = {idx for idx, word_flags in enumerate(self.flag_sets) if flags.isdisjoint(word_flags)}
+        if len(flag_ids) == len(self.flag_sets):
+            return _Words(self)
+        return _Words(self, array('I', (idx for idx, word_flags in enumerate(self.word_table[2::4])
+                                        if word_flags in flag_ids)))
+
+    def has_multiword_stems(self, start: int = 0) -> bool:
+        """
+        Same as :meth:`Dic.has_multiword_stems <spylls.hunspell.data.dic.Dic.has_multiword_stems>`
+        """
+        # The mapped dictionary never changes, so it is only called with start=0, and all the stems
+        # (and their lowercase forms, which contain space if the stems do) can be checked at once
+        if start >= len(self.word_table) // 4:
+            return False
+        return self.mmap.find(b' ', *self.strings_span) != -1
+
+    def word(self, idx: int) -> Word:
+        """
+        Construct ``Word`` by its number.
+        """
+        stem_start, stem_size, flags, extras = self.word_table[idx * 4:idx * 4 + 4]
+
+        if extras:
+            if self.extras_table is None:
+                self.extras_table = pickle.loads(self.extras_data)
+            data, alt_spellings = self.extras_table[extras - 1]
+            data = defaultdict(list, data)
+        else:
+            data, alt_spellings = NO_DATA, NO_ALT_SPELLINGS
+
+        return Word(
+            stem=str(self.strings[stem_start:stem_start+stem_size], 'utf-8', 'surrogatepass'),
+            flags=self.flag_sets[flags],
+            data=data,
+            alt_spellings=alt_spellings,
+            captype=self.captypes[self.captype_table[idx]]
+        )
+
+    def __repr__(self):
+        return f'MappedDic(... {self.size} words ...)'
+
+
+class _Words(Sequence):     # pylint: disable=too-few-public-methods
+    # Words of the dictionary by their numbers (all of them, or only some, see words_without_flags)
+    def __init__(self, dic: MappedDic, numbers: Optional[Sequence[int]] = None):
+        self.dic = dic
+        self.numbers = range(dic.size) if numbers is None else numbers
+
+    def __len__(self):
+        return len(self.numbers)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self.dic.word(i) for i in self.numbers[idx]]
+        if not -len(self.numbers) <= idx < len(self.numbers):
+            raise IndexError('word index out of range')
+        return self.dic.word(self.numbers[idx])
+
+    def __iter__(self) -> Iterator[Word]:
+        return map(self.dic.word, self.numbers)
+
+
+class _Index:       # pylint: disable=too-few-public-methods
+    def __init__(self, strings: memoryview, keys: memoryview, table: memoryview, postings: memoryview):
+        self.strings = strings
+        self.keys = keys.cast('I')
+        self.table = table.cast('I')
+        self.postings = postings.cast('I')
+        self.mask = len(self.table) - 1
+
+    def __len__(self):
+        return len(self.keys) // 4
+
+    def stems(self) -> Iterator[str]:
+        keys = self.keys
+        for start in range(0, len(keys), 4):
+            yield str(self.strings[keys[start]:keys[start] + keys[start + 1]], 'utf-8', 'surrogatepass')
+
+    def get(self, stem: str) -> Sequence[int]:
+        if not self.table:
+            return ()
+
+        encoded = stem.encode('utf-8', 'surrogatepass')
+        size = len(encoded)
+        keys = self.keys
+        strings = self.strings
+
+        pos = zlib.crc32(encoded) & self.mask
+        while True:
+            key = self.table[pos]
+            if not key:
+                return ()
+            start = (key - 1) * 4
+            if keys[start + 1] == size and strings[keys[start]:keys[start] + size] == encoded:
+                return self.postings[keys[start + 2]:keys[start + 2] + keys[start + 3]]
+            pos = (pos + 1) & self.mask
+
+
+def write_mapped(file: BinaryIO, dic: Dic) -> None:
+    """
+    Write the dictionary in the mapped format into the binary file, starting from the current
+    position of the file (which should be aligned by 8 bytes).
+
+    Args:
+        file: File opened for binary writing
+        dic: Dictionary to write
+    """
+
+    strings = bytearray()
+    string_offsets: Dict[str, int] = {}
+
+    def string(text: str) -> Tuple[int, int]:
+        encoded = text.encode('utf-8', 'surrogatepass')
+        if text not in string_offsets:
+            string_offsets[text] = len(strings)
+            strings.extend(encoded)
+        return (string_offsets[text], len(encoded))
+
+    flag_sets: Dict[FrozenSet[str], int] = {}
+    extras: List[Tuple[dict, List[str]]] = []
+    word_ids = {}
+    words = array('I')
+    captypes = bytearray()
+
+    for idx, word in enumerate(dic.words):
+        word_ids[id(word)] = idx
+        flags = frozenset(word.flags)
+        if word.data or word.alt_spellings:
+            extras.append((dict(word.data), word.alt_spellings))
+            extra_id = len(extras)
+        else:
+            extra_id = 0
+        words.extend([*string(word.stem), flag_sets.setdefault(flags, len(flag_sets)), extra_id])
+        captypes.append(word.captype.value)
+
+    def index(source):
+        keys = array('I')
+        postings = array('I')
+        hashes = []
+        for stem, homonyms in source.items():
+            if not homonyms:
+                continue
+            start, size = string(stem)
+            keys.extend([start, size, len(postings), len(homonyms)])
+            postings.extend(word_ids[id(homonym)] for homonym in homonyms)
+            hashes.append(zlib.crc32(stem.encode('utf-8', 'surrogatepass')))
+
+        # Table is at least twice as big as number of keys, and size is power of 2
+        table = array('I', [0]) * (1 << (len(hashes) * 2).bit_length()) if hashes else array('I')
+        mask = len(table) - 1
+        for key, hashed in enumerate(hashes):
+            pos = hashed & mask
+            while table[pos]:
+                pos = (pos + 1) & mask
+            table[pos] = key + 1
+
+        return (keys.tobytes(), table.tobytes(), postings.tobytes())
+
+    keys, table, postings = index(dic.index)
+    lower_keys, lower_table, lower_postings = index(dic.lowercase_index)
+
+    flags_list = [None] * len(flag_sets)
+    for flags, flags_id in flag_sets.items():
+        flags_list[flags_id] = flags
+
+    data = [
+        bytes(strings), words.tobytes(), bytes(captypes),
+        keys, table, postings,
+        lower_keys, lower_table, lower_postings,
+        pickle.dumps(flags_list, protocol=pickle.HIGHEST_PROTOCOL),
+        pickle.dumps(extras, protocol=pickle.HIGHEST_PROTOCOL),
+    ]
+
+    positions = []
+    pos = aligned(HEADER.size)
+    for chunk in data:
+        positions.extend([pos, len(chunk)])
+        pos = aligned(pos + len(chunk))
+
+    file.write(HEADER.pack(MAGIC, sys.byteorder.encode(), len(words) // 4, *positions))
+    written = HEADER.size
+    for chunk, start in zip(data, positions[::2]):
+        file.write(b'\x00' * (start - written))
+        file.write(chunk)
+        written = start + len(chunk)
+
+
+def aligned(pos: int) -> int:
+    return (pos + ALIGN - 1) // ALIGN * ALIGN
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+import os
 import glob
 import zipfile
+from collections import OrderedDict
 
-from typing import Iterator
+from typing import Iterator, Iterable, Optional, Tuple, Union
 
 from spylls.hunspell import data, readers
 from spylls.hunspell.readers.file_reader import FileReader, ZipReader
-from spylls.hunspell.algo import lookup, suggest
+from spylls.hunspell.readers.compiled import OutdatedError, MAGIC as COMPILED_MAGIC
+from spylls.hunspell.registry import Registry
+from spylls.hunspell.algo import lookup, suggest, tokenizer
+from spylls.hunspell.algo.cache import LRUCache
+from spylls.hunspell.algo.full_forms import FullForms
 
 
 class Dictionary:
@@ -24,6 +30,10 @@ class Dictionary:
         dictionary = Dictionary.from_zip('/path/to/dictionary/en_US.odt')
         # or, from system folders (on Linux)
         dictionary = Dictionary.from_system('en_US')
+        # or, from the compiled file (much faster for big dictionaries, see from_compiled)
+        dictionary = Dictionary.from_compiled('/path/to/cache/en_US.spylls')
+        # or, the instance shared by the whole process, loaded on first request (see get)
+        dictionary = Dictionary.get('en_US')
 
         print(dictionary.lookup('spylls'))
         # False
@@ -54,11 +64,24 @@ class Dictionary:
     .. automethod:: from_files
     .. automethod:: from_zip
     .. automethod:: from_system
+    .. automethod:: from_compiled
+    .. automethod:: compile
+    .. automethod:: load
+
+    **Shared dictionaries**
+
+    .. automethod:: get
+    .. autoattribute:: registry
 
     **Dictionary usage**
 
     .. automethod:: lookup
+    .. automethod:: lookup_many
+    .. automethod:: check_text
     .. automethod:: suggest
+    .. automethod:: warmup
+    .. automethod:: enable_lookup_cache
+    .. automethod:: enable_full_forms
 
     **Data objects**
 
@@ -78,8 +101,11 @@ class Dictionary:
 
     #: Instance of ``Lookup``, can be used for experimenting, see :mod:`algo.lookup <spylls.hunspell.algo.lookup>`.
     lookuper: lookup.Lookup
-    #: Instance of ``Suggest``, can be used for experimenting, see :mod:`algo.suggest <spylls.hunspell.algo.suggest>`.
-    suggester: suggest.Suggest
+
+    #: Process-wide :class:`Registry <spylls.hunspell.registry.Registry>` of dictionaries, used by
+    #: :meth:`get`. Its memory budget is unlimited by default, can be changed with
+    #: ``Dictionary.registry.memory_budget = <bytes>``.
+    registry: Registry
 
     # TODO: Firefox dictionaries path
     # TODO: Windows pathes
@@ -106,16 +132,22 @@ class Dictionary:
     ]
 
     @classmethod
-    def from_files(cls, path: str) -> Dictionary:
+    def from_files(cls, path: str, *, workers: Optional[int] = None) -> Dictionary:
         """
         Read dictionary from pair of files ``/some/path/some_name.aff`` and ``/some/path/some_name.dic``.
 
         Args:
             path: Should be just ``/some/path/some_name``.
+            workers: If passed (and more than 1), ``.dic`` file is parsed by this number of processes
+                     (see :meth:`read_dic_parallel <spylls.hunspell.readers.dic.read_dic_parallel>`).
+                     Makes sense for big dictionaries only, like ``workers=os.cpu_count()``.
         """
 
         aff, context = readers.read_aff(FileReader(path + '.aff'))
-        dic = readers.read_dic(FileReader(path + '.dic', encoding=context.encoding), aff=aff, context=context)
+        if workers and workers > 1:
+            dic = readers.read_dic_parallel(path + '.dic', aff=aff, context=context, workers=workers)
+        else:
+            dic = readers.read_dic(FileReader(path + '.dic', encoding=context.encoding), aff=aff, context=context)
 
         return cls(aff, dic)
 
@@ -131,12 +163,12 @@ class Dictionary:
             path: Path to zip-file/extension.
         """
 
-        file = zipfile.ZipFile(path)
-        # TODO: fail if there are several
-        aff_path = [name for name in file.namelist() if name.endswith('.aff')][0]
-        dic_path = [name for name in file.namelist() if name.endswith('.dic')][0]
-        aff, context = readers.read_aff(ZipReader(file.open(aff_path)))
-        dic = readers.read_dic(ZipReader(file.open(dic_path), encoding=context.encoding), aff=aff, context=context)
+        with zipfile.ZipFile(path) as file:
+            # TODO: fail if there are several
+            aff_path = [name for name in file.namelist() if name.endswith('.aff')][0]
+            dic_path = [name for name in file.namelist() if name.endswith('.dic')][0]
+            aff, context = readers.read_aff(ZipReader(file.open(aff_path)))
+            dic = readers.read_dic(ZipReader(file.open(dic_path), encoding=context.encoding), aff=aff, context=context)
 
         return cls(aff, dic)
 
@@ -157,12 +189,131 @@ class Dictionary:
 
         raise LookupError(f'{name}.aff not found (search pathes are {cls.PATHES!r})')
 
+    @classmethod
+    def compile(cls, source: str, path: str, *, mapped: bool = False) -> Dictionary:
+        """
+        Reads dictionary from ``source`` and saves it in the compiled form into ``path``, to be later
+        read with :meth:`from_compiled`. See :mod:`readers.compiled <spylls.hunspell.readers.compiled>`
+        for the details of the format.
+
+        ::
+
+            >>> Dictionary.compile('/path/to/dictionary/de_DE', '/path/to/cache/de_DE.spylls')
+
+        Args:
+            source: Either a path to zip-file/extension (like in :meth:`from_zip`), or the path to a pair
+                    of ``*.aff``/``*.dic`` files (like in :meth:`from_files`)
+            path: Where to write the compiled dictionary
+            mapped: Store the words in the memory-mapped format (see :mod:`data.mapped_dic
+                    <spylls.hunspell.data.mapped_dic>`): reading such compiled file is almost
+                    instant, and the words data is shared between all processes that use it, which
+                    is useful for multi-process services.
+
+        Returns:
+            The dictionary read (for ``mapped=True``, already using the mapped words storage)
+        """
+
+        if zipfile.is_zipfile(source):
+            dictionary = cls.from_zip(source)
+            sources = [source]
+        else:
+            dictionary = cls.from_files(source)
+            sources = [source + '.aff', source + '.dic']
+
+        readers.write_compiled(path, aff=dictionary.aff, dic=dictionary.dic, origin=source, sources=sources,
+                               mapped=mapped)
+
+        if mapped:
+            return cls(*readers.read_compiled(path))
+
+        return dictionary
+
+    @classmethod
+    def from_compiled(cls, path: str) -> Dictionary:
+        """
+        Read dictionary from the file produced by :meth:`compile`.
+
+        If the compiled file is outdated (the source files it was compiled from have changed, or it
+        was produced by another version of Spylls), the dictionary is read from the sources again,
+        and compiled file is rewritten.
+
+        If the file was compiled with ``mapped=True``, words are not loaded into memory, but read
+        from the memory-mapped file on demand; so if the dictionary is read before forking the worker
+        processes (or each of them reads the same file), they all share the same physical memory
+        for it.
+
+        The compiled file is read with :mod:`pickle`, which can execute arbitrary code, so it should
+        only be read from a trusted source (like the file the application compiled itself).
+
+        Args:
+            path: Path to the compiled file
+        """
+
+        try:
+            aff, dic = readers.read_compiled(path)
+        except OutdatedError as error:
+            if not error.origin:
+                raise
+            return cls.compile(error.origin, path, mapped=error.mapped)
+
+        return cls(aff, dic)
+
+    @classmethod
+    def load(cls, name: str) -> Dictionary:
+        """
+        Read dictionary by the "name", guessing the appropriate method:
+
+        * path to zip-file/extension: :meth:`from_zip`;
+        * path to the compiled dictionary: :meth:`from_compiled`;
+        * ``/some/path/some_name``, with ``/some/path/some_name.aff`` present: :meth:`from_files`;
+        * otherwise, the name is considered a language name, and is searched with :meth:`from_system`.
+        """
+
+        if zipfile.is_zipfile(name):
+            return cls.from_zip(name)
+        if os.path.isfile(name):
+            with open(name, 'rb') as file:
+                if file.read(len(COMPILED_MAGIC)) == COMPILED_MAGIC:
+                    return cls.from_compiled(name)
+        if os.path.isfile(name + '.aff'):
+            return cls.from_files(name)
+        return cls.from_system(name)
+
+    @classmethod
+    def get(cls, name: str) -> Dictionary:
+        """
+        Returns the dictionary from the process-wide :attr:`registry`, loading it (with :meth:`load`)
+        if it isn't there yet. All threads requesting the same name get the same instance, and it is
+        loaded only once, even if requested by several threads simultaneously. See
+        :mod:`registry <spylls.hunspell.registry>` for details.
+
+        ::
+
+            >>> Dictionary.get('en_US') is Dictionary.get('en_US')
+            True
+
+        Args:
+            name: Anything :meth:`load` accepts
+        """
+
+        return cls.registry.get(name)
+
     def __init__(self, aff, dic):
         self.aff = aff
         self.dic = dic
 
         self.lookuper = lookup.Lookup(self.aff, self.dic)
-        self.suggester = suggest.Suggest(self.aff, self.dic, self.lookuper)
+        self._suggester: Optional[suggest.Suggest] = None
+
+    @property
+    def suggester(self) -> suggest.Suggest:
+        """
+        Instance of ``Suggest``, can be used for experimenting, see :mod:`algo.suggest <spylls.hunspell.algo.suggest>`.
+        Created on first access, so lookup-only clients don't pay for it.
+        """
+        if self._suggester is None:
+            self._suggester = suggest.Suggest(self.aff, self.dic, self.lookuper)
+        return self._suggester
 
     def lookup(self, word: str) -> bool:
         """
@@ -181,6 +332,68 @@ class Dictionary:
 
         return self.lookuper(word)
 
+    def lookup_many(self, words: Iterable[str], *, chunk_size: int = 10_000) -> Iterator[bool]:
+        """
+        Checks many words (like all the tokens of some text), producing results in the same order.
+        Each distinct word is checked once per ``chunk_size`` words, and the memory used doesn't
+        depend on the size of ``words``, so it can be a generator of any length. See
+        :meth:`Lookup.check_many <spylls.hunspell.algo.lookup.Lookup.check_many>` for details.
+
+        ::
+
+            >>> [*dictionary.lookup_many(['spells', 'spylls', 'spells'])]
+            [True, False, True]
+
+        Args:
+            words: Words to check
+            chunk_size: How many words to process at once
+        """
+
+        return self.lookuper.check_many(words, chunk_size=chunk_size)
+
+    def check_text(self, text: Union[str, Iterable[str]], *,
+                   window: int = 10_000) -> Iterator[Tuple[int, int, str]]:
+        """
+        Checks all the words of the text, producing ``(start, end, word)`` for each misspelled one,
+        where ``start`` and ``end`` are character offsets in the text. The text is split into words
+        by the dictionary's rules (see :mod:`algo.tokenizer <spylls.hunspell.algo.tokenizer>`).
+
+        The text can be a string, or any iterable of its parts, like an opened file (producing lines)
+        or a generator of fixed-size blocks; it is processed lazily, so the memory used doesn't depend
+        on the size of the text. Verdicts for the last ``window`` distinct words are remembered (and
+        the least recently seen word is forgotten when there are more), so the frequent words of the
+        text are checked only once, wherever they are in it.
+
+        ::
+
+            >>> [*dictionary.check_text('Spellz spells well.')]
+            [(0, 6, 'Spellz')]
+
+            >>> with open('book.txt') as book:
+            ...     for start, end, word in dictionary.check_text(book):
+            ...         print(start, word)
+
+        Args:
+            text: Text to check, or iterable of its parts
+            window: How many distinct recent words to remember verdicts for
+        """
+
+        chunks = [text] if isinstance(text, str) else text
+        # word => is it correct, the most recently seen words last
+        recent: OrderedDict[str, bool] = OrderedDict()
+
+        for start, end, word in tokenizer.Tokenizer(self.aff).tokenize(chunks):
+            correct = recent.get(word)
+            if correct is None:
+                correct = recent[word] = self.lookuper(word)
+                if len(recent) > window:
+                    recent.popitem(last=False)
+            else:
+                recent.move_to_end(word)
+
+            if not correct:
+                yield (start, end, word)
+
     def suggest(self, word: str) -> Iterator[str]:
         """
         Suggests corrections for the misspelled word (in order of probability/similarity, best
@@ -201,3 +414,79 @@ class Dictionary:
         """
 
         yield from self.suggester(word)
+
+    def enable_lookup_cache(self, maxsize: int = 100_000) -> LRUCache:
+        """
+        Enables caching of the results of :meth:`lookup` (and of the internal lookups that
+        :meth:`suggest` does) for ``maxsize`` most recently checked words. The cache is dropped
+        automatically if the dictionary is changed.
+
+        ::
+
+            >>> cache = dictionary.enable_lookup_cache(maxsize=10_000)
+            >>> dictionary.lookup('spylls')
+            >>> dictionary.lookup('spylls')
+            >>> cache.hits, cache.misses, cache.hit_rate
+            (1, 1, 0.5)
+
+        Args:
+            maxsize: Maximum number of cached results
+
+        Returns:
+            The cache, which can be inspected for hits/misses statistics.
+        """
+
+        self.lookuper.cache = LRUCache(maxsize)
+        return self.lookuper.cache
+
+    def enable_full_forms(self) -> FullForms:
+        """
+        Expands all the words of the dictionary with all their affixes into the index of full word
+        forms, so :meth:`lookup` (and internal lookups of :meth:`suggest`) becomes just a search in it
+        (see :mod:`algo.full_forms <spylls.hunspell.algo.full_forms>` for details and the cases when
+        it still falls back to the regular lookup). The index takes time to build and memory to
+        keep, which is worth it for long-running services checking a lot of text, and for languages
+        with moderate morphology. Calling the method again rebuilds the index (if the dictionary was
+        changed, the index isn't used until then).
+
+        ::
+
+            >>> full_forms = dictionary.enable_full_forms()
+            >>> full_forms.size, full_forms.memory, full_forms.build_time
+            (152538, 12665276, 1.47)
+            >>> dictionary.lookup('spells')
+            True
+            >>> full_forms.hits, full_forms.misses, full_forms.fallbacks
+            (1, 0, 0)
+
+        Returns:
+            The index, which can be inspected for size, build time and hits/misses statistics.
+        """
+
+        self.lookuper.full_forms = FullForms(self.lookuper)
+        return self.lookuper.full_forms
+
+    def warmup(self) -> None:
+        """
+        Builds everything that is otherwise built lazily on first :meth:`lookup`/:meth:`suggest`
+        (suggester with its list of words for ngram suggestions, affix indexes and conditions, trie of
+        compound parts, stems filter of the mapped dictionary), so that the first requests of the service
+        wouldn't be slower than others. If the service forks worker processes, call it before forking,
+        so each worker doesn't have to build them again. (For the mapped dictionary, the list of words
+        for ngram suggestions keeps only their numbers, so it doesn't take the workers' memory.)
+        """
+
+        self.lookuper.affix_indexes()
+        self.lookuper.compound_stems()
+        if isinstance(self.dic, data.MappedDic):
+            self.dic.build_filter()
+
+        for affixes in [*self.aff.PFX.values(), *self.aff.SFX.values()]:
+            for affix in affixes:
+                affix.stem_of               # pylint: disable=pointless-statement
+                affix.condition_matches     # pylint: disable=pointless-statement
+
+        self.suggester.words_for_ngram  # pylint: disable=pointless-statement
+
+
+Dictionary.registry = Registry(Dictionary.load)
@@ -1,9 +1,13 @@
 from .file_reader import FileReader
 from .aff import read_aff
-from .dic import read_dic
+from .dic import read_dic, read_dic_parallel
+from .compiled import read_compiled, write_compiled
 
 __all__ = [
     "FileReader",
     "read_aff",
-    "read_dic"
+    "read_dic",
+    "read_dic_parallel",
+    "read_compiled",
+    "write_compiled"
 ]
@@ -17,7 +17,7 @@ Internal methods
 import re
 import itertools
 from dataclasses import dataclass, field
-from typing import Dict, Optional, Tuple, Any, Iterable
+from typing import Dict, Optional, Tuple, Any, Iterable, FrozenSet
 
 from spylls.hunspell.data import aff
 
@@ -53,6 +53,10 @@ class Context:
     #: Chars to ignore (see :attr:`Aff.IGNORE <spylls.hunspell.data.aff.Aff.IGNORE>`)
     ignore: Optional[aff.Ignore] = None
 
+    #: Pool of flag sets already met (see :meth:`parse_flag_set`): keys are both raw flag strings and
+    #: the sets themselves
+    flag_sets: Dict[Any, FrozenSet[str]] = field(default_factory=dict, repr=False)
+
     def parse_flag(self, string: str) -> str:
         """
         Parse singular flag, considering attr:`flag_format`.
@@ -82,6 +86,25 @@ class Context:
 
         raise ValueError(f"Unknown flag format {self.flag_format}")
 
+    def parse_flag_set(self, string: str) -> FrozenSet[str]:
+        """
+        Parse set of flags (see :meth:`parse_flags`) into the frozenset. Even the biggest dictionaries
+        have only a few thousands of distinct flag combinations for hundreds of thousands of words, so
+        all equal sets are the same object, shared by all words and affixes that have them.
+        """
+
+        result = self.flag_sets.get(string)
+        if result is None:
+            result = self.flag_sets[string] = self.intern_flags(frozenset(self.parse_flags(string)))
+        return result
+
+    def intern_flags(self, flags: FrozenSet[str]) -> FrozenSet[str]:
+        """
+        Returns the shared instance of flag set equal to ``flags`` (see :meth:`parse_flag_set`).
+        """
+
+        return self.flag_sets.setdefault(flags, flags)
+
 
 def read_aff(source: BaseReader) -> Tuple[aff.Aff, Context]:
     """
@@ -297,5 +320,5 @@ def make_affix(kind, flag, crossproduct, _, strip, add, *rest, context):
         strip=('' if strip == '0' else strip),
         add=('' if add == '0' else add),
         condition=cond,
-        flags={*context.parse_flags(flags)}
+        flags=context.parse_flag_set(flags)
     )
@@ -0,0 +1,295 @@
+"""
+Compiled dictionary is a binary snapshot of already read :class:`Aff <spylls.hunspell.data.aff.Aff>`
+and :class:`Dic <spylls.hunspell.data.dic.Dic>`. Reading it is several times faster than parsing
+the source ``*.aff`` and ``*.dic`` again, which matters for big dictionaries and for services
+that start many worker processes.
+
+The file consists of three parts:
+
+* magic bytes (so we can fail early on something that is not a compiled dictionary);
+* small pickled *header*: format version, Spylls version, and fingerprints (:class:`Source`) of the
+  files the dictionary was read from;
+* pickled *payload*: ``Aff`` object as is, and contents of the ``Dic`` as a set of flat columns
+  (stems, flags, capitalization types, sparse tables of data tags). Pickling ``Word`` objects one
+  by one would be simpler, but unpickling them turns to be even slower than reading the ``.dic``
+  file, so ``Dic`` is rebuilt from columns on reading.
+
+Alternatively (``mapped=True``), the ``Dic`` is not pickled, but written after the payload in the
+:mod:`mapped format <spylls.hunspell.data.mapped_dic>`, and on reading is not loaded into memory at all,
+but memory-mapped as :class:`MappedDic <spylls.hunspell.data.mapped_dic.MappedDic>`. In this case, the
+last 8 bytes of the file are the offset of the mapped part.
+
+If the header says the file was produced by another version of the format, or the source files
+have changed since compilation, :meth:`read_compiled` raises :class:`OutdatedError`, and
+:meth:`Dictionary.from_compiled <spylls.hunspell.dictionary.Dictionary.from_compiled>` rebuilds
+the file from sources.
+
+.. autofunction:: write_compiled
+.. autofunction:: read_compiled
+
+.. autoclass:: Source
+    :members:
+.. autoclass:: OutdatedError
+"""
+
+import os
+import gc
+import pickle
+import struct
+import shutil
+import hashlib
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import List, Optional, Tuple, Union
+
+from spylls import __version__
+from spylls.hunspell.data import aff as aff_module, dic as dic_module
+from spylls.hunspell.data import mapped_dic
+from spylls.hunspell.data.mapped_dic import MappedDic, write_mapped
+from spylls.hunspell.readers.dic import append_columns
+from spylls.hunspell.algo.capitalization import Type as CapType
+
+MAGIC = b'SPYLLS\x00C'
+FORMAT_VERSION = 4
+
+# Offset of the mapped Dic, at the very end of the file
+TRAILER = struct.Struct('<Q')
+
+
+class OutdatedError(Exception):
+    """
+    Raised by :meth:`read_compiled` when the compiled file can't be used: it is produced by other
+    version of Spylls/compiled format, or the source files have changed since.
+
+    Attributes:
+        path: Compiled file path
+        origin: Path the dictionary was originally read from (as passed to
+                :meth:`Dictionary.compile <spylls.hunspell.dictionary.Dictionary.compile>`), if known
+        mapped: Whether the file was compiled with mapped ``Dic``
+    """
+
+    def __init__(self, path: str, origin: Optional[str], reason: str, mapped: bool = False):
+        super().__init__(f'{path} is outdated: {reason}')
+        self.path = path
+        self.origin = origin
+        self.mapped = mapped
+
+
+@dataclass
+class Source:
+    """
+    Fingerprint of one source file of the compiled dictionary.
+    """
+
+    #: Absolute path of the file
+    path: str
+    #: File size, in bytes
+    size: int
+    #: Modification time, in nanoseconds
+    mtime: int
+    #: SHA-256 of the file contents
+    digest: str
+
+    @classmethod
+    def of(cls, path: str) -> 'Source':
+        stat = os.stat(path)
+        return cls(path=os.path.abspath(path), size=stat.st_size, mtime=stat.st_mtime_ns, digest=file_digest(path))
+
+    def is_fresh(self) -> bool:
+        """
+        Whether the file is the same as it was on compilation. Size and modification time are checked
+        first, and only if they differ, the contents hash is recalculated (so just touching the file
+        doesn't make compiled dictionary outdated). If the hash is the same, :attr:`mtime` is updated to
+        the new modification time (and :meth:`read_compiled` stores it in the compiled file, so the hash
+        wouldn't be recalculated on each reading). If the file is absent, there is nothing to rebuild
+        from, so we consider compiled version still fresh.
+        """
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return True
+
+        if stat.st_size == self.size and stat.st_mtime_ns == self.mtime:
+            return True
+
+        if stat.st_size != self.size or file_digest(self.path) != self.digest:
+            return False
+
+        self.mtime = stat.st_mtime_ns
+        return True
+
+
+def write_compiled(path: str, *, aff: aff_module.Aff, dic: dic_module.Dic,
+                   origin: Optional[str] = None, sources: Optional[List[str]] = None, mapped: bool = False) -> None:
+    """
+    Writes compiled dictionary to the file. File is written to the temporary place first, and then
+    moved to ``path``, so concurrent readers would never see it half-written.
+
+    Args:
+        path: Where to write
+        aff: Aff to store (note that it should be stored *after* the .dic file is read, as reading
+             it might update :attr:`Aff.REP <spylls.hunspell.data.aff.Aff.REP>`)
+        dic: Dic to store
+        origin: The path the dictionary was read from, to rebuild it if sources change
+        sources: List of the source files to watch for changes
+        mapped: Write ``dic`` in the mapped format (see
+                :class:`MappedDic <spylls.hunspell.data.mapped_dic.MappedDic>`)
+    """
+
+    header = {
+        'format': FORMAT_VERSION,
+        'version': __version__,
+        'origin': origin,
+        'sources': [Source.of(source) for source in sources or []],
+        'mapped': mapped,
+    }
+
+    payload = {'aff': aff}
+    if not mapped:
+        payload.update(_dic_columns(aff, dic))
+
+    with _replacing(path) as file:
+        file.write(MAGIC)
+        pickle.dump(header, file, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(payload, file, protocol=pickle.HIGHEST_PROTOCOL)
+        if mapped:
+            # Mapped data is read with memoryview.cast, so should be aligned
+            offset = mapped_dic.aligned(file.tell())
+            file.write(b'\x00' * (offset - file.tell()))
+            write_mapped(file, dic)
+            file.write(TRAILER.pack(offset))
+
+
+@contextmanager
+def _replacing(path: str):
+    # Opens the temporary file to write, and then moves it to ``path``, so concurrent readers (which
+    # might have the old file opened or memory-mapped) would never see it half-written
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=folder, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            yield file
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _dic_columns(aff: aff_module.Aff, dic: dic_module.Dic) -> dict:
+    words = dic.words
+
+    return {
+        'stems': [word.stem for word in words],
+        # Flags sets are shared between words (see Context.parse_flag_set), and pickle stores each once
+        'flags': [word.flags for word in words],
+        'captypes': bytes(word.captype.value for word in words),
+        # Everything below is empty for the vast majority of words
+        'data': {idx: dict(word.data) for idx, word in enumerate(words) if word.data},
+        'alt_spellings': {idx: word.alt_spellings for idx, word in enumerate(words) if word.alt_spellings},
+        # Lowercase forms are calculated the same way as in read_dic, and only needed for words that
+        # aren't lowercase already
+        'lower': {
+            idx: aff.casing.lower(word.stem)
+            for idx, word in enumerate(words)
+            if word.captype != CapType.NO
+        },
+    }
+
+
+def read_compiled(path: str) -> Tuple[aff_module.Aff, Union[dic_module.Dic, MappedDic]]:
+    """
+    Reads compiled dictionary. If it was compiled with ``mapped=True``, the ``Dic`` returned is
+    :class:`MappedDic <spylls.hunspell.data.mapped_dic.MappedDic>`.
+
+    Note that the file is read with :mod:`pickle`, which can execute arbitrary code while loading, so
+    compiled files should only be read if they come from a trusted source (like the ones the
+    application compiled itself), never from user uploads or third-party downloads.
+
+    Raises:
+        OutdatedError: if the file is produced by another version of Spylls, or any of the source files
+                       changed since compilation.
+        ValueError: if the file is not a compiled dictionary at all.
+    """
+
+    with open(path, 'rb') as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f'{path} is not a compiled dictionary')
+
+        header = pickle.load(file)
+        header_end = file.tell()
+
+        if header['format'] != FORMAT_VERSION or header['version'] != __version__:
+            raise OutdatedError(path, header.get('origin'),
+                                f"format {header['format']}/{header['version']}, "
+                                f"expected {FORMAT_VERSION}/{__version__}",
+                                mapped=header.get('mapped', False))
+
+        mtimes = [source.mtime for source in header['sources']]
+        changed = [source.path for source in header['sources'] if not source.is_fresh()]
+        if changed:
+            raise OutdatedError(path, header['origin'], f"sources changed: {', '.join(changed)}",
+                                mapped=header['mapped'])
+        if mtimes != [source.mtime for source in header['sources']]:
+            _update_header(path, header, header_end)
+
+        if header['mapped']:
+            aff = pickle.load(file)['aff']
+            file.seek(-TRAILER.size, os.SEEK_END)
+            offset, = TRAILER.unpack(file.read(TRAILER.size))
+            dic = MappedDic(path, offset)
+            dic.index_flags(aff.indexed_flags())
+            return (aff, dic)
+
+        # Creating lots of small objects triggers garbage collection again and again, while nothing
+        # created here can be garbage.
+        with _gc_paused():
+            payload = pickle.load(file)
+            return (payload['aff'], _build_dic(payload['aff'], payload))
+
+
+def _update_header(path: str, header: dict, header_end: int) -> None:
+    # Sources were touched, but not changed: store their new modification times, so next reading
+    # wouldn't recalculate the hashes. The file is copied with the new header and replaces the old one
+    # (like in write_compiled), because other processes might be reading it right now. The rest of
+    # the file is copied as is, which is only possible if the header has the same length (the offset of
+    # the mapped part is stored in the file). Modification times are all 8-byte numbers, so it almost
+    # always has; otherwise (or if the file can't be replaced) the hashes will be just checked again
+    # next time.
+    data = MAGIC + pickle.dumps(header, protocol=pickle.HIGHEST_PROTOCOL)
+    if len(data) != header_end:
+        return
+    try:
+        with open(path, 'rb') as source, _replacing(path) as target:
+            source.seek(header_end)
+            target.write(data)
+            shutil.copyfileobj(source, target, 1 << 20)
+    except OSError:
+        pass
+
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _build_dic(aff: aff_module.Aff, payload) -> dic_module.Dic:
+    result = dic_module.Dic(words=[])
+    result.index_flags(aff.indexed_flags())
+    # Flag sets were shared on writing, and pickle preserves it, so no need to intern them again
+    append_columns(result, payload)
+    return result
+
+
+@contextmanager
+def _gc_paused():
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
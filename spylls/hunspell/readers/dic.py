@@ -1,7 +1,9 @@
-from collections import defaultdict
+import os
 import re
+import concurrent.futures
+from collections import defaultdict
 
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional, Tuple, FrozenSet
 
 from spylls.hunspell.data import dic
 from spylls.hunspell.data.aff import Aff, RepPattern
@@ -31,99 +33,252 @@ def read_dic(source: BaseReader, *, aff: Aff, context: Context) -> dic.Dic:
                  encoding, format of flags and chars to ignore.
     """
     result = dic.Dic(words=[])
+    result.index_flags(aff.indexed_flags())
 
     for num, line in source:
         if num == 1 and COUNT_REGEXP.match(line):
             continue
 
-        word_parts = []
-        data: Dict[str, List[str]] = defaultdict(list)
-
-        parts = SPACES_REGEXP.split(line)
-
-        # Each line is ``<stem>/<flags> <data tags>``
-        # Stem can have spaces, data tags are separated from stem by spaces
-
-        for i, part in enumerate(parts):
-            # The only way to understand what's the next part:
-            if ':' in part and i != 0:
-                # If it has "foo:bar" form, it is data tag
-                tag, _, content = part.partition(':')
-                # TODO: in ph2.dic, there is "ph:" construct (without contents), what does it means?..
-                if content:
-                    data[tag].append(content)
-            elif part.isdigit() and i != 0:
-                # If it is just numeric AND not the first part in string, it is "morphology alias"
-                # (defined in .aff file list of data tags corresponding to some number)
-                # So we just mutate the list of parts we are currently processing, so those fetched
-                # by numeric alias would be handled.
-                parts.extend(aff.AM[part])
-            else:
-                # ...otherwise, it is still part of the word
-                word_parts.append(part)
-
-        word = ' '.join(word_parts)
-        # Now, the "word" part is "stem/flags". Flags are optional, and to complicate matters further:
-        #
-        # * if the word STARTS with "/" -- it is not empty stem + flags, but "word starting with /";
-        # * if the "/" should be in stem, it can be screened by "\/"
-        if word.startswith('/'):
-            flags = ''
+        word, lower, reps = parse_line(line, aff=aff, context=context)
+        aff.REP.extend(reps)
+        result.append(word, lower=lower)
+
+    return result
+
+
+def read_dic_parallel(path: str, *, aff: Aff, context: Context, workers: int) -> dic.Dic:
+    """
+    Same as :meth:`read_dic`, but for a plain file, parsed by several processes. The file is split
+    into byte ranges (on line boundaries), each range is parsed in a separate process, and then
+    results are merged in the file order (so the words order, and the order of REP-table updates,
+    is exactly the same as with :meth:`read_dic`).
+
+    This makes sense only for big dictionaries (hundreds of thousands of lines): for smaller ones,
+    starting processes and transferring the results costs more than it saves.
+
+    Args:
+        path: Path to .dic file
+        aff: See :meth:`read_dic`
+        context: See :meth:`read_dic`
+        workers: Number of processes to use
+    """
+
+    size = os.path.getsize(path)
+    # Several chunks per worker, so that if one of them is slower, others wouldn't wait for it
+    chunk_size = max(size // (workers * 4), MIN_CHUNK_SIZE)
+
+    bounds = []
+    with open(path, 'rb') as file:
+        start = 0
+        while start < size:
+            file.seek(min(start + chunk_size, size))
+            file.readline()     # move to the end of the current line
+            end = min(file.tell(), size)
+            bounds.append((start, end))
+            start = end
+
+    result = dic.Dic(words=[])
+    result.index_flags(aff.indexed_flags())
+
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(path, aff, context)) as executor:
+        chunks = executor.map(_read_chunk, bounds)
+
+        # Merging the chunks in order. Columns are transferred instead of Word objects, because
+        # unpickling the objects is almost as slow as parsing.
+        for chunk in chunks:
+            aff.REP.extend(chunk['rep'])
+            append_columns(result, chunk, intern_flags=context.intern_flags)
+
+    return result
+
+
+def parse_line(line: str, *, aff: Aff, context: Context) -> Tuple[dic.Word, List[str], List[RepPattern]]:
+    """
+    Parses one line of .dic file.
+
+    Args:
+        line: The line (already stripped)
+        aff: Contents of corresponding .aff file
+        context: See :meth:`read_dic`
+
+    Returns:
+        The word, its lowercase forms (see :meth:`Dic.append <spylls.hunspell.data.dic.Dic.append>`)
+        and the list of REP patterns that line defines (see below), in order of definition.
+    """
+
+    word_parts = []
+    data: Dict[str, List[str]] = defaultdict(list)
+
+    parts = SPACES_REGEXP.split(line)
+
+    # Each line is ``<stem>/<flags> <data tags>``
+    # Stem can have spaces, data tags are separated from stem by spaces
+
+    for i, part in enumerate(parts):
+        # The only way to understand what's the next part:
+        if ':' in part and i != 0:
+            # If it has "foo:bar" form, it is data tag
+            tag, _, content = part.partition(':')
+            # TODO: in ph2.dic, there is "ph:" construct (without contents), what does it means?..
+            if content:
+                data[tag].append(content)
+        elif part.isdigit() and i != 0:
+            # If it is just numeric AND not the first part in string, it is "morphology alias"
+            # (defined in .aff file list of data tags corresponding to some number)
+            # So we just mutate the list of parts we are currently processing, so those fetched
+            # by numeric alias would be handled.
+            parts.extend(aff.AM[part])
+        else:
+            # ...otherwise, it is still part of the word
+            word_parts.append(part)
+
+    word = ' '.join(word_parts)
+    # Now, the "word" part is "stem/flags". Flags are optional, and to complicate matters further:
+    #
+    # * if the word STARTS with "/" -- it is not empty stem + flags, but "word starting with /";
+    # * if the "/" should be in stem, it can be screened by "\/"
+    if word.startswith('/'):
+        flags = ''
+    else:
+        word_with_flags = SLASH_REGEXP.split(word, 2)
+        if len(word_with_flags) == 2:
+            word, flags = word_with_flags
         else:
-            word_with_flags = SLASH_REGEXP.split(word, 2)
-            if len(word_with_flags) == 2:
-                word, flags = word_with_flags
+            flags = ''
+
+    if r'\/' in word:
+        word = word.replace(r'\/', '/')
+
+    # Here we have our clean word (with screened "\/" replaced, and flag splitted off)
+
+    if context.ignore:
+        # ...now we remove any chars context says to ignore...
+        word = word.translate(context.ignore.tr)
+
+    # And cache word's casing and its lowerase forms (if it isn't lowercase already)
+    captype = aff.casing.guess(word)
+    lower = aff.casing.lower(word) if captype != CapType.NO else []
+
+    alt_spellings: List[str] = []
+    reps = []
+
+    if 'ph' in data:
+        # Now, for all "ph:" (alt.spellings) patterns:
+
+        for pattern in data['ph']:
+            # TODO: https://manpages.debian.org/experimental/libhunspell-dev/hunspell.5.en.html#Optional_data_fields
+            # according to it, Wednesday ph:wendsay should produce two cases
+            #   REP wendsay Wednesday
+            #   REP Wendsay Wednesday
+            # hunspell handles it by just `if (captype==INITCAP)`...
+            if pattern.endswith('*'):
+                # If it is ``pretty ph:prit*`` -- it means pair ``(prit, prett)`` should be added
+                # to REP-table
+                reps.append(RepPattern(pattern[:-2], word[:-1]))
+            elif '->' in pattern:
+                # If it is ``happy ph:hepi->happi`` -- it means pair ``(hepi, happi)`` should be added
+                # to REP-table ("happy" itself is just ignored...)
+                fro, _, to = pattern.partition('->')
+                reps.append(RepPattern(fro, to))
             else:
-                flags = ''
-
-        if r'\/' in word:
-            word = word.replace(r'\/', '/')
-
-        # Here we have our clean word (with screened "\/" replaced, and flag splitted off)
-
-        if context.ignore:
-            # ...now we remove any chars context says to ignore...
-            word = word.translate(context.ignore.tr)
-
-        # And cache word's casing and its lowerase form
-        captype = aff.casing.guess(word)
-        lower = aff.casing.lower(word) if captype != CapType.NO else word
-
-        alt_spellings = []
-
-        if 'ph' in data:
-            # Now, for all "ph:" (alt.spellings) patterns:
-
-            for pattern in data['ph']:
-                # TODO: https://manpages.debian.org/experimental/libhunspell-dev/hunspell.5.en.html#Optional_data_fields
-                # according to it, Wednesday ph:wendsay should produce two cases
-                #   REP wendsay Wednesday
-                #   REP Wendsay Wednesday
-                # hunspell handles it by just `if (captype==INITCAP)`...
-                if pattern.endswith('*'):
-                    # If it is ``pretty ph:prit*`` -- it means pair ``(prit, prett)`` should be added
-                    # to REP-table
-                    aff.REP.append(RepPattern(pattern[:-2], word[:-1]))
-                elif '->' in pattern:
-                    # If it is ``happy ph:hepi->happi`` -- it means pair ``(hepi, happi)`` should be added
-                    # to REP-table ("happy" itself is just ignored...)
-                    fro, _, to = pattern.partition('->')
-                    aff.REP.append(RepPattern(fro, to))
-                else:
-                    # And if it is simple ``wednesday ph:wensday``, it means that ``(wensday, wednesday)``
-                    # should be added to REP table
-                    aff.REP.append(RepPattern(pattern, word))
-                    # ...and that "wensday" should be stored in word as alt.spelling (used for ngram suggest)
-                    alt_spellings.append(pattern)
-
-        # And here we are!
-        word_obj = dic.Word(
-            stem=word,
-            flags={*context.parse_flags(flags)},
-            data=data,
-            captype=captype,
-            alt_spellings=alt_spellings
-        )
-        result.append(word_obj, lower=lower)
+                # And if it is simple ``wednesday ph:wensday``, it means that ``(wensday, wednesday)``
+                # should be added to REP table
+                reps.append(RepPattern(pattern, word))
+                # ...and that "wensday" should be stored in word as alt.spelling (used for ngram suggest)
+                alt_spellings.append(pattern)
 
-    return result
+    # And here we are!
+    word_obj = dic.Word(
+        stem=word,
+        flags=context.parse_flag_set(flags),
+        data=data or dic.NO_DATA,
+        captype=captype,
+        alt_spellings=alt_spellings or dic.NO_ALT_SPELLINGS
+    )
+
+    return (word_obj, lower, reps)
+
+
+CAPTYPES = {captype.value: captype for captype in CapType}
+
+# Smaller chunks of .dic aren't worth sending to another process
+MIN_CHUNK_SIZE = 1 << 16
+
+# State of the worker process of read_dic_parallel: path, aff, context
+_worker: Optional[Tuple[str, Aff, Context]] = None
+
+
+def _init_worker(path: str, aff: Aff, context: Context):
+    global _worker  # pylint: disable=global-statement,invalid-name
+    _worker = (path, aff, context)
+
+
+def _read_chunk(bounds: Tuple[int, int]) -> dict:
+    path, aff, context = _worker  # type: ignore   # always set by _init_worker
+    start, end = bounds
+
+    with open(path, 'rb') as file:
+        file.seek(start)
+        raw = file.read(end - start)
+
+    columns: dict = {'stems': [], 'flags': [], 'captypes': bytearray(),
+                     'data': {}, 'alt_spellings': {}, 'lower': {}, 'rep': []}
+
+    for num, line in BaseReader(raw, encoding=context.encoding):
+        # Only the first line of the file might be the words count
+        if start == 0 and num == 1 and COUNT_REGEXP.match(line):
+            continue
+
+        word, lower, reps = parse_line(line, aff=aff, context=context)
+        idx = len(columns['stems'])
+        columns['stems'].append(word.stem)
+        columns['flags'].append(word.flags)
+        columns['captypes'].append(word.captype.value)
+        if word.data:
+            columns['data'][idx] = dict(word.data)
+        if word.alt_spellings:
+            columns['alt_spellings'][idx] = word.alt_spellings
+        if lower:
+            columns['lower'][idx] = lower
+        columns['rep'].extend(reps)
+
+    return columns
+
+
+def append_columns(target: dic.Dic, columns: dict, *,
+                   intern_flags: Optional[Callable[[FrozenSet[str]], FrozenSet[str]]] = None) -> None:
+    """
+    Appends words stored as flat columns (as produced by the workers of :meth:`read_dic_parallel`, or
+    stored in the :mod:`compiled dictionary <spylls.hunspell.readers.compiled>`) to ``target``. Columns
+    are ``stems``, ``flags`` and ``captypes`` (values of
+    :class:`capitalization.Type <spylls.hunspell.algo.capitalization.Type>`) for each word, and sparse
+    ``data``, ``alt_spellings`` and ``lower`` tables, ``{word index: value}``, for the few words that
+    have them.
+
+    Args:
+        target: Dic to append words to
+        columns: Words data
+        intern_flags: Function to replace each flag set with a shared instance (see
+                      :meth:`Context.intern_flags <spylls.hunspell.readers.aff.Context.intern_flags>`),
+                      if they aren't shared already
+    """
+
+    data = columns['data']
+    alt_spellings = columns['alt_spellings']
+    lower = columns['lower']
+    flags = columns['flags']
+    captypes = columns['captypes']
+
+    if intern_flags is not None:
+        flags = [intern_flags(word_flags) for word_flags in flags]
+
+    for idx, stem in enumerate(columns['stems']):
+        word = dic.Word(
+            stem=stem,
+            flags=flags[idx],
+            data=defaultdict(list, data[idx]) if idx in data else dic.NO_DATA,
+            alt_spellings=alt_spellings.get(idx, dic.NO_ALT_SPELLINGS),
+            captype=CAPTYPES[captypes[idx]]
+        )
+        target.append(word, lower=lower.get(idx, ()))
@@ -6,14 +6,20 @@
 .. autoclass:: ZipReader
 """
 
-import io
-import zipfile
+import re
+import mmap
+import codecs
+
+BOM = codecs.BOM_UTF8
+
+# Same as text-mode files: lines can be separated by \n, \r\n or \r
+NEWLINE_REGEXP = re.compile(rb'\r\n?|\n')
 
 
 class BaseReader:
     """
     Common base for :class:`FileReader` and :class:`ZipReader`. In fact, it is a very thin wrapper
-    around ``IO``-alike object, to read it line by line and:
+    around the source bytes, to read them line by line and:
 
     * strip lines transparently
     * ignore BOM (byte-order mark) at the beginning
@@ -25,14 +31,24 @@ class BaseReader:
             reader.reset_encoding('UTF-8')
             # ..continue to read from the same line
 
+    The whole source is read once (or memory-mapped, see :class:`FileReader`) as bytes, and each line is
+    decoded when it is reached, with the encoding that is current at that moment, so changing the
+    encoding (which typically happens once, on ``SET`` directive of .aff file) costs nothing.
+
+    Args:
+        data: Source contents (``bytes`` or any object supporting slicing to bytes and regexp search,
+              like ``mmap``)
+        encoding: Initial encoding
     """
-    def __init__(self, obj):
+    def __init__(self, data, encoding='Windows-1252'):
+        self.data = data
         self.line_no = 0
 
-        self.reset_io(obj)
+        self.reset_encoding(encoding)
+        self.iter = filter(lambda l: l[1] != '', self.readlines())
 
     def reset_encoding(self, encoding):
-        raise NotImplementedError
+        self.decode = codecs.getdecoder(encoding)
 
     def __iter__(self):
         return self
@@ -41,53 +57,46 @@ class BaseReader:
         return self.iter.__next__()
 
     def readlines(self):
-        ln = self.io.readline()
-        while ln != '':
-            self.line_no += 1
-            if self.line_no == 1 and ln.startswith("\xef\xbb\xbf"):
-                ln = ln.replace("\xef\xbb\xbf", '')
-            yield (self.line_no, ln.strip())
-            ln = self.io.readline()
+        data = self.data
+        size = len(data)
 
-    def reset_io(self, obj):
-        self.io = obj
-        self.iter = filter(lambda l: l[1] != '', self.readlines())
+        pos = len(BOM) if data[:len(BOM)] == BOM else 0
+        while pos < size:
+            newline = NEWLINE_REGEXP.search(data, pos)
+            end, next_pos = newline.span() if newline else (size, size)
+
+            self.line_no += 1
+            # errors='surrogateescape', because at least hu_HU dictionary of LibreOffice uses invalid
+            # in UTF-8 single-bytes as suffix flags
+            line, _ = self.decode(data[pos:end], 'surrogateescape')
+            yield (self.line_no, line.strip())
 
-        for _ in range(self.line_no):
-            self.io.readline()
+            pos = next_pos
 
 
 class FileReader(BaseReader):
     """
-    Reader implementation for simple filesystem file.
+    Reader implementation for simple filesystem file. The file is memory-mapped, so even big ``*.dic``
+    files aren't copied into memory as a whole.
     """
 
     def __init__(self, path, encoding='Windows-1252'):
         self.path = path
-        super().__init__(self._open(path, encoding))
-
-    def reset_encoding(self, encoding):
-        self.reset_io(self._open(self.path, encoding))
-
-    def _open(self, path, encoding):  # pylint: disable=no-self-use
-        # errors='surrogateescape', because at least hu_HU dictionary of LibreOffice uses invalid
-        # in UTF-8 single-bytes as suffix flags
-        return open(path, 'r', encoding=encoding, errors='surrogateescape')
+        with open(path, 'rb') as file:
+            try:
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files can't be mapped
+                data = file.read()
+        super().__init__(data, encoding)
 
 
 class ZipReader(BaseReader):
     """
-    Reader implementation for file inside zip archive.
+    Reader implementation for file inside zip archive. The file is decompressed once, as a whole.
     """
 
     def __init__(self, zip_obj, encoding='Windows-1252'):
-        self.zipfile = (zip_obj._fileobj._file.name, zip_obj.name)
-        super().__init__(self._open(zip_obj, encoding))
-
-    def reset_encoding(self, encoding):
-        zipname, path = self.zipfile
-        # FIXME: Like, really?..
-        self.reset_io(self._open(zipfile.ZipFile(zipname).open(path), encoding))
-
-    def _open(self, zip_obj, encoding):  # pylint: disable=no-self-use
-        return io.TextIOWrapper(zip_obj, encoding=encoding, errors='surrogateescape')
+        with zip_obj:
+            data = zip_obj.read()
+        super().__init__(data, encoding)
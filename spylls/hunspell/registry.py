@@ -0,0 +1,174 @@
+"""
+Process-wide storage of loaded dictionaries, used by
+:meth:`Dictionary.get <spylls.hunspell.dictionary.Dictionary.get>`.
+
+Services working with many languages typically need "the dictionary for this language" on each
+request; the registry makes sure each dictionary is loaded only once, and shared by all the threads:
+
+* if several threads request the same dictionary that isn't loaded yet, only one of them loads it,
+  and others wait for the result;
+* if the loading fails, all waiting threads get the error, and the next request tries to load again;
+* if the memory budget is set, and the (estimated) size of all dictionaries exceeds it, the least
+  recently used ones are dropped from the registry (they still work for whoever holds them, but would be
+  loaded again on the next request).
+
+Usage::
+
+    from spylls.hunspell import Dictionary
+
+    Dictionary.registry.memory_budget = 500 * 1024 * 1024
+
+    dictionary = Dictionary.get('en_US')
+
+.. autoclass:: Registry
+    :members:
+
+.. autofunction:: estimate_size
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Rough per-object memory costs (64-bit CPython), used by estimate_size
+WORD_OVERHEAD = 72 + 100 + 8      # Word instance, index entry (with its list), entry in words list
+AFFIX_OVERHEAD = 600              # Affix instance with its fields and (eventually) regexps
+
+
+def estimate_size(dictionary) -> int:
+    """
+    Rough estimation of memory occupied by the dictionary, in bytes: enough to compare dictionaries
+    with each other and with the budget, but not precise (precise calculation would be too costly).
+    For memory-mapped dictionaries (see :class:`MappedDic <spylls.hunspell.data.mapped_dic.MappedDic>`),
+    the size of the mapped data is counted.
+
+    Args:
+        dictionary: :class:`Dictionary <spylls.hunspell.dictionary.Dictionary>` instance
+    """
+
+    affixes = sum(len(affixes) for affixes in [*dictionary.aff.PFX.values(), *dictionary.aff.SFX.values()])
+    size = affixes * AFFIX_OVERHEAD
+
+    mmap = getattr(dictionary.dic, 'mmap', None)
+    if mmap is not None:
+        return size + len(mmap)
+
+    return size + sum(sys.getsizeof(word.stem) + WORD_OVERHEAD for word in dictionary.dic.words)
+
+
+class Registry:
+    """
+    Thread-safe cache of loaded objects (dictionaries) by name, with LRU eviction by memory budget.
+
+    Args:
+        loader: Function to load the object by name
+        memory_budget: Maximum total size of the stored objects, in bytes (``None`` for unlimited). The
+                       most recently requested object is never evicted, even if it alone is larger than
+                       the budget.
+        size_of: Function to estimate the size of the object
+    """
+
+    def __init__(self, loader: Callable[[str], Any], *,
+                 memory_budget: Optional[int] = None, size_of: Callable[[Any], int] = estimate_size):
+        self.loader = loader
+        self._memory_budget = memory_budget
+        self.size_of = size_of
+
+        self.lock = threading.Lock()
+        # name => (object, size), from least to most recently used
+        self.entries: 'OrderedDict[str, Tuple[Any, int]]' = OrderedDict()
+        # name => future of the object being loaded right now
+        self.loading: Dict[str, Future] = {}
+
+    def get(self, name: str) -> Any:
+        """
+        Returns the object by name, loading it if necessary.
+        """
+
+        with self.lock:
+            if name in self.entries:
+                self.entries.move_to_end(name)
+                return self.entries[name][0]
+
+            future = self.loading.get(name)
+            owner = future is None
+            if owner:
+                future = self.loading[name] = Future()
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = self.loader(name)
+            size = self.size_of(value)
+        except BaseException as error:
+            with self.lock:
+                del self.loading[name]
+            future.set_exception(error)
+            raise
+
+        with self.lock:
+            del self.loading[name]
+            self.entries[name] = (value, size)
+            self._evict()
+        future.set_result(value)
+
+        return value
+
+    def evict(self, name: str) -> None:
+        """
+        Drops the object from the registry (if it is there).
+        """
+
+        with self.lock:
+            self.entries.pop(name, None)
+
+    def clear(self) -> None:
+        """
+        Drops all objects from the registry.
+        """
+
+        with self.lock:
+            self.entries.clear()
+
+    @property
+    def memory_budget(self) -> Optional[int]:
+        """
+        Maximum total size of stored objects, in bytes. Can be changed at any moment (if the new budget
+        is exceeded, least recently used objects are dropped immediately).
+        """
+        return self._memory_budget
+
+    @memory_budget.setter
+    def memory_budget(self, value: Optional[int]) -> None:
+        with self.lock:
+            self._memory_budget = value
+            self._evict()
+
+    @property
+    def size(self) -> int:
+        """
+        Total estimated size of the stored objects.
+        """
+        with self.lock:
+            return sum(size for _, size in self.entries.values())
+
+    @property
+    def names(self) -> List[str]:
+        """
+        Names of the stored objects, from least to most recently used.
+        """
+        with self.lock:
+            return [*self.entries]
+
+    def _evict(self) -> None:
+        # Should be called under the lock
+        if self._memory_budget is None:
+            return
+
+        total = sum(size for _, size in self.entries.values())
+        while total > self._memory_budget and len(self.entries) > 1:
+            _, (_, size) = self.entries.popitem(last=False)
+            total -= size
@@ -0,0 +1,83 @@
+"""
+Checks that all the ways of loading and looking up the dictionary (ENGINES) give the same results as
+the plain one (read from .aff/.dic). Words are taken from all fixtures' .good and .wrong lists.
+"""
+
+import sys
+import tempfile
+from collections import Counter
+
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from base import BASE_FOLDER, read_list, read_dictionary, section, summary
+
+from spylls.hunspell import Dictionary
+
+stats = Counter()
+
+folder = tempfile.TemporaryDirectory()
+
+
+def compiled(name, mapped):
+    path = str(Path(folder.name) / f'{name}{".mapped" if mapped else ""}.spylls')
+    Dictionary.compile(str(BASE_FOLDER / name), path, mapped=mapped)
+    return Dictionary.from_compiled(path)
+
+
+def full_forms(name):
+    dictionary = read_dictionary(name)
+    dictionary.enable_full_forms()
+    return dictionary
+
+
+ENGINES = {
+    'compiled': lambda name: compiled(name, mapped=False),
+    'mapped': lambda name: compiled(name, mapped=True),
+    'full forms': full_forms,
+}
+
+
+def lookup_all(dictionary, words):
+    results = {}
+    for word in words:
+        try:
+            results[word] = dictionary.lookup(word)
+        except Exception as error:  # pylint: disable=broad-except
+            results[word] = type(error).__name__
+    return results
+
+
+def report(name):
+    stats['total'] += 1
+
+    words = [word for word in [*read_list(f'{name}.good'), *read_list(f'{name}.wrong')] if word]
+    expected = lookup_all(read_dictionary(name), words)
+
+    failures = []
+    for engine, load in ENGINES.items():
+        results = lookup_all(load(name), words)
+        different = [word for word in words if results[word] != expected[word]]
+        if different:
+            failures.append(f"{engine} differs on {', '.join(different)}")
+
+    if failures:
+        stats['fail'] += 1
+        print(f"{name}: fail")
+        for failure in failures:
+            print(f"  {failure}")
+    else:
+        stats['ok'] += 1
+        print(f"{name}: OK ({len(words)})")
+
+
+# ==============================
+section('Engines')
+
+for path in sorted(BASE_FOLDER.glob('*.aff')):
+    if path.with_suffix('.dic').is_file():
+        report(path.stem)
+
+summary(stats)
+
+folder.cleanup()
@@ -0,0 +1,57 @@
+import pytest
+
+from spylls.hunspell import Dictionary
+
+AFF = """
+FORBIDDENWORD !
+
+SFX A Y 1
+SFX A 0 s .
+
+SFX B Y 1
+SFX B y ies [^aeiou]y
+
+SFX C Y 1
+SFX C 0 ed [^d]
+
+SFX D Y 1
+SFX D 0 er .
+
+PFX P Y 1
+PFX P 0 un [^b]
+
+PFX Q Y 1
+PFX Q 0 re .
+"""
+
+DIC = """
+2
+cat/A
+bad/!
+"""
+
+
+@pytest.fixture
+def dictionary(tmp_path):
+    (tmp_path / 'test.aff').write_text(AFF)
+    (tmp_path / 'test.dic').write_text(DIC)
+    return Dictionary.from_files(str(tmp_path / 'test'))
+
+
+def indexed_flags(dictionary):
+    suffixes, prefixes = dictionary.lookuper.affix_indexes()
+    words = ['bads', 'babies', 'baded', 'bader', 'unbad', 'rebad']
+    return (
+        {suffix.flag for word in words for suffix in suffixes.lookup(word[::-1])},
+        {prefix.flag for word in words for prefix in prefixes.lookup(word)},
+    )
+
+
+def test_forbidden_stems_keep_only_producing_affixes(dictionary):
+    # No stem has B, C, D, P, Q; of them, only D and Q (their conditions accept it) might produce
+    # the forbidden "bad" from some word, so they are kept, while the rest are still pruned
+    assert indexed_flags(dictionary) == ({'A', 'D'}, {'Q'})
+
+    assert not dictionary.lookup('bad')
+    assert not dictionary.lookup('rebad')
+    assert dictionary.lookup('cats')
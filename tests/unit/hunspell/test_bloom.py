@@ -0,0 +1,47 @@
+import random
+import string
+
+import pytest
+
+from spylls.hunspell.algo.bloom import BloomFilter
+
+
+def random_words(count, seed):
+    rng = random.Random(seed)
+    return {''.join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 12))) for _ in range(count)}
+
+
+def test_no_false_negatives():
+    items = random_words(20_000, seed=1)
+    bloom = BloomFilter(items, size=len(items))
+
+    assert all(bloom.may_contain(item) for item in items)
+
+
+def test_false_positives_rate():
+    items = random_words(20_000, seed=1)
+    absent = random_words(20_000, seed=2) - items
+    bloom = BloomFilter(items, size=len(items), fp_rate=0.01)
+
+    false_positives = sum(bloom.may_contain(item) for item in absent)
+    # Expected ~1%, leaving room for randomness
+    assert false_positives / len(absent) < 0.03
+
+
+def test_positions_match_may_contain():
+    bloom = BloomFilter(['cat'], size=1)
+    positions = [*bloom.positions('cat')]
+
+    assert len(positions) == bloom.hashes
+    assert all(bloom.data[bit >> 3] & (1 << (bit & 7)) for bit in positions)
+
+
+def test_empty():
+    bloom = BloomFilter([], size=0)
+    assert not bloom.may_contain('cat')
+
+
+@pytest.mark.parametrize('fp_rate', [0, 1, -0.5, 2])
+def test_invalid_rate(fp_rate):
+    with pytest.raises(ValueError):
+        BloomFilter(['cat'], size=1, fp_rate=fp_rate)
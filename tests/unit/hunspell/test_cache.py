@@ -0,0 +1,85 @@
+import pickle
+from pathlib import Path
+
+import pytest
+
+from spylls.hunspell import Dictionary
+from spylls.hunspell.data.dic import Word
+from spylls.hunspell.algo.cache import LRUCache
+from spylls.hunspell.algo.capitalization import Type as CapType
+
+FIXTURES = Path(__file__).resolve().parents[2] / 'integrational' / 'fixtures'
+
+
+def test_get_put():
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    assert cache.get('b', 'default') == 'default'
+    assert (cache.hits, cache.misses, cache.hit_rate) == (1, 2, 1 / 3)
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')          # now "b" is the least recently used
+    cache.put('c', 3)
+
+    assert len(cache) == 2
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+
+
+def test_put_existing_key_refreshes_it():
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.put('a', 10)
+    cache.put('c', 3)
+
+    assert cache.get('a') == 10
+    assert cache.get('b') is None
+
+
+def test_clear_keeps_counters():
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.get('a')
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache.hits == 1
+
+
+def test_invalid_size():
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=0)
+
+
+def test_pickle():
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+
+    copy = pickle.loads(pickle.dumps(cache))
+    assert copy.get('a') == 1
+    copy.put('b', 2)
+    copy.put('c', 3)
+    assert len(copy) == 2
+
+
+def test_lookup_cache():
+    dictionary = Dictionary.from_files(str(FIXTURES / 'base'))
+    cache = dictionary.enable_lookup_cache(maxsize=10)
+
+    assert dictionary.lookup('looked')
+    assert dictionary.lookup('looked')
+    assert not dictionary.lookup('spylls')
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    # Cached results are dropped when the dictionary changes
+    dictionary.dic.append(Word(stem='spylls', flags=frozenset(), data={}, alt_spellings=(), captype=CapType.NO))
+    assert dictionary.lookup('spylls')
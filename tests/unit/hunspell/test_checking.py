@@ -0,0 +1,84 @@
+from pathlib import Path
+
+import pytest
+
+from spylls.hunspell import Dictionary
+from spylls.hunspell.data.dic import Word
+from spylls.hunspell.algo.capitalization import Type as CapType
+
+FIXTURES = Path(__file__).resolve().parents[2] / 'integrational' / 'fixtures'
+
+
+def read_list(name):
+    path = FIXTURES / name
+    return [line.strip() for line in path.read_text().splitlines() if line.strip()]
+
+
+@pytest.fixture
+def dictionary():
+    return Dictionary.from_files(str(FIXTURES / 'base'))
+
+
+@pytest.fixture
+def words():
+    good, wrong = read_list('base.good'), read_list('base.wrong')
+    # Repeated, so there are duplicates inside and between chunks
+    return [*good, *wrong] * 3
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 10_000])
+def test_lookup_many(dictionary, words, chunk_size):
+    assert [*dictionary.lookup_many(words, chunk_size=chunk_size)] == [dictionary.lookup(word) for word in words]
+
+
+@pytest.mark.parametrize('chunk_size', [0, -1])
+def test_lookup_many_bad_chunk_size(dictionary, chunk_size):
+    with pytest.raises(ValueError, match='chunk_size must be positive'):
+        dictionary.lookup_many(['looked'], chunk_size=chunk_size)
+
+
+def test_lookup_many_is_lazy(dictionary):
+    def endless():
+        while True:
+            yield 'looked'
+            yield 'lookedd'
+
+    results = dictionary.lookup_many(endless(), chunk_size=10)
+    assert [next(results) for _ in range(25)] == [True, False] * 12 + [True]
+
+
+@pytest.mark.parametrize('window', [1, 3, 10_000])
+def test_check_text(dictionary, window):
+    text = 'Looked lookedd looked, NASA nasa looked lookedd\nlooked!'
+
+    assert [*dictionary.check_text(text, window=window)] == [(7, 14, 'lookedd'), (28, 32, 'nasa'), (40, 47, 'lookedd')]
+
+
+def test_check_text_chunks(dictionary, words):
+    text = ' '.join(words)
+    expected = [*dictionary.check_text(text)]
+
+    assert [word for _, _, word in expected] == [word for word in words if not dictionary.lookup(word)]
+    assert [*dictionary.check_text(text[i:i + 10] for i in range(0, len(text), 10))] == expected
+
+
+def test_full_forms(dictionary, words):
+    expected = [dictionary.lookup(word) for word in words]
+
+    full_forms = dictionary.enable_full_forms()
+    assert full_forms.size > 0
+    assert [dictionary.lookup(word) for word in words] == expected
+    assert full_forms.hits > 0
+
+    # The index is outdated when the dictionary changes, and lookup falls back to the full analysis
+    dictionary.dic.append(Word(stem='spylls', flags=frozenset(), data={}, alt_spellings=(), captype=CapType.NO))
+    fallbacks = full_forms.fallbacks
+    assert dictionary.lookup('spylls')
+    assert full_forms.fallbacks == fallbacks + 1
+
+
+def test_warmup(dictionary, words):
+    expected = [dictionary.lookup(word) for word in words]
+
+    dictionary.warmup()
+    assert [dictionary.lookup(word) for word in words] == expected
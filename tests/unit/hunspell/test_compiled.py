@@ -0,0 +1,151 @@
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from spylls.hunspell import Dictionary
+from spylls.hunspell.data import MappedDic
+from spylls.hunspell.readers import compiled
+from spylls.hunspell.readers.compiled import OutdatedError, read_compiled, write_compiled
+
+FIXTURES = Path(__file__).resolve().parents[2] / 'integrational' / 'fixtures'
+
+WORDS = ['looked', 'created', 'uncreate', 'Hunspell', 'NASA', 'nasa', "doesn't", 'FAQs', 'spylls', 'lookedd']
+
+
+@pytest.fixture
+def source(tmp_path):
+    for ext in ['aff', 'dic']:
+        shutil.copy(FIXTURES / f'base.{ext}', tmp_path / f'base.{ext}')
+    return str(tmp_path / 'base')
+
+
+def words_of(dictionary):
+    return [(word.stem, word.flags, word.captype, dict(word.data), tuple(word.alt_spellings))
+            for word in dictionary.dic.words]
+
+
+@pytest.mark.parametrize('mapped', [False, True])
+def test_round_trip(source, tmp_path, mapped):
+    path = str(tmp_path / 'base.spylls')
+    original = Dictionary.compile(source, path, mapped=mapped)
+    restored = Dictionary.from_compiled(path)
+
+    assert isinstance(restored.dic, MappedDic) == mapped
+    assert words_of(restored) == words_of(original)
+    assert restored.aff.REP == original.aff.REP
+    assert [restored.lookup(word) for word in WORDS] == [original.lookup(word) for word in WORDS]
+    assert [*restored.suggest('lookedd')] == [*original.suggest('lookedd')]
+
+
+def test_mapped_dic_queries(source, tmp_path):
+    path = str(tmp_path / 'base.spylls')
+    original = Dictionary.compile(source, path, mapped=True).dic
+    mapped = Dictionary.from_compiled(path).dic
+
+    assert len(mapped.words) == len(original.words)
+    for word in original.words:
+        assert mapped.homonyms(word.stem) == original.homonyms(word.stem)
+        for flag in word.flags:
+            assert mapped.has_flag(word.stem, flag) == original.has_flag(word.stem, flag)
+            assert mapped.has_flag(word.stem, flag, for_all=True) == original.has_flag(word.stem, flag, for_all=True)
+    assert mapped.homonyms('absent') == []
+    assert mapped.used_flags() == original.used_flags()
+    assert mapped.has_multiword_stems() == original.has_multiword_stems()
+
+    mapped.build_filter()
+    assert all(mapped.may_contain(word.stem) for word in original.words)
+
+
+@pytest.mark.parametrize('multiword', [False, True])
+def test_mapped_multiword_stems(source, tmp_path, multiword):
+    if multiword:
+        with open(f'{source}.dic', 'a') as file:
+            file.write('New York\n')
+    path = str(tmp_path / 'base.spylls')
+    Dictionary.compile(source, path, mapped=True)
+
+    assert Dictionary.from_compiled(path).dic.has_multiword_stems() == multiword
+
+
+@pytest.mark.parametrize('mapped', [False, True])
+@pytest.mark.parametrize('ext', ['aff', 'dic'])
+def test_rebuilt_when_source_changes(source, tmp_path, mapped, ext):
+    path = str(tmp_path / 'base.spylls')
+    Dictionary.compile(source, path, mapped=mapped)
+    assert not Dictionary.from_compiled(path).lookup('spylls')
+
+    with open(f'{source}.{ext}', 'a') as file:
+        file.write('\nspylls\n' if ext == 'dic' else '\n# changed\n')
+
+    with pytest.raises(OutdatedError):
+        read_compiled(path)
+
+    dictionary = Dictionary.from_compiled(path)
+    assert isinstance(dictionary.dic, MappedDic) == mapped
+    assert dictionary.lookup('spylls') == (ext == 'dic')
+    # ...and the compiled file is fresh again
+    read_compiled(path)
+
+
+def test_touched_source_is_not_rebuilt(source, tmp_path, monkeypatch):
+    path = str(tmp_path / 'base.spylls')
+    Dictionary.compile(source, path)
+    stat = os.stat(f'{source}.dic')
+    os.utime(f'{source}.dic', ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    hashed = []
+    digest = compiled.file_digest
+    monkeypatch.setattr(compiled, 'file_digest', lambda path: hashed.append(path) or digest(path))
+
+    read_compiled(path)
+    assert len(hashed) == 1
+
+    # The new modification time is stored, so the contents aren't hashed again
+    read_compiled(path)
+    assert len(hashed) == 1
+
+
+@pytest.mark.parametrize('mapped', [False, True])
+def test_touched_source_header_replaces_file(source, tmp_path, mapped):
+    path = str(tmp_path / 'base.spylls')
+    Dictionary.compile(source, path, mapped=mapped)
+    stat = os.stat(f'{source}.aff')
+    os.utime(f'{source}.aff', ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    # Readers which opened the file before the header was updated still see the whole old file
+    with open(path, 'rb') as reader:
+        original = reader.read()
+        Dictionary.from_compiled(path)
+        reader.seek(0)
+        assert reader.read() == original
+        assert os.stat(path).st_ino != os.fstat(reader.fileno()).st_ino
+
+    assert sorted(os.listdir(tmp_path)) == ['base.aff', 'base.dic', 'base.spylls']
+    assert Dictionary.from_compiled(path).lookup('looked')
+
+
+def test_not_compiled(source):
+    with pytest.raises(ValueError):
+        read_compiled(f'{source}.dic')
+
+
+def test_outdated_without_origin(source, tmp_path):
+    path = str(tmp_path / 'base.spylls')
+    dictionary = Dictionary.from_files(source)
+    write_compiled(path, aff=dictionary.aff, dic=dictionary.dic, sources=[f'{source}.dic'])
+
+    with open(f'{source}.dic', 'a') as file:
+        file.write('spylls\n')
+
+    # Nothing to rebuild it from
+    with pytest.raises(OutdatedError):
+        Dictionary.from_compiled(path)
+
+
+def test_load_detects_compiled(source, tmp_path):
+    path = str(tmp_path / 'base.spylls')
+    Dictionary.compile(source, path)
+
+    assert Dictionary.load(path).lookup('looked')
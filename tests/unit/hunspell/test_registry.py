@@ -0,0 +1,123 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+from spylls.hunspell import Dictionary
+from spylls.hunspell.registry import Registry, estimate_size
+
+FIXTURES = Path(__file__).resolve().parents[2] / 'integrational' / 'fixtures'
+
+
+def loader(log):
+    def load(name):
+        log.append(name)
+        return name.upper()
+    return load
+
+
+def test_loads_once():
+    log = []
+    registry = Registry(loader(log), size_of=len)
+
+    assert registry.get('en') == 'EN'
+    assert registry.get('en') == 'EN'
+    assert log == ['en']
+
+
+def test_evicts_least_recently_used_by_budget():
+    log = []
+    registry = Registry(loader(log), memory_budget=20, size_of=lambda _: 10)
+
+    registry.get('en')
+    registry.get('de')
+    registry.get('en')      # now "de" is the least recently used
+    registry.get('fr')
+
+    assert registry.names == ['en', 'fr']
+    assert registry.size == 20
+
+    registry.get('de')
+    assert log == ['en', 'de', 'fr', 'de']
+    assert registry.names == ['fr', 'de']
+
+
+def test_keeps_the_last_one_even_over_budget():
+    registry = Registry(loader([]), memory_budget=5, size_of=lambda _: 10)
+
+    registry.get('en')
+    registry.get('de')
+
+    assert registry.names == ['de']
+
+
+def test_budget_change_evicts():
+    registry = Registry(loader([]), size_of=lambda _: 10)
+    for name in ['en', 'de', 'fr']:
+        registry.get(name)
+
+    registry.memory_budget = 15
+    assert registry.names == ['fr']
+
+
+def test_evict_and_clear():
+    log = []
+    registry = Registry(loader(log), size_of=len)
+    registry.get('en')
+    registry.get('de')
+
+    registry.evict('en')
+    registry.evict('absent')
+    assert registry.names == ['de']
+
+    registry.clear()
+    assert registry.names == []
+    registry.get('de')
+    assert log == ['en', 'de', 'de']
+
+
+def test_failed_load_is_retried():
+    attempts = []
+
+    def load(name):
+        attempts.append(name)
+        if len(attempts) == 1:
+            raise OSError('no such dictionary')
+        return name
+
+    registry = Registry(load, size_of=len)
+    with pytest.raises(OSError):
+        registry.get('en')
+    assert registry.get('en') == 'en'
+    assert registry.names == ['en']
+
+
+def test_concurrent_requests_load_once():
+    log = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def load(name):
+        log.append(name)
+        started.set()
+        release.wait()
+        return name
+
+    registry = Registry(load, size_of=len)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get('en'))) for _ in range(4)]
+    threads[0].start()
+    started.wait()
+    for thread in threads[1:]:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert log == ['en']
+    assert results == ['en'] * 4
+
+
+def test_dictionary_size():
+    dictionary = Dictionary.from_files(str(FIXTURES / 'base'))
+    assert estimate_size(dictionary) > 0
@@ -0,0 +1,65 @@
+import unicodedata
+from pathlib import Path
+
+import pytest
+
+from spylls.hunspell import Dictionary
+from spylls.hunspell.algo.tokenizer import Tokenizer
+
+FIXTURES = Path(__file__).resolve().parents[2] / 'integrational' / 'fixtures'
+
+TEXT = "It's a well-known fact: Hunspell's dictionaries don't know spylls,\nand NASA’s too. "
+
+
+@pytest.fixture(scope='module')
+def tokenizer():
+    # BREAK isn't set, so "-" (the default) joins the words; WORDCHARS are "." and "'"
+    return Tokenizer(Dictionary.from_files(str(FIXTURES / 'base')).aff)
+
+
+def chunked(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def test_words(tokenizer):
+    tokens = [*tokenizer.tokenize([TEXT])]
+
+    assert [word for _, _, word in tokens] == [
+        "It's", 'a', 'well-known', 'fact', "Hunspell's", 'dictionaries', "don't", 'know', 'spylls',
+        'and', 'NASA’s', 'too.'
+    ]
+    assert all(TEXT[start:end] == word for start, end, word in tokens)
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 5, 7, 11, 40])
+def test_chunks_carry_over(tokenizer, size):
+    # Words split between the chunks (including ones broken right at "-" or "'") are carried over
+    # to the next chunk, and offsets are in the whole text
+    assert [*tokenizer.tokenize(chunked(TEXT, size))] == [*tokenizer.tokenize([TEXT])]
+
+
+def test_lines(tokenizer):
+    lines = TEXT.splitlines(keepends=True)
+    assert [*tokenizer.tokenize(lines)] == [*tokenizer.tokenize([TEXT])]
+
+
+def test_empty_chunks(tokenizer):
+    assert [*tokenizer.tokenize(['', 'well', '', '-', '', 'known', ''])] == [(0, 10, 'well-known')]
+    assert [*tokenizer.tokenize([])] == []
+
+
+def test_joiners_only_between_words(tokenizer):
+    # "-" is only allowed between word characters, while "'" is in WORDCHARS, so allowed anywhere
+    assert [word for _, _, word in tokenizer.tokenize(["-well- 'known'"])] == ['well', "'known'"]
+
+
+def test_combining_marks(tokenizer):
+    # Devanagari vowel signs and virama are combining marks, not letters
+    assert [*tokenizer.tokenize(['हिन्दी भाषा'])] == [(0, 6, 'हिन्दी'), (7, 11, 'भाषा')]
+
+
+@pytest.mark.parametrize('size', [1, 3, 100])
+def test_decomposed_text(tokenizer, size):
+    text = unicodedata.normalize('NFD', 'naïve café, Ärger')
+    assert [word for _, _, word in tokenizer.tokenize(chunked(text, size))] == \
+        [unicodedata.normalize('NFD', word) for word in ['naïve', 'café', 'Ärger']]